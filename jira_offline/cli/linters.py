@@ -2,13 +2,14 @@
 Module containing the lint command group, and all its subcommands
 '''
 import logging
+from typing import Optional
 
 import click
 
 from jira_offline.cli.params import CliParams
 from jira_offline.linters import fix_versions as lint_fix_versions
 from jira_offline.linters import issues_missing_epic as lint_issues_missing_epic
-from jira_offline.utils.cli import print_list
+from jira_offline.utils.cli import list_columns, print_list
 
 
 logger = logging.getLogger('jira')
@@ -17,13 +18,15 @@ logger = logging.getLogger('jira')
 @click.group(name='lint')
 @click.option('--fix', is_flag=True, help='Attempt to fix the errors automatically')
 @click.option('--project', help='Filter for a specific project')
+@click.option('--filter', 'query', help='Filter issues with an expression, eg. "status = Open and updated > -7d"')
 @click.pass_context
-def cli_lint(ctx, fix: bool=False, project: str=None):
+def cli_lint(ctx, fix: bool=False, project: str=None, query: Optional[str]=None):
     'Report on common mistakes in Jira issues'
     ctx.obj.lint = CliParams.LintParams(fix=fix)
 
-    # filter issues by project
-    ctx.obj.jira.filter.project = project
+    # filter issues by project, and the filter expression
+    ctx.obj.jira.filter.project_key = project
+    ctx.obj.jira.filter.query = query
 
     # load issues here for all subcommands in the group
     ctx.obj.jira.load_issues()
@@ -57,7 +60,8 @@ def cli_lint_fix_versions(ctx, value: str=None):
         click.echo(f'There are {len(df)} issues missing the fix_versions field')
 
     if ctx.obj.verbose:
-        print_list(df)
+        # the lint returns only the columns it needs; look up the columns displayed by print_list
+        print_list(jira.get_df(['key', *list_columns()]).loc[df.index])
 
 
 @cli_lint.command(name='issues-missing-epic')
@@ -88,4 +92,5 @@ def cli_lint_issues_missing_epic(ctx, epic_ref: str=None):
         click.echo(f'There are {len(df)} issues missing an epic')
 
     if ctx.obj.verbose:
-        print_list(df)
+        # the lint returns only the columns it needs; look up the columns displayed by print_list
+        print_list(jira.get_df(['key', *list_columns()]).loc[df.index])
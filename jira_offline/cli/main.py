@@ -11,13 +11,14 @@ import click
 from tabulate import tabulate
 
 from jira_offline.auth import authenticate
-from jira_offline.create import create_issue, find_epic_by_reference, import_issue, set_field_on_issue
-from jira_offline.exceptions import FailedPullingProjectMeta, ImportFailed, JiraApiError
+from jira_offline.create import (create_issue, FailedImport, find_epic_by_reference, import_issues,
+                                 set_field_on_issue)
+from jira_offline.exceptions import FailedPullingProjectMeta, JiraApiError
 from jira_offline.jira import Jira
 from jira_offline.models import Issue, ProjectMeta
 from jira_offline.sync import pull_issues, pull_single_project, push_issues
 from jira_offline.utils import find_project
-from jira_offline.utils.cli import print_diff, print_list
+from jira_offline.utils.cli import list_columns, print_diff, print_list
 
 
 logger = logging.getLogger('jira')
@@ -51,32 +52,40 @@ def cli_show(ctx, key: str, as_json: bool=False):
 @click.command(name='ls')
 @click.option('--json', 'as_json', '-j', is_flag=True, help='Print output in JSON format')
 @click.option('--project', help='Filter for a specific project')
+@click.option('--filter', 'query', help='Filter issues with an expression, eg. "status = Open and updated > -7d"')
 @click.pass_context
-def cli_ls(ctx, as_json: bool=False, project: str=None):
+def cli_ls(ctx, as_json: bool=False, project: str=None, query: Optional[str]=None):
     '''List Issues on the CLI'''
     jira: Jira = ctx.obj.jira
     jira.load_issues()
 
-    # filter issues on project
+    # filter issues on project, and the filter expression
     jira.filter.project_key = project
+    jira.filter.query = query
 
     if as_json:
         for issue in jira.values():
             click.echo(json.dumps(issue.serialize()))
     else:
-        print_list(jira.df, verbose=ctx.obj.verbose, include_project_col=len(jira.config.projects) > 1)
+        include_project_col = len(jira.config.projects) > 1
+        df = jira.get_df(['key', *list_columns(ctx.obj.verbose, include_project_col)])
+        print_list(df, verbose=ctx.obj.verbose, include_project_col=include_project_col)
 
 
 @click.command(name='diff')
 @click.argument('key', required=False)
+@click.option('--filter', 'query', help='Filter issues with an expression, eg. "status = Open and updated > -7d"')
 @click.pass_context
-def cli_diff(ctx, key: str=None):
+def cli_diff(ctx, key: str=None, query: Optional[str]=None):
     '''
     Show the diff between changes made locally and the remote issues on Jira
     '''
     jira: Jira = ctx.obj.jira
     jira.load_issues()
 
+    # filter the changed issues shown when no key is passed
+    jira.filter.query = query
+
     if key:
         if key not in jira:
             click.echo('Unknown issue key')
@@ -89,8 +98,8 @@ def cli_diff(ctx, key: str=None):
         print_diff(jira[key])
 
     else:
-        for issue in jira.values():
-            if issue.diff_to_original and issue.exists:
+        for issue in jira.changed_issues():
+            if issue.exists:
                 print_diff(issue)
 
 
@@ -259,8 +268,10 @@ def cli_pull(ctx, projects: str=None, reset_hard: bool=False):
 @click.option('--labels', help='Issue labels as comma-separated')
 @click.option('--priority', help='Set the priority of the issue')
 @click.option('--reporter', help='Username of Issue reporter (defaults to creator)')
+@click.option('--strict', is_flag=True, help='Reject summaries nearly identical to an existing issue, differing only in punctuation, articles or plurals')
 @click.pass_context
-def cli_new(ctx, projectkey: str, issuetype: str, summary: str, as_json: bool=False, **kwargs):
+def cli_new(ctx, projectkey: str, issuetype: str, summary: str, as_json: bool=False, strict: bool=False,
+            **kwargs):
     '''
     Create a new issue on a project
 
@@ -298,7 +309,7 @@ def cli_new(ctx, projectkey: str, issuetype: str, summary: str, as_json: bool=Fa
         kwargs['labels'] = set(kwargs['labels'].split(','))
 
     # create an Issue offline, it is sync'd on push
-    new_issue = create_issue(jira, project, issuetype, summary, **kwargs)
+    new_issue = create_issue(jira, project, issuetype, summary, strict=strict, **kwargs)
 
     # display the new issue
     if as_json:
@@ -352,28 +363,31 @@ def cli_edit(ctx, key: str, as_json: bool=False, **kwargs):
     if kwargs.get('labels'):
         kwargs['labels'] = set(kwargs['labels'].split(','))
 
+    issue = jira[key]
+
     for field_name, value in kwargs.items():
-        set_field_on_issue(jira[key], field_name, value)
+        set_field_on_issue(issue, field_name, value)
 
     # link issue to epic if --epic-ref was passed
     if kwargs.get('epic_ref'):
         matched_epic = find_epic_by_reference(jira, kwargs['epic_ref'])
-        jira[key].epic_ref = matched_epic.key
+        issue.epic_ref = matched_epic.key
 
     if as_json:
         # display the edited issue as JSON
-        click.echo(jira[key].as_json())
+        click.echo(issue.as_json())
     else:
         # print diff of edited issue
-        print_diff(jira[key])
+        print_diff(issue)
 
     jira.write_issues()
 
 
 @click.command(name='import')
 @click.argument('file', type=click.File('r'))
+@click.option('--strict', is_flag=True, help='Reject summaries nearly identical to an existing issue, differing only in punctuation, articles or plurals')
 @click.pass_context
-def cli_import(ctx, file: io.TextIOWrapper):
+def cli_import(ctx, file: io.TextIOWrapper, strict: bool=False):
     '''
     Import issues from stdin, or from a filepath
 
@@ -388,25 +402,20 @@ def cli_import(ctx, file: io.TextIOWrapper):
     # verbose logging by default during import
     logger.setLevel(logging.INFO)
 
-    for i, line in enumerate(file.readlines()):
-        if line:
-            no_input = False
+    # the file is read lazily, and all imported issues are written to the cache once at the end
+    for result in import_issues(jira, file, strict=strict):
+        no_input = False
 
-            try:
-                issue, is_new = import_issue(jira, json.loads(line), lineno=i+1)
-                write = True
+        if isinstance(result, FailedImport):
+            logger.error(result.error)
+            continue
 
-                if is_new:
-                    logger.info('New issue created: %s', issue.summary)
-                else:
-                    logger.info('Issue %s updated', issue.key)
+        write = True
 
-            except json.decoder.JSONDecodeError as e:
-                logger.error('Failed parsing line %s', i+1)
-            except ImportFailed as e:
-                logger.error(e)
+        if result.is_new:
+            logger.info('New issue created: %s', result.issue.summary)
         else:
-            break
+            logger.info('Issue %s updated', result.issue.key)
 
     if no_input:
         click.echo('No data read on stdin or in passed file')
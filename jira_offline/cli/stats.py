@@ -1,22 +1,30 @@
 '''
 Module containing the stats command group, and all its subcommands
 '''
+from typing import Optional
+
 import click
 
+from jira_offline.exceptions import NoIssuesInCache
 from jira_offline.utils.cli import print_table
 
 
 @click.group(name='stats', invoke_without_command=True)
 @click.option('--project', help='Filter for a specific project')
+@click.option('--filter', 'query', help='Filter issues with an expression, eg. "status = Open and updated > -7d"')
 @click.pass_context
-def cli_stats(ctx, project: str=None):
+def cli_stats(ctx, project: str=None, query: Optional[str]=None):
     '''Generate stats on Jira data'''
-    # filter issues by project
-    ctx.obj.jira.filter.project = project
+    # filter issues by project, and the filter expression
+    ctx.obj.jira.filter.project_key = project
+    ctx.obj.jira.filter.query = query
 
     # load issues here for all subcommands in the group
     ctx.obj.jira.load_issues()
 
+    if not ctx.obj.jira:
+        raise NoIssuesInCache
+
     if ctx.invoked_subcommand is None:
         for subcommand in (cli_stats_issuetype, cli_stats_status, cli_stats_fix_versions):
             ctx.invoke(subcommand)
@@ -26,8 +34,8 @@ def cli_stats(ctx, project: str=None):
 @click.pass_context
 def cli_stats_issuetype(ctx):
     '''Stats on issue type'''
-    jira = ctx.obj.jira
-    aggregated_issuetype = jira.df.groupby([jira.df.issuetype]).size().to_frame(name='count')
+    df = ctx.obj.jira.get_df(['issuetype'])
+    aggregated_issuetype = df.groupby([df.issuetype], observed=True).size().to_frame(name='count')
     print_table(aggregated_issuetype)
 
 
@@ -35,8 +43,8 @@ def cli_stats_issuetype(ctx):
 @click.pass_context
 def cli_stats_status(ctx):
     '''Stats on ticket status'''
-    jira = ctx.obj.jira
-    aggregated_status = jira.df.groupby([jira.df.status]).size().to_frame(name='count')
+    df = ctx.obj.jira.get_df(['status'])
+    aggregated_status = df.groupby([df.status], observed=True).size().to_frame(name='count')
     print_table(aggregated_status)
 
 
@@ -44,7 +52,7 @@ def cli_stats_status(ctx):
 @click.pass_context
 def cli_stats_fix_versions(ctx):
     '''Stats on issue fix-versions'''
-    jira = ctx.obj.jira
-    jira.df.fix_versions = jira.df.fix_versions.apply(lambda x: ','.join(x) if x else '')
-    aggregated_fix_versions = jira.df.groupby([jira.df.fix_versions]).size().to_frame(name='count')
+    df = ctx.obj.jira.get_df(['fix_versions'])
+    fix_versions = df.fix_versions.apply(lambda x: ','.join(x) if x else '')
+    aggregated_fix_versions = df.groupby([fix_versions]).size().to_frame(name='count')
     print_table(aggregated_fix_versions)
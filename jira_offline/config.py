@@ -57,9 +57,19 @@ def get_config_filepath() -> str:
     return os.path.join(click.get_app_dir(__title__), 'app.json')
 
 
-def get_cache_filepath() -> str:
-    '''Return the path to jira-offline issues cache file'''
-    return os.path.join(click.get_app_dir(__title__), 'issue_cache.jsonl')
+def get_cache_filepath(cache_format: Optional[str]=None) -> str:
+    '''
+    Return the path to jira-offline issues cache file
+
+    Params:
+        cache_format:  File format of the cache; "jsonl" (the default), "parquet" or "sqlite"
+    '''
+    return os.path.join(click.get_app_dir(__title__), f'issue_cache.{cache_format or "jsonl"}')
+
+
+def get_cache_log_filepath() -> str:
+    '''Return the path to jira-offline issues cache log, which holds changes not yet in the cache file'''
+    return os.path.join(click.get_app_dir(__title__), 'issue_cache.log')
 
 
 def upgrade_schema(config_json: dict, from_version: int, to_version: int):
@@ -1,16 +1,19 @@
 '''
 Module for functions related to Issue creation and bulk import.
 '''
+from dataclasses import dataclass
+import itertools
 import logging
-from typing import Optional, Tuple, TYPE_CHECKING
+from typing import Iterable, Iterator, Optional, Tuple, TYPE_CHECKING, Union
 import uuid
 
-from jira_offline.exceptions import (DeserializeError, EpicNotFound, EpicSearchStrUsedMoreThanOnce,
-                                     ImportFailed, InvalidIssueType, ProjectNotConfigured,
-                                     SummaryAlreadyExists)
+from jira_offline.exceptions import (BaseAppException, DeserializeError, EpicNotFound,
+                                     EpicSearchStrUsedMoreThanOnce, ImportFailed, InvalidIssueType,
+                                     ProjectNotConfigured, SummaryAlreadyExists)
 from jira_offline.models import Issue, ProjectMeta
 from jira_offline.sync import merge_issues
 from jira_offline.utils import find_project, get_field_by_name
+from jira_offline.utils.codec import JSONDecodeError, loads as json_loads
 from jira_offline.utils.serializer import deserialize_value
 
 if TYPE_CHECKING:
@@ -41,43 +44,36 @@ def find_epic_by_reference(jira: 'Jira', epic_ref_string: str) -> Issue:
     if matched_epic:
         return matched_epic
 
-    for epic in jira.values():
-        # skip non-Epics
-        if epic.issuetype != 'Epic':
-            continue
+    # then look up the epic summary and epic_name in the epic index
+    epic_keys = jira.epics.names.get(epic_ref_string, set())
 
-        if epic_ref_string in (epic.summary, epic.epic_name):
-            if matched_epic:
-                # finding two epics that match epic_ref_string is an exception, as you can only link
-                # an issue to a single epic
-                raise EpicSearchStrUsedMoreThanOnce(epic_ref_string)
+    if len(epic_keys) > 1:
+        # finding two epics that match epic_ref_string is an exception, as you can only link
+        # an issue to a single epic
+        raise EpicSearchStrUsedMoreThanOnce(epic_ref_string)
 
-            matched_epic = epic
-
-    if not matched_epic:
+    if not epic_keys:
         raise EpicNotFound(epic_ref_string)
 
-    return matched_epic
+    return jira[next(iter(epic_keys))]
 
 
-def check_summary_exists(jira: 'Jira', project: ProjectMeta, summary: str) -> bool:
+def check_summary_exists(jira: 'Jira', project: ProjectMeta, summary: str, fuzzy: bool=False) -> bool:
     '''
-    Check if summary string already used in project with project_key
+    Check if summary string already used in project with project_key. Summaries are compared ignoring
+    case and whitespace.
 
     Params:
         jira:         Dependency-injected jira.Jira object
         project_key:  Jira project key
         summary:      Issue.summary field
+        fuzzy:        Also match near-duplicates, which differ only in punctuation, articles or plurals
     '''
-    for issue in jira.values():
-        if issue.project != project:
-            continue
-        if issue.summary == summary:
-            return True
-    return False
+    return bool(jira.summaries.find(project.id, summary, fuzzy=fuzzy))
 
 
-def create_issue(jira: 'Jira', project: ProjectMeta, issuetype: str, summary: str, **kwargs) -> Issue:
+def create_issue(jira: 'Jira', project: ProjectMeta, issuetype: str, summary: str, strict: bool=False,
+                 write: bool=True, **kwargs) -> Issue:
     '''
     Create a new Issue
 
@@ -86,10 +82,13 @@ def create_issue(jira: 'Jira', project: ProjectMeta, issuetype: str, summary: st
         project:    Project properties on which to create the new issue
         issuetype:  Issue.issuetype
         summary:    Issue.summary
+        strict:     Also reject a summary nearly identical to that of an existing issue
+        write:      Write the new issue to the cache. Pass False when creating many issues, and call
+                    `Jira.write_issues` once afterwards.
         kwargs:     Issue fields as parameters
     '''
     # ensure issues are loaded, as write_issues called on success
-    if not jira:
+    if write and not jira:
         jira.load_issues()
 
     # validate issuetype against the specified project
@@ -112,7 +111,7 @@ def create_issue(jira: 'Jira', project: ProjectMeta, issuetype: str, summary: st
     for field_name, value in kwargs.items():
         set_field_on_issue(new_issue, field_name, value)
 
-    if check_summary_exists(jira, new_issue.project, new_issue.summary):
+    if check_summary_exists(jira, new_issue.project, new_issue.summary, fuzzy=strict):
         raise SummaryAlreadyExists
 
     if new_issue.epic_ref:
@@ -122,7 +121,9 @@ def create_issue(jira: 'Jira', project: ProjectMeta, issuetype: str, summary: st
     # use a temporary Issue.key until Jira server creates the actual key at sync-time
     new_issue.key = str(uuid.uuid4())
     jira[new_issue.key] = new_issue
-    jira.write_issues()
+
+    if write:
+        jira.write_issues()
 
     return new_issue
 
@@ -150,7 +151,78 @@ def set_field_on_issue(issue: Issue, field_name: str, value: Optional[str]):
     setattr(issue, field_name, value)
 
 
-def import_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Tuple[Issue, bool]:
+@dataclass
+class ImportedIssue:
+    '''
+    A line imported successfully, as yielded by `import_issues`
+    '''
+    lineno: int
+    issue: Issue
+    is_new: bool
+
+
+@dataclass
+class FailedImport:
+    '''
+    A line which failed to import, as yielded by `import_issues`
+    '''
+    lineno: int
+    error: ImportFailed
+
+
+# outcome of importing a single line
+ImportResult = Union[ImportedIssue, FailedImport]
+
+
+# number of lines read and decoded at a time by `import_issues`
+IMPORT_BATCH_SIZE = 1000
+
+
+def import_issues(jira: 'Jira', lines: Iterable[str], strict: bool=False) -> Iterator[ImportResult]:
+    '''
+    Import issues from lines of JSON, which are read lazily in batches. Each batch is decoded before
+    any of it is applied to `jira`. Blank lines are skipped.
+
+    The imported issues are not written to the cache; call `Jira.write_issues` once the import is
+    complete.
+
+    Params:
+        jira:    Dependency-injected jira.Jira object
+        lines:   Iterable of JSON strings, such as an open file
+        strict:  Reject new issues with a summary nearly identical to that of an existing issue
+    Returns:
+        Iterator of the result of each non-blank line, including any error
+    '''
+    numbered = enumerate(lines, start=1)
+
+    while True:
+        batch = list(itertools.islice(numbered, IMPORT_BATCH_SIZE))
+        if not batch:
+            return
+
+        decoded = []
+        for lineno, line in batch:
+            if not line.strip():
+                continue
+            try:
+                decoded.append((lineno, json_loads(line)))
+            except JSONDecodeError:
+                yield FailedImport(lineno, ImportFailed('Failed parsing JSON', lineno))
+
+        for lineno, attrs in decoded:
+            try:
+                issue, is_new = import_issue(jira, attrs, lineno, strict=strict, write=False)
+                yield ImportedIssue(lineno, issue, is_new)
+
+            except ImportFailed as e:
+                yield FailedImport(lineno, e)
+            except (BaseAppException, DeserializeError) as e:
+                # report any failure on a single line, and continue with the next
+                yield FailedImport(lineno, ImportFailed(str(e), lineno))
+
+
+def import_issue(jira: 'Jira', attrs: dict, lineno: int=None, strict: bool=False,
+                 write: bool=True) -> Tuple[Issue, bool]:
     '''
     Import a single issue's fields from the passed dict. The issue could be new, or this could be an
     update to an issue which already exists.
@@ -159,6 +231,8 @@ def import_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Tuple[Issue, bo
         jira:    Dependency-injected jira.Jira object
         attrs:   Dictionary containing issue fields
         lineno:  Line number from the import file
+        strict:  Reject a new issue with a summary nearly identical to that of an existing issue
+        write:   Write a new issue to the cache
     Returns:
         Tuple of imported Issue and flag which is true if import is new object
     '''
@@ -167,7 +241,7 @@ def import_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Tuple[Issue, bo
         return _import_modified_issue(jira, attrs, lineno), False
     else:
         # assume this object is a new issue
-        return _import_new_issue(jira, attrs, lineno), True
+        return _import_new_issue(jira, attrs, lineno, strict, write), True
 
 
 def _import_modified_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Issue:
@@ -212,7 +286,8 @@ def _import_modified_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Issue
     return update_obj.merged_issue
 
 
-def _import_new_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Issue:
+def _import_new_issue(jira: 'Jira', attrs: dict, lineno: int=None, strict: bool=False,
+                      write: bool=True) -> Issue:
     '''
     Import a NEW issue's fields from the passed dict.
 
@@ -222,8 +297,10 @@ def _import_new_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Issue:
         summary:    Issue summary string
 
     Params:
-        jira:   Dependency-injected jira.Jira object
-        attrs:  Dictionary containing issue fields
+        jira:    Dependency-injected jira.Jira object
+        attrs:   Dictionary containing issue fields
+        strict:  Reject a summary nearly identical to that of an existing issue
+        write:   Write the new issue to the cache
     '''
     try:
         # ensure all mandatory fields are in the import dict
@@ -238,7 +315,7 @@ def _import_new_issue(jira: 'Jira', attrs: dict, lineno: int=None) -> Issue:
         # retrieve the project object
         project = find_project(jira, attrs.pop('project'))
 
-        return create_issue(jira, project, issuetype, summary, **attrs)
+        return create_issue(jira, project, issuetype, summary, strict=strict, write=write, **attrs)
 
     except ProjectNotConfigured:
         raise ImportFailed(f'Unknown project ref {attrs["project"]} for new issue', lineno)
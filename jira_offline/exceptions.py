@@ -192,7 +192,7 @@ Ensure that "Story Points" is on the fields list.'''
         super().__init__('')
 
     def __str__(self):
-        self.__doc__.format(host=self.jira_server, proj=self.project_key)
+        return self.__doc__.format(host=self.jira_server, proj=self.project_key)
 
 
 # Raised when Story Points field is missing
@@ -238,6 +238,28 @@ class UnableToCopyCustomCACert(BaseAppException):
     'Failed copying certificate file'
 
 
+# Raised when the configured issue cache format requires a library which is not installed
+class CacheFormatUnavailable(BaseAppException):
+    'The {0} issue cache format requires additional libraries. Install them with:\n\n  pip install jira-offline[{0}]'
+
+    def __init__(self, cache_format):
+        self.cache_format = cache_format
+        super().__init__('')
+
+    def __str__(self):
+        return self.__doc__.format(self.cache_format)
+
+
+# Raised when a command which reports on issues is run against an empty issue cache
+class NoIssuesInCache(BaseAppException):
+    'There are no issues in the cache'
+
+
+# Raised when the expression passed to --filter cannot be parsed
+class InvalidFilter(DynamicBaseAppException):
+    pass
+
+
 # Failure when upgrading an app config from one schema to another
 class FailedConfigUpgrade(BaseAppException):
     'Failed upgrading the app.config schema. Please re-run with --debug and report this bug.'
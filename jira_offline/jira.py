@@ -2,33 +2,67 @@
 The Jira class in this module is the primary abstraction around the Jira API.
 '''
 import collections.abc
+import dataclasses
 import logging
 import os
-from typing import Dict, Optional, Set
+from typing import Any, cast, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type, TypeVar, Union
 
 import jsonlines
 import pandas as pd
 
-from jira_offline.config import get_cache_filepath, load_config
+from jira_offline.config import get_cache_filepath, get_cache_log_filepath, load_config
 from jira_offline.exceptions import (EpicNotFound, EstimateFieldUnavailable, JiraApiError,
                                      JiraNotConfigured, MissingFieldsForNewIssue, ProjectDoesntExist)
 from jira_offline.models import AppConfig, CustomFields, IssueFilter, Issue, IssueType, ProjectMeta
 from jira_offline.utils.api import get as api_get, post as api_post, put as api_put
-from jira_offline.utils.convert import jiraapi_object_to_issue
+from jira_offline.utils.changes import IssueChanges
+from jira_offline.utils.codec import dumps as json_dumps, loads as json_loads
+from jira_offline.utils.convert import jiraapi_fields, jiraapi_object_to_issue
+from jira_offline.utils.dataframe import (append_rows, apply_schema, build_df, COLUMNS, issue_row,
+                                         serialized_row, set_row)
 from jira_offline.utils.decorators import auth_retry
+from jira_offline.utils.index import EpicIndex, IssueIndex, SummaryIndex
+from jira_offline.utils.parquet import read_parquet, write_parquet
+from jira_offline.utils.sqlite import COLUMNS as SQLITE_COLUMNS, SqliteStore
 
 
 logger = logging.getLogger('jira')
 
+# an IssueIndex subclass, as returned by `Jira._get_index`
+IndexT = TypeVar('IndexT', bound=IssueIndex)
 
-class Jira(collections.abc.MutableMapping):
+
+class Jira(collections.abc.MutableMapping):  # pylint: disable=too-many-instance-attributes
     _df: Optional[pd.DataFrame] = None
 
+    # copy of the filter which was applied when _df was built
+    _df_filter: Optional[IssueFilter] = None
+
+    # DataFrame read directly from a columnar cache file, used as the starting point for _df
+    _cache_df: Optional[pd.DataFrame] = None
+
     filter: IssueFilter
 
+    # minimum number of entries in the cache log before it is compacted into the cache file
+    LOG_COMPACT_MIN = 1000
+
+    # maximum number of issue keys in a single search query made by `fetch_issues`, which keeps the
+    # query string well within URL length limits
+    FETCH_CHUNK_SIZE = 100
+
+    # maximum number of issues created by a single call to the bulk create API, as limited by Jira
+    BULK_CREATE_CHUNK_SIZE = 50
+
 
     def __init__(self, *args, **kwargs):
         self.store = dict()
+
+        # keys of changed issues, and the state of the cache log
+        self._changes = IssueChanges()
+
+        # indexes over issue fields, built on first use
+        self._indexes: Dict[type, IssueIndex] = {}
+
         self.update(dict(*args, **kwargs))
 
         # load application config without prompting
@@ -38,14 +72,27 @@ class Jira(collections.abc.MutableMapping):
         self.filter = IssueFilter()
 
 
-    def __getitem__(self, key):
-        return self.store[key]
+    def __getitem__(self, key: str) -> Issue:
+        issue: Union[Issue, dict] = self.store[key]
+        if isinstance(issue, dict):
+            # issues are loaded from the cache in serialized form, and deserialized on first access
+            issue = self.store[key] = Issue.deserialize(
+                issue, project=self.config.projects[issue['project_id']]
+            )
+            issue.observe(self._changes.mark)
+        return issue
 
     def __setitem__(self, key, value):
-        self.store[key] = value
+        with self._changes.lock:
+            self.store[key] = value
+            self._changes.set(key)
+            if isinstance(value, Issue):
+                value.observe(self._changes.mark)
 
     def __delitem__(self, key):
-        del self.store[key]
+        with self._changes.lock:
+            del self.store[key]
+            self._changes.delete(key)
 
 
     def __iter__(self):
@@ -62,9 +109,7 @@ class Jira(collections.abc.MutableMapping):
             super().__init__(mapping)
 
         def __iter__(self):
-            for key in self._mapping:
-                if self._filter.compare(self._mapping[key]):
-                    yield key
+            yield from self._mapping.filtered_keys(self._filter)
 
     class ItemsView(collections.abc.ItemsView):
         '''Override ItemsView to enable filtering via __iter__'''
@@ -73,9 +118,8 @@ class Jira(collections.abc.MutableMapping):
             super().__init__(mapping)
 
         def __iter__(self):
-            for key in self._mapping:
-                if self._filter.compare(self._mapping[key]):
-                    yield (key, self._mapping[key])
+            for key in self._mapping.filtered_keys(self._filter):
+                yield (key, self._mapping[key])
 
     class ValuesView(collections.abc.ValuesView):
         '''Override ValuesView to enable filtering via __iter__'''
@@ -84,9 +128,8 @@ class Jira(collections.abc.MutableMapping):
             super().__init__(mapping)
 
         def __iter__(self):
-            for key in self._mapping:
-                if self._filter.compare(self._mapping[key]):
-                    yield self._mapping[key]
+            for key in self._mapping.filtered_keys(self._filter):
+                yield self._mapping[key]
 
     def keys(self):
         return Jira.KeysView(self, self.filter)
@@ -97,47 +140,338 @@ class Jira(collections.abc.MutableMapping):
     def values(self):
         return Jira.ValuesView(self, self.filter)
 
+    def filtered_keys(self, filter_: IssueFilter) -> Iterator[str]:
+        '''
+        Iterate the keys of issues which match the filter. When the issue cache is held in SQLite, the
+        filter is resolved by an indexed query.
+
+        Params:
+            filter_:  Filter to apply
+        '''
+        if not filter_.is_set:
+            yield from self.store
+        elif isinstance(self.store, SqliteStore):
+            yield from self._select_keys({}, filter_)
+        elif filter_ == self.filter:
+            # the filter is applied to Jira.df as a mask, and thereafter only to changed issues
+            yield from list(self.get_df(['key']).index)
+        else:
+            for key in self.store:
+                if filter_.compare(self[key]):
+                    yield key
+
+    def select(self, **criteria) -> List[Issue]:
+        '''
+        Return the issues matching all criteria, and the current filter. When the issue cache is held in
+        SQLite, the criteria are resolved by an indexed query, otherwise all issues are scanned.
+
+        Params:
+            criteria:  Issue field names and values to match. A value of None matches an empty field,
+                       and a set of values matches any of them. For `fix_versions`, issues with any of
+                       the values match.
+        '''
+        if isinstance(self.store, SqliteStore):
+            return [self[key] for key in self._select_keys(criteria, self.filter)]
+
+        return [issue for issue in self.values() if _matches(issue, criteria)]
+
+    def _select_keys(self, criteria: Dict[str, Any], filter_: IssueFilter) -> List[str]:
+        '''
+        Query the SQLite store for keys matching the criteria and filter. Issues with changes not yet
+        written to the database are matched in memory instead.
+
+        The equality tests of the filter on indexed columns are included in the query, and any other
+        part of the filter is evaluated only against the issues returned.
+        '''
+        query = dict(criteria)
+        for name, values in filter_.criteria((*SQLITE_COLUMNS, 'fix_versions', 'project_key')).items():
+            if name == 'project_key':
+                name = 'project_id'
+                values = {
+                    project_id for project_id, project in self.config.projects.items()
+                    if project.key in values
+                }
+            if name not in query:
+                query[name] = values
+            elif name != 'fix_versions':
+                query[name] = values & _as_set(query[name])
+
+        unwritten = set(self._changes.modified)
+
+        keys = [key for key in self.store.select(query) if key not in unwritten]
+        if filter_.query:
+            keys = [key for key in keys if filter_.compare(self[key])]
+        keys.extend(
+            key for key in unwritten
+            if key in self.store and _matches(self[key], criteria) and filter_.compare(self[key])
+        )
+        return keys
+
+    def changed_issues(self) -> List[Issue]:
+        '''
+        Return the issues which have local changes to push to Jira; either existing issues which
+        differ from the version last seen on Jira, or new issues created offline. Issues which are
+        still serialized are checked without being deserialized.
+        '''
+        issues = []
+
+        # an SQLite cache reads only the rows which may have changes
+        items = self.store.changed_items() if isinstance(self.store, SqliteStore) else self.store.items()
+
+        for key, issue in items:
+            if isinstance(issue, dict):
+                if not issue.get('diff_to_original') and issue.get('id'):
+                    continue
+            elif issue.exists:
+                # diff_to_original is refreshed when an issue is written, so an issue modified in-place
+                # since is diffed now. A field set back to its original value leaves nothing to push.
+                if not (issue.diff() if issue.modified else issue.diff_to_original):
+                    continue
+
+            if self.filter.compare(self[key]):
+                issues.append(self[key])
+
+        return issues
+
 
     def load_issues(self) -> None:
         '''
-        Load issues from JSON cache file, and store in self (as class implements dict interface)
+        Load issues from the cache file, and store in self (as class implements dict interface). Then
+        replay any changes from the cache log.
+        '''
+        self.invalidate_df()
+        self._indexes.clear()
+        self._changes.index.clear()
+        self._changes.rewrite_cache = False
+
+        if self.config.cache_format == 'sqlite':
+            self._load_sqlite()
+            return
+
+        self._load_cache_file()
+        self._load_cache_log()
+
+
+    def _load_sqlite(self):
+        '''
+        Open the SQLite issue cache. Issues are read from the database only when accessed.
+
+        When the database is empty, any existing JSON cache is loaded and written into it.
         '''
+        store = SqliteStore(get_cache_filepath('sqlite'))
+
+        if not store:
+            self._load_cache_file()
+            self._load_cache_log()
+
+            try:
+                store.write([self._serialize_issue(key) for key in self.store], [])
+            except TypeError:
+                logger.exception('Cannot write issues cache! Please report this bug.')
+                return
+
+        self.store = store
+        self._changes.log_length = 0
+
+
+    def _load_cache_file(self):
+        '''
+        Load issues from the cache file, which is in the format configured in AppConfig.cache_format
+        '''
+        if self.config.cache_format == 'parquet':
+            cache_filepath = get_cache_filepath('parquet')
+            if os.path.exists(cache_filepath):
+                self._load_parquet(cache_filepath)
+                return
+
+            # fall through to read an existing JSON cache, which is written as parquet by the next
+            # call to `write_issues`
+            self._changes.rewrite_cache = True
+
         cache_filepath = get_cache_filepath()
         if os.path.exists(cache_filepath) and os.stat(cache_filepath).st_size > 0:
             try:
                 with open(cache_filepath) as f:
-                    for obj in jsonlines.Reader(f.readlines()).iter(type=dict):
-                        self[obj['key']] = Issue.deserialize(
-                            obj, project=self.config.projects[obj['project_id']]
-                        )
+                    for obj in jsonlines.Reader(f.readlines(), loads=json_loads).iter(type=dict):
+                        if obj['project_id'] not in self.config.projects:
+                            raise KeyError(obj['project_id'])
+
+                        # deserialized on first access
+                        self.store[obj['key']] = obj
 
             except (KeyError, TypeError, jsonlines.Error):
                 logger.exception('Cannot read issues cache! Please report this bug.')
                 return
 
 
-    def write_issues(self):
+    def _load_parquet(self, cache_filepath: str):
         '''
-        Dump issues to JSON cache file
+        Load issues from a parquet cache file. Issues are stored in self in serialized form, and are
+        only deserialized into Issue objects when accessed. The DataFrame read from the file is
+        retained, so `Jira.df` does not need to be built from Issue objects.
+
+        Params:
+            cache_filepath:  Path to the parquet cache file
         '''
         try:
-            issues_json = []
-            for issue in self.values():
-                data = issue.serialize()
+            df, issues_json = read_parquet(cache_filepath)
+
+            for obj in issues_json:
+                if obj['project_id'] not in self.config.projects:
+                    raise KeyError(obj['project_id'])
+                self.store[obj['key']] = obj
+
+            df['project_key'] = df.project_id.map(
+                {project_id: project.key for project_id, project in self.config.projects.items()}
+            )
+            self._cache_df = apply_schema(df)
+
+        except (KeyError, TypeError, ValueError, OSError):
+            logger.exception('Cannot read issues cache! Please report this bug.')
+
+
+    def _load_cache_log(self):
+        '''
+        Replay the cache log over the issues loaded from the cache file. Each line in the log is either
+        a serialized issue which replaces any earlier version, or a marker for a deleted issue.
+        '''
+        self._changes.log_length = 0
+
+        log_filepath = get_cache_log_filepath()
+        if not os.path.exists(log_filepath) or os.stat(log_filepath).st_size == 0:
+            return
+
+        with open(log_filepath) as f:
+            # skip_invalid handles a partially written final line after a crash
+            for obj in jsonlines.Reader(f.readlines(), loads=json_loads).iter(type=dict, skip_invalid=True):
+                self._changes.log_length += 1
+
+                if obj.get('deleted'):
+                    self.store.pop(obj['key'], None)
+                elif obj.get('project_id') in self.config.projects:
+                    # deserialized on first access
+                    self.store[obj['key']] = obj
+                else:
+                    logger.error('Skipped issue %s in cache log for unknown project', obj.get('key'))
+                    continue
+
+                # the row read from the cache file is out of date
+                self._changes.reload(obj['key'])
+
+
+    def _serialize_issue(self, key: str) -> dict:
+        '''
+        Serialize a single issue for writing to the cache
+
+        Params:
+            key:  Key of the issue to serialize
+        '''
+        issue: Union[Issue, dict] = self.store[key]
+        if isinstance(issue, dict):
+            # issue has not been accessed since load, and so is already serialized
+            return issue
+
+        data = issue.serialize()
+
+        # calculate the diff to the original Issue on Jira for existing Issues
+        if issue.exists:
+            if issue.modified or issue.diff_to_original is None:
+                issue.diff_to_original = issue.diff(data)
 
-                # calculate the diff to the original Issue on Jira for existing Issues
-                if issue.exists:
-                    data['diff_to_original'] = issue.diff(data)
+            # an unmodified issue retains the diff_to_original it was loaded with
+            data['diff_to_original'] = issue.diff_to_original
 
-                issues_json.append(data)
+        return data
+
+
+    def write_issues(self, compact: bool=False):
+        '''
+        Write modified issues to the cache. Changes are appended to the cache log, which is compacted
+        into the cache file once it grows beyond LOG_COMPACT_MIN entries, or 10% of the total number
+        of issues. The log is also compacted when no cache file exists in the configured
+        `cache_format`, so a cache is converted on the first write after the setting is changed.
+
+        An issue is written if it was set via `jira[key] = issue`, or if any of its fields were
+        modified in-place (see `Issue.modified`).
+
+        Params:
+            compact:  Write all issues to the cache file, and clear the cache log. This has no effect
+                      if the cache has not been loaded.
+        '''
+        # an issue modified in-place is reported by its observer, and may since have been deleted
+        modified = {key for key in self._changes.modified if key in self.store}
+
+        try:
+            issues_json = [self._serialize_issue(key) for key in modified]
         except TypeError:
             # an error here means the DataclassSerializer output is incompatible with JSON
             logger.exception('Cannot write issues cache! Please report this bug.')
             return
 
-        with open(get_cache_filepath(), 'w') as f:
-            writer = jsonlines.Writer(f)
-            writer.write_all(issues_json)
+        # the written issues are now unmodified with respect to the cache
+        for key in modified:
+            issue = self.store[key]
+            if isinstance(issue, Issue):
+                issue.modified.clear()
+
+        if isinstance(self.store, SqliteStore):
+            # changes are written directly to the database, so there is no cache log
+            self.store.write(issues_json, self._changes.deleted)
+            self._changes.modified.clear()
+            self._changes.deleted.clear()
+            return
+
+        issues_json.extend({'key': key, 'deleted': True} for key in self._changes.deleted)
+
+        if issues_json:
+            with open(get_cache_log_filepath(), 'a') as f:
+                writer = jsonlines.Writer(f, dumps=json_dumps)
+                writer.write_all(issues_json)
+
+        self._changes.modified.clear()
+        self._changes.deleted.clear()
+
+        if self._changes.log_length is None:
+            # the cache has not been loaded, so it's not possible to compact the cache log
+            return
+
+        self._changes.log_length += len(issues_json)
+
+        if compact or self._changes.rewrite_cache or self._changes.log_length > max(self.LOG_COMPACT_MIN, len(self.store) // 10):
+            self._compact()
+
+
+    def _compact(self):
+        '''
+        Write all issues to the cache file, and truncate the cache log. The cache file is replaced
+        atomically, so the log is never truncated before its changes are stored in the cache file.
+
+        Every issue is serialized, so compaction remains O(n) in the size of the cache; it's run only
+        once the log has grown in proportion to the cache.
+        '''
+        try:
+            issues_json = [self._serialize_issue(key) for key in self.store]
+        except TypeError:
+            logger.exception('Cannot write issues cache! Please report this bug.')
+            return
+
+        cache_filepath = get_cache_filepath(self.config.cache_format)
+        tmp_filepath = f'{cache_filepath}.tmp'
+
+        if self.config.cache_format == 'parquet':
+            write_parquet(tmp_filepath, issues_json)
+        else:
+            with open(tmp_filepath, 'w') as f:
+                writer = jsonlines.Writer(f, dumps=json_dumps)
+                writer.write_all(issues_json)
+
+        os.replace(tmp_filepath, cache_filepath)
+
+        # truncate the cache log
+        with open(get_cache_log_filepath(), 'w'):
+            pass
+        self._changes.log_length = 0
+        self._changes.rewrite_cache = False
 
 
     @auth_retry()
@@ -229,63 +563,145 @@ class Jira(collections.abc.MutableMapping):
         project.components = {x['name'] for x in data}
 
 
-    def new_issue(self, project: ProjectMeta, fields: dict) -> Issue:
+    def new_issues(self, project: ProjectMeta, issues_fields: List[dict]) -> Dict[str, Issue]:
         '''
-        Create a new issue on a Jira project via the API
+        Create many new issues on a Jira project via the bulk create API. Issues are sent in chunks of
+        BULK_CREATE_CHUNK_SIZE, and each chunk is fetched back from Jira with a single search query.
+        The issue cache is written once.
 
         Params:
-            project:  Properties of the Jira project on which to create new Issue
-            fields:   JSON-compatible key-value pairs for new Issue
+            project:        Properties of the Jira project on which to create new Issues
+            issues_fields:  JSON-compatible key-value pairs for each new Issue
         Returns:
-            The new Issue, including the Jira-generated key field
+            Map of the offline key of each new Issue to the Issue created on Jira. Issues which Jira
+            failed to create are logged, and omitted.
         '''
-        if 'key' not in fields or 'issuetype' not in fields or 'summary' not in fields:
-            raise MissingFieldsForNewIssue(
-                '{} is missing a mandatory field {}'.format(fields['key'], ','.join(fields))
-            )
+        for fields in issues_fields:
+            if 'key' not in fields or 'issuetype' not in fields or 'summary' not in fields:
+                raise MissingFieldsForNewIssue(
+                    '{} is missing a mandatory field {}'.format(fields.get('key'), ','.join(fields))
+                )
 
-        try:
-            # key is set by Jira server; remove it
-            temp_key = fields['key']
-            del fields['key']
-            # project_id is application data; remove it
-            del fields['project_id']
+        created: Dict[str, Issue] = {}
+        not_configured: Optional[str] = None
 
-            # create new issue in Jira
-            data = api_post(project, 'issue', data={'fields': fields})
+        for i in range(0, len(issues_fields), self.BULK_CREATE_CHUNK_SIZE):
+            chunk = issues_fields[i:i + self.BULK_CREATE_CHUNK_SIZE]
 
-            # retrieve the freshly minted Jira issue
-            new_issue: Issue = self.fetch_issue(project, data['key'])
+            # key is set by Jira server, and project_id is application data; remove both
+            issue_updates = [
+                {'fields': {k: v for k, v in fields.items() if k not in ('key', 'project_id')}}
+                for fields in chunk
+            ]
 
-        except JiraApiError as e:
-            err: str = 'Failed creating new {} "{}" with error "{}"'.format(
-                fields['issuetype']['name'],
-                fields['summary'],
-                e.message
-            )
-            if e.message == 'gh.epic.error.not.found':
-                raise EpicNotFound(err)
-            if "Field 'estimate' cannot be set" in e.message:
-                raise EstimateFieldUnavailable(project.key, project.jira_server)
-            if 'cannot be set. It is not on the appropriate screen, or unknown.' in e.message:
-                raise JiraNotConfigured(project.key, project.jira_server, err)
+            try:
+                data = api_post(project, 'issue/bulk', data={'issueUpdates': issue_updates})
+            except JiraApiError as e:
+                # Jira responds with an error when every issue in the request fails
+                for fields in chunk:
+                    not_configured = self._log_new_issue_error(project, fields, [e.message]) or \
+                        not_configured
+                continue
+
+            # errors are reported by position in the request, and the created issues are listed in
+            # request order, skipping those which failed
+            errors = {error.get('failedElementNumber'): error for error in data.get('errors', [])}
+            new_keys = iter(item['key'] for item in data.get('issues', []))
+
+            chunk_keys: Dict[str, str] = {}
+
+            for n, fields in enumerate(chunk):
+                if n in errors:
+                    element_errors = errors[n].get('elementErrors', {})
+                    messages = [
+                        *element_errors.get('errorMessages', []), *element_errors.get('errors', {}).values()
+                    ]
+                    not_configured = self._log_new_issue_error(project, fields, messages) or \
+                        not_configured
+                    continue
+
+                key = next(new_keys, None)
+                if key is None:
+                    logger.error('Jira did not return a key for new %s "%s"',
+                                 fields['issuetype']['name'], fields['summary'])
+                    continue
+
+                chunk_keys[fields['key']] = key
+
+            # retrieve the freshly minted Jira issues
+            fetched = self.fetch_issues(project, list(chunk_keys.values()))
+
+            for temp_key, key in chunk_keys.items():
+                if key not in fetched:
+                    # Jira's search index can lag behind issue creation
+                    fetched[key] = self.fetch_issue(project, key)
+                created[temp_key] = fetched[key]
+
+        with self._changes.lock:
+            for temp_key, new_issue in created.items():
+                self._replace_new_issue(temp_key, new_issue)
+
+            # write changes to disk
+            self.write_issues()
+
+        if not_configured:
+            raise JiraNotConfigured(project.key, project.jira_server, not_configured)
+
+        return created
+
+
+    def _log_new_issue_error(self, project: ProjectMeta, fields: dict, messages: List[str]) -> Optional[str]:  # pylint: disable=no-self-use
+        '''
+        Log the errors returned by Jira for an issue which failed to create, as the exception which
+        describes them
+
+        Params:
+            project:   Properties of the Jira project on which the Issue was created
+            fields:    JSON-compatible key-value pairs of the new Issue
+            messages:  Error messages returned by Jira
+        Returns:
+            The error, when it's caused by the Jira project screens not being configured for the
+            fields of the Issue; creating any other issue will fail in the same way
+        '''
+        err = 'Failed creating new {} "{}" with error "{}"'.format(
+            fields['issuetype']['name'], fields['summary'], ', '.join(messages)
+        )
 
+        def _found(text: str) -> bool:
+            return any(text in message for message in messages)
+
+        if _found('gh.epic.error.not.found'):
+            logger.error(EpicNotFound(err))
+        elif _found("Field 'estimate' cannot be set"):
+            logger.error(EstimateFieldUnavailable(project.key, project.jira_server))
+        else:
+            logger.error(err)
+
+            if _found('cannot be set. It is not on the appropriate screen, or unknown.'):
+                return err
+
+        return None
+
+
+    def _replace_new_issue(self, temp_key: str, new_issue: Issue):
+        '''
+        Replace the placeholder for an issue created offline with the Issue created on Jira
+
+        Params:
+            temp_key:   Key of the placeholder Issue
+            new_issue:  Issue returned from Jira, with the Jira-generated key
+        '''
         # add to self under the new key
         self[new_issue.key] = new_issue
 
         if new_issue.issuetype == 'Epic':
             # relink any issue linked to this epic to the new Jira-generated key
-            for linked_issue in [i for i in self.values() if i.epic_ref == temp_key]:
-                linked_issue.epic_ref = new_issue.key
+            for key in list(self.epics.children.get(temp_key, ())):
+                self[key].epic_ref = new_issue.key
 
         # remove the placeholder Issue
         del self[temp_key]
 
-        # write changes to disk
-        self.write_issues()
-
-        return new_issue
-
 
     def update_issue(self, project: ProjectMeta, issue: Issue, fields: dict) -> Optional[Issue]:
         '''
@@ -300,8 +716,9 @@ class Jira(collections.abc.MutableMapping):
             api_put(project, f'issue/{issue.key}', data={'fields': fields})
 
             # Jira is now updated to match local; synchronize our local reference to the Jira object
-            issue.original = issue.serialize()
-            self[issue.key] = issue
+            with self._changes.lock:
+                issue.original = issue.serialize()
+                self[issue.key] = issue
             return issue
 
         except JiraApiError as e:
@@ -320,23 +737,263 @@ class Jira(collections.abc.MutableMapping):
         Returns:
             Issue dataclass instance
         '''
-        data = api_get(project, f'issue/{key}')
+        data = api_get(project, f'issue/{key}', params={'fields': ','.join(jiraapi_fields(project))})
         return jiraapi_object_to_issue(project, data)
 
+    def fetch_issues(self, project: ProjectMeta, keys: Sequence[str]) -> Dict[str, Issue]:
+        '''
+        Return Issue objects from the Jira API for many keys, using a search query per chunk of
+        FETCH_CHUNK_SIZE keys rather than a request per issue
+
+        Params:
+            project:  Properties of the project pushing issues to
+            keys:     Issue keys to lookup on Jira API
+        Returns:
+            Map of issue key to Issue dataclass instance. Keys not found on Jira are omitted.
+        '''
+        fields = ','.join(jiraapi_fields(project))
+        issues: Dict[str, Issue] = {}
+
+        for i in range(0, len(keys), self.FETCH_CHUNK_SIZE):
+            chunk = keys[i:i + self.FETCH_CHUNK_SIZE]
+            params = {
+                'jql': 'key in ({})'.format(','.join(chunk)),
+                'maxResults': len(chunk),
+                'fields': fields,
+                # do not fail the whole query when a key no longer exists
+                'validateQuery': 'false',
+            }
+            data = api_get(project, 'search', params=params)
+
+            for api_issue in data.get('issues', []):
+                issue = jiraapi_object_to_issue(project, api_issue)
+                if issue.key:
+                    issues[issue.key] = issue
+
+        return issues
+
+
+    @property
+    def epics(self) -> EpicIndex:
+        '''
+        Index of epics and their linked issues, across all issues regardless of the filter
+        '''
+        return self._get_index(EpicIndex)
+
+    @property
+    def summaries(self) -> SummaryIndex:
+        '''
+        Index of issue summaries in each project, across all issues regardless of the filter
+        '''
+        return self._get_index(SummaryIndex)
+
+    def _get_index(self, cls: Type[IndexT]) -> IndexT:
+        '''
+        Return an index over issue fields, which is built on first use from the issue cache without
+        deserializing the issues. Thereafter only the entries of changed issues are updated.
+
+        Params:
+            cls:  IssueIndex subclass
+        '''
+        self._changes.collect(indexed=bool(self._indexes))
+
+        if self._changes.index:
+            fields = sorted({name for index in self._indexes.values() for name in index.FIELDS})
+            for key in self._changes.index:
+                row = self._row(self.store[key], fields) if key in self.store else None
+                for index in self._indexes.values():
+                    if row is None:
+                        index.remove(key)
+                    else:
+                        index.add(key, row)
+            self._changes.index.clear()
+
+        existing = self._indexes.get(cls)
+        if existing is not None:
+            return cast(IndexT, existing)
+
+        index = self._indexes[cls] = cls()
+        for key, row in self._index_rows(cls.FIELDS):
+            index.add(key, row)
+
+        return index
+
+    def _index_rows(self, fields: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate a row of the requested fields for every issue. When the issue cache is held in SQLite
+        and the fields are all held in columns, the issues are not decoded.
+        '''
+        if isinstance(self.store, SqliteStore) and set(fields).issubset(SQLITE_COLUMNS):
+            for key, issue in list(self.store.loaded.items()):
+                yield key, self._row(issue, fields)
+            yield from self.store.column_values(fields)
+        else:
+            for key, issue in self.store.items():
+                yield key, self._row(issue, fields)
 
     def invalidate_df(self):
-        '''Invalidate internal dataframe, so it's recreated on next access'''
+        '''
+        Invalidate internal dataframe, so it's recreated on next access. This is not needed after
+        changes to issues, which are applied to the DataFrame as they're made.
+        '''
+        self._changes.collect(indexed=bool(self._indexes))
+
         self._df = None
+        self._cache_df = None
+        self._changes.df.clear()
 
     @property
     def df(self) -> pd.DataFrame:
-        '''Convert self (aka a dict) into a pandas DataFrame, and cache'''
+        '''
+        Convert self (aka a dict) into a pandas DataFrame, and cache. The DataFrame is built once, and
+        thereafter only the rows of issues set, deleted or modified in-place are updated.
+        '''
+        return self.get_df()
+
+    def get_df(self, columns: Sequence[str]=COLUMNS) -> pd.DataFrame:
+        '''
+        Return a DataFrame of the issues matching the filter, with only the requested columns. Each
+        column is built the first time it's requested, directly from the issue cache without
+        deserializing the issues, and is then kept up to date in the same way as `Jira.df`.
+
+        Params:
+            columns:  Columns to include, from `utils.dataframe.COLUMNS`
+        '''
+        columns = list(columns)
+
+        self._changes.collect(indexed=bool(self._indexes))
+
+        if self._df is not None and self._df_filter != self.filter:
+            # the filter has changed since the DataFrame was built
+            self._df = None
+
         if self._df is None:
-            items = {}
-            for key, issue in self.items():
-                items[key] = {
-                    k:v for k,v in issue.__dict__.items()
-                    if k not in ('original', 'diff_to_original')
-                }
-            self._df = pd.DataFrame.from_dict(items, orient='index')
-        return self._df
+            if self._cache_df is not None:
+                # start from the DataFrame read from the columnar cache; rows changed since load are
+                # updated below
+                df, self._cache_df = self._cache_df, None
+
+                if self.filter.is_set:
+                    df = df[self.filter.mask(df, self._usernames())].copy()
+            else:
+                df = self._build_df(columns)
+                self._changes.df.clear()
+
+            self._df = df
+            self._df_filter = dataclasses.replace(self.filter)
+
+        if self._changes.df:
+            self._update_df()
+
+        missing = [name for name in columns if name not in self._df]
+        if missing:
+            self._add_df_columns(missing)
+
+        if list(self._df.columns) == columns:
+            return self._df
+        return self._df[columns]
+
+    def _df_rows(self, columns: Sequence[str], keys: Optional[Set[str]]=None) -> Dict[str, dict]:
+        '''
+        Build DataFrame rows for all issues in a single pass over the store. Issues which are still
+        serialized are converted without being deserialized.
+
+        Params:
+            columns:  Columns to include in each row
+            keys:     Only build rows for these issue keys
+        '''
+        return {
+            key: self._row(issue, columns) for key, issue in self.store.items()
+            if keys is None or key in keys
+        }
+
+    def _row(self, issue: Any, columns: Sequence[str]) -> Dict[str, Any]:
+        '''
+        Build the row of an issue held in the store, which may still be serialized
+        '''
+        if isinstance(issue, dict):
+            return serialized_row(issue, self.config.projects[issue['project_id']], columns)
+        return issue_row(issue, columns)
+
+    def _build_df(self, columns: List[str]) -> pd.DataFrame:
+        '''
+        Build a DataFrame of the requested columns, for the issues matching the filter
+        '''
+        if not self.filter.is_set:
+            return build_df(self._df_rows(columns), columns)
+
+        # the columns used by the filter are needed to apply it
+        columns = [*columns, *sorted(self.filter.fields.difference(columns))]
+
+        df = build_df(self._df_rows(columns), columns)
+        return df[self.filter.mask(df, self._usernames())].copy()
+
+    def _usernames(self) -> Dict[str, Optional[str]]:
+        '''
+        Map of project key to the configured username, to match `me` in a filter
+        '''
+        return {project.key: project.username for project in self.config.projects.values()}
+
+    def _add_df_columns(self, columns: List[str]):
+        '''
+        Add newly requested columns to the DataFrame
+        '''
+        df = self._df
+
+        new = build_df(self._df_rows(columns, keys=set(df.index)), columns).reindex(df.index)
+
+        # retain the column order of the full DataFrame
+        df = pd.concat([df, new], axis=1)
+        self._df = df[[name for name in COLUMNS if name in df]]
+
+    def _update_df(self):
+        '''
+        Apply changes to issues since the last access of Jira.df to its rows. A few changed rows are
+        updated in place, otherwise the changed rows are replaced in a single concat.
+        '''
+        df = self._df
+
+        rows = {}
+        for key in self._changes.df:
+            if key in self.store and self._df_filter.compare(self[key]):
+                rows[key] = issue_row(self[key], list(df.columns))
+
+        # rows of issues which were deleted, or no longer match the filter
+        dropped = [key for key in self._changes.df if key not in rows and key in df.index]
+
+        self._changes.df.clear()
+
+        updated = [key for key in rows if key in df.index]
+
+        # updating a row in place costs about as much as copying 250 rows in a concat
+        if len(updated) <= max(10, len(df) // 250):
+            for key in updated:
+                set_row(df, key, rows.pop(key))
+        else:
+            dropped.extend(updated)
+
+        if dropped:
+            df = df.drop(index=dropped)
+        if rows:
+            df = append_rows(df, rows)
+
+        self._df = df
+
+
+def _as_set(value: Any) -> Set[Any]:
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return set(value)
+    return {value}
+
+
+def _matches(issue: Issue, criteria: Dict[str, Any]) -> bool:
+    '''
+    Match an issue against the criteria passed to `Jira.select`
+    '''
+    for name, value in criteria.items():
+        if name == 'fix_versions':
+            if not _as_set(value) & (issue.fix_versions or set()):
+                return False
+        elif getattr(issue, name) not in _as_set(value):
+            return False
+    return True
@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 
+from jira_offline.exceptions import NoIssuesInCache
+
 if TYPE_CHECKING:
     from jira_offline.jira import Jira
 
@@ -22,29 +24,31 @@ def fix_versions(jira: 'Jira', fix: bool=False, value: str=None) -> pd.DataFrame
     if fix and not value:
         raise Exception
 
+    if not jira:
+        raise NoIssuesInCache
+
     if fix:
-        # error handle None in epic_name field
-        jira.df.epic_name.fillna(value='', inplace=True)
+        # issues matching the filter
+        keys = jira.get_df(['key']).index
 
         # iterate only epics
-        for epic_ref in jira.df[jira.df.issuetype == 'Epic'].index:
+        for epic_ref in [key for key in jira.epics.epics if key in keys]:
             if not jira[epic_ref].fix_versions:
                 continue
 
             # if value is in the epic's fix_versions field
             if value in jira[epic_ref].fix_versions:
-                # filter for all issues under this epic, and add value to fix_versions
-                for key in jira.df[jira.df.epic_ref == jira[epic_ref].key].fix_versions.keys():
-                    if not jira[key].fix_versions:
-                        jira[key].fix_versions = set()
-                    jira[key].fix_versions.add(value)
+                # look up all issues under this epic, and add value to fix_versions
+                for key in [key for key in jira.epics.children.get(epic_ref, ()) if key in keys]:
+                    # assign a new set, as in-place changes are not tracked by Issue.modified
+                    jira[key].fix_versions = {*(jira[key].fix_versions or set()), value}
 
-        # write updates to disk & invalidate current DataFrame representation
+        # write updates to disk; the DataFrame representation is updated as issues are modified
         jira.write_issues()
-        jira.invalidate_df()
 
     # return dataframe of issues with empty fixversions field
-    return jira.df[jira.df.fix_versions.apply(lambda x: x is None or len(x) == 0)]
+    df = jira.get_df(['key', 'issuetype', 'epic_ref', 'fix_versions'])
+    return df[df.fix_versions.apply(lambda x: x is None or len(x) == 0)]
 
 
 def issues_missing_epic(jira: 'Jira', fix: bool=False, epic_ref: str=None) -> pd.DataFrame:
@@ -56,14 +60,19 @@ def issues_missing_epic(jira: 'Jira', fix: bool=False, epic_ref: str=None) -> pd
         fix:       Flag to indicate if a fix should be applied
         epic_ref:  Epic to set on issues with no epic (only applicable when fix=True)
     '''
+    if not jira:
+        raise NoIssuesInCache
+
     if fix:
+        df = jira.get_df(['issuetype', 'epic_ref'])
+
         # iterate issue keys and update issue.epic_ref
-        for key in jira.df[(jira.df.issuetype != 'Epic') & jira.df.epic_ref.isnull()].index:
+        for key in df[(df.issuetype != 'Epic') & df.epic_ref.isnull()].index:
             jira[key].epic_ref = epic_ref
 
-        # write updates to disk & invalidate current DataFrame representation
+        # write updates to disk; the DataFrame representation is updated as issues are modified
         jira.write_issues()
-        jira.invalidate_df()
 
     # return dataframe of open issues missing an epic
-    return jira.df[(jira.df.issuetype != 'Epic') & jira.df.epic_ref.isnull()]
+    df = jira.get_df(['key', 'issuetype', 'epic_ref'])
+    return df[(df.issuetype != 'Epic') & df.epic_ref.isnull()]
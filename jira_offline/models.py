@@ -1,6 +1,7 @@
 '''
 Application data structures. Mostly dataclasses inheriting from utils.DataclassSerializer.
 '''
+import copy
 from dataclasses import dataclass, field
 import datetime
 import functools
@@ -9,11 +10,12 @@ import hashlib
 import os
 import pathlib
 import shutil
-from typing import Any, cast, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, cast, Collection, Dict, List, Optional, Set, Tuple
 
 import click
 import dictdiffer
 from oauthlib.oauth1 import SIGNATURE_RSA
+import pandas as pd
 from requests.auth import HTTPBasicAuth
 from requests_oauthlib import OAuth1
 from tabulate import tabulate
@@ -21,6 +23,7 @@ from tabulate import tabulate
 from jira_offline import __title__
 from jira_offline.exceptions import (UnableToCopyCustomCACert, NoAuthenticationMethod)
 from jira_offline.utils import render_field, render_value
+from jira_offline.utils.filter import Expression, parse_filter
 from jira_offline.utils.serializer import DataclassSerializer
 
 
@@ -77,6 +80,18 @@ class ProjectMeta(DataclassSerializer):  # pylint: disable=too-many-instance-att
     ca_cert: Optional[str] = field(default=None)
     timezone: Optional[str] = field(default=None)
 
+    # maximum number of parallel requests made to this Jira server
+    concurrency: Optional[int] = field(default=4)
+
+    # number of issues requested per page from the search API during pull
+    page_size: Optional[int] = field(default=100)
+
+    # grow or shrink page_size during pull, based on the Jira server's response times
+    page_size_adaptive: Optional[bool] = field(default=False)
+
+    # additional Jira API fields to request when pulling issues
+    extra_fields: Optional[Set[str]] = field(default_factory=set)
+
     # reference to parent AppConfig class
     config: Optional['AppConfig'] = field(default=None, metadata={'rw': ''})
 
@@ -150,6 +165,9 @@ class AppConfig(DataclassSerializer):
     schema_version: int = field(default=2)
     projects: Dict[str, ProjectMeta] = field(default_factory=dict)
 
+    # file format of the issue cache; one of "jsonl", "parquet" or "sqlite"
+    cache_format: Optional[str] = field(default='jsonl')
+
     def write_to_disk(self):
         # ensure config path exists
         pathlib.Path(click.get_app_dir(__title__)).mkdir(parents=True, exist_ok=True)
@@ -194,6 +212,61 @@ class Issue(DataclassSerializer):  # pylint: disable=too-many-instance-attribute
     # "rw" flag instructs serializer to read/deserialize this only; do not include during writes
     diff_to_original: Optional[list] = field(default=None, metadata={'rw': 'r'})
 
+    def __post_init__(self):
+        # set of field names modified since this Issue was loaded, or last written to the cache
+        self.__dict__['modified'] = set()
+
+    def __setattr__(self, name, value):
+        # `modified` does not exist until __post_init__, so assignments during __init__ are not tracked
+        modified = self.__dict__.get('modified')
+
+        if modified is not None and name != 'original' and 'original' not in self.__dict__:
+            # inflate a lazy `original` before the fields it is derived from are changed
+            self.original  # pylint: disable=pointless-statement
+
+        super().__setattr__(name, value)
+
+        if modified is not None and name != 'diff_to_original':
+            modified.add(name)
+
+            observer = self.__dict__.get('observer')
+            if observer is not None:
+                observer(self.key)
+
+    def __getattr__(self, name):
+        # called only when `original` has not yet been inflated by `Issue.deserialize`
+        if name == 'original' and 'diff_to_original' in self.__dict__:
+            # apply the diff_to_original patch to the serialized version of the issue, which
+            # recreates the issue dict as last seen on the Jira server
+            original = self.__dict__['original'] = dictdiffer.patch(self.diff_to_original, self.serialize())
+            return original
+
+        raise AttributeError(name)
+
+    def __deepcopy__(self, memo):
+        '''
+        Copy an issue without its observer. A copy is not held by `Jira`, so changes made to it during
+        merge are not reported, until it's set back into `Jira`.
+        '''
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for name, value in self.__dict__.items():
+            if name != 'observer':
+                copied.__dict__[name] = copy.deepcopy(value, memo)
+
+        return copied
+
+    def observe(self, observer: Callable[[str], None]):
+        '''
+        Register a callback which is passed this issue's key whenever one of its fields is set. This is
+        how `Jira` keeps its DataFrame in sync with issues modified in-place.
+
+        Params:
+            observer:  Callback taking an issue key
+        '''
+        self.__dict__['observer'] = observer
+
     @property
     def project_key(self) -> str:
         return self.project.key
@@ -239,8 +312,8 @@ class Issue(DataclassSerializer):  # pylint: disable=too-many-instance-attribute
     def deserialize(cls, attrs: dict, project: Optional[ProjectMeta]=None,  # type: ignore[override] # pylint: disable=arguments-differ
                     ignore_missing: bool=False) -> 'Issue':
         '''
-        Deserialize a dict into an Issue object. Inflate the _original_ version of the object from the
-        Issue.diff_to_original field which is written to the cache.
+        Deserialize a dict into an Issue object. The _original_ version of the object is inflated from
+        the Issue.diff_to_original field which is written to the cache, when it's first accessed.
 
         Params:
             attrs:           Dict to deserialize into an Issue
@@ -263,10 +336,11 @@ class Issue(DataclassSerializer):  # pylint: disable=too-many-instance-attribute
 
         # if issue exists on Jira server (see `exists` property above)
         if bool(attrs.get('id')):
-            # apply the diff_to_original patch to the serialized version of the issue, which
-            # recreates the issue dict as last seen on the Jira server
-            issue.original = dictdiffer.patch(issue.diff_to_original, issue.serialize())
+            # `original` is inflated from diff_to_original on first access, see `__getattr__`
+            del issue.__dict__['original']
 
+        # a freshly deserialized Issue is unmodified
+        issue.modified.clear()
         return issue
 
 
@@ -345,7 +419,8 @@ class Issue(DataclassSerializer):  # pylint: disable=too-many-instance-attribute
 
     def as_json(self) -> str:
         '''
-        Render issue as JSON
+        Render issue as JSON. This is user-facing output, so the stdlib encoder is used for the same
+        output whether or not orjson is installed.
         '''
         return json.dumps(self.serialize())
 
@@ -361,10 +436,71 @@ class IssueFilter:
     '''Encapsulates any filters passed in via CLI'''
     project_key: Optional[str] = field(default=None)
 
+    # expression in the filter language of `utils.filter`, eg. `status = Open and updated > -7d`
+    query: Optional[str] = field(default=None)
+
+    # the query parsed by `parse_filter`, with the query string it was parsed from
+    _parsed: Optional[Tuple[str, Expression]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def is_set(self) -> bool:
+        '''True if the filter may exclude any issues'''
+        return self.project_key is not None or bool(self.query)
+
+    @property
+    def expression(self) -> Optional[Expression]:
+        '''The query parsed into an Expression, which is done once on first use'''
+        if not self.query:
+            return None
+        if self._parsed is None or self._parsed[0] != self.query:
+            self._parsed = (self.query, parse_filter(self.query))
+        return self._parsed[1]
+
+    @property
+    def fields(self) -> Set[str]:
+        '''DataFrame columns needed by `IssueFilter.mask`'''
+        fields = {'project_key'} if self.project_key is not None else set()
+        if self.expression is not None:
+            fields |= self.expression.fields
+        return fields
+
     def compare(self, issue: Issue) -> bool:
         '''Compare passed Issue object against the class attributes'''
+        if self.project_key is not None and issue.project.key != self.project_key:
+            return False
 
-        if self.project_key is None:
-            return True
+        if self.expression is not None:
+            return self.expression.match(issue)
+
+        return True
+
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        '''
+        Evaluate the filter against a DataFrame of issues
+
+        Params:
+            df:         DataFrame with a column for each of `IssueFilter.fields`
+            usernames:  Map of project key to the username configured for the project
+        Returns:
+            Boolean Series with the index of df
+        '''
+        mask = pd.Series(True, index=df.index)
+        if self.project_key is not None:
+            mask &= (df.project_key == self.project_key).to_numpy()
+        if self.expression is not None:
+            mask &= self.expression.mask(df, usernames)
+        return mask
+
+    def criteria(self, indexed: Collection[str]) -> Dict[str, Set[Any]]:
+        '''
+        Return equality criteria met by all issues matching the filter, for use with an indexed store
 
-        return issue.project.key == self.project_key
+        Params:
+            indexed:  Fields which can be used in the criteria
+        Returns:
+            Map of field name to a set of values, any of which match
+        '''
+        criteria = self.expression.criteria(indexed) if self.expression is not None else {}
+        if self.project_key is not None:
+            criteria['project_key'] = criteria.get('project_key', {self.project_key}) & {self.project_key}
+        return criteria
@@ -2,11 +2,16 @@
 Functions related to pull & push of Issues to/from the Jira API. Also includes conflict analysis and
 resolution functions.
 '''
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import copy
 import dataclasses
 from dataclasses import dataclass, field
 import datetime
+import functools
 import logging
+import math
+import threading
+import time
 from typing import Any, Dict, Generator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import click
@@ -15,14 +20,14 @@ import pandas as pd
 from tabulate import tabulate
 from tqdm import tqdm
 
-from jira_offline.exceptions import (EpicNotFound, EstimateFieldUnavailable, FailedPullingIssues,
-                                     FailedPullingProjectMeta, JiraApiError)
+from jira_offline.exceptions import (FailedPullingIssues, FailedPullingProjectMeta, JiraApiError,
+                                     JiraUnavailable)
 from jira_offline.models import Issue, ProjectMeta
 from jira_offline.utils import critical_logger, friendly_title, get_field_by_name
 from jira_offline.utils.api import get as api_get
 from jira_offline.utils.cli import print_list
-from jira_offline.utils.convert import jiraapi_object_to_issue, issue_to_jiraapi_update
-from jira_offline.utils.serializer import DeserializeError, istype
+from jira_offline.utils.convert import jiraapi_fields, jiraapi_object_to_issue, issue_to_jiraapi_update
+from jira_offline.utils.serializer import DeserializeError, get_tz, istype
 
 if TYPE_CHECKING:
     from jira_offline.jira import Jira
@@ -31,10 +36,84 @@ if TYPE_CHECKING:
 logger = logging.getLogger('jira')
 
 
+# number of issues pulled between each write of the issue cache and project.last_updated
+PULL_CHECKPOINT_SIZE = 1000
+
+
+def parse_jira_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    '''
+    Parse a datetime string from the Jira API, such as "2020-01-01T10:00:00.000+1100", retaining its
+    UTC offset. Returns None for a missing or unparseable value.
+    '''
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
 class Conflict(Exception):
     pass
 
 
+class PageSize:
+    '''
+    Track the search API page size used during a pull.
+
+    In adaptive mode the page size doubles while the Jira server responds faster than
+    TARGET_LATENCY, and halves when a request times out or fails with a server error.
+    '''
+    MIN_SIZE = 10
+    MAX_SIZE = 1000
+    TARGET_LATENCY = 2.0
+
+    def __init__(self, size: int, maximum: int, adaptive: bool=False):
+        self.maximum = max(maximum, 1)
+        self.size = min(max(size, 1), self.maximum)
+        self.adaptive = adaptive
+        self._lock = threading.Lock()
+
+    def grow(self, latency: float):
+        '''
+        Double the page size if the slowest response was under the target latency
+
+        Params:
+            latency:  Slowest response time in seconds from the last batch of pages
+        '''
+        if self.adaptive and latency < self.TARGET_LATENCY:
+            with self._lock:
+                self.size = min(self.size * 2, self.maximum)
+
+    def shrink(self, failed_size: int) -> bool:
+        '''
+        Halve the page size after a page of `failed_size` timed out or errored
+
+        Params:
+            failed_size:  Page size of the request which failed
+        Returns:
+            False if the page size cannot be made any smaller
+        '''
+        if not self.adaptive or failed_size <= self.MIN_SIZE:
+            return False
+
+        with self._lock:
+            self.size = min(self.size, max(failed_size // 2, self.MIN_SIZE))
+        return True
+
+    def cap(self, requested: int, returned: Optional[int]):
+        '''
+        Lower the maximum page size to the limit applied by the Jira server. The search API responds
+        with the `maxResults` it used, which is less than requested when the server caps the page size.
+
+        Params:
+            requested:  Page size of the request
+            returned:   Value of `maxResults` in the response
+        '''
+        if returned and returned < requested:
+            with self._lock:
+                self.maximum = min(self.maximum, returned)
+                self.size = min(self.size, self.maximum)
+
+
 def pull_issues(jira: 'Jira', projects: Optional[Set[str]]=None, force: bool=False, verbose: bool=False):
     '''
     Pull changed issues from upstream Jira API
@@ -92,69 +171,264 @@ def pull_single_project(jira: 'Jira', project: ProjectMeta, force: bool, verbose
             'Querying %s for issues since %s', project.project_uri, project.last_updated
         )
 
-    jql = f'project = {project.key} AND updated > "{last_updated}"'
+    # Issues are pulled in order of their last update, so that the cache can be written as the pull
+    # progresses, and an interrupted pull resumes from the newest issue written. The query includes
+    # issues from the same minute as last_updated, as the JQL datetime has no seconds.
+    query = f'project = {project.key} AND updated >= "{last_updated}"'
+    jql = f'{query} ORDER BY updated ASC, key ASC'
 
-    def _run(jql: str, pbar=None) -> int:
-        page = 0
-        total = 0
+    # keys of all issues pulled, the time each was last updated on Jira, the newest of those times, and
+    # the number of issues pulled since the cache was last written
+    pulled: Set[str] = set()
+    updated_at: Dict[str, datetime.datetime] = {}
+    high_watermark: Optional[datetime.datetime] = None
+    since_checkpoint = 0
 
-        while True:
-            startAt = page * 25
+    # the number of issues matched by the search when the pull started, and whether the search results
+    # have since been seen to change, which can cause paging by offset to skip issues
+    expected_total: Optional[int] = None
+    shifted = False
+
+    # all issues updated since this time are known to have been pulled
+    confirmed = last_updated
+
+    # request only the fields used to create an Issue
+    fields = ','.join(jiraapi_fields(project))
+
+    def _fetch_page(start_at: int, size: int) -> List[Issue]:
+        '''
+        Fetch a single page of issues from the Jira search API. The response is streamed, and each
+        issue is converted as it's decoded, so the response text and decoded JSON of the whole page
+        are never held in memory; only the page of converted Issues is.
+        '''
+        nonlocal shifted
+
+        params = {'jql': jql, 'startAt': start_at, 'maxResults': size, 'fields': fields}
+        data = api_get(project, 'search', params=params, stream='issues')
+        page_size.cap(size, data.get('maxResults'))
+
+        if data.get('total', expected_total) != expected_total:
+            shifted = True
+
+        issues = []
+        for api_issue in data.get('issues', []):
+            # convert from Jira object into Issue dataclass
+            issue = jiraapi_object_to_issue(project, api_issue)
+            issues.append(issue)
+
+            # Issue.updated takes the project's timezone when deserialized, so the time is also kept
+            # with the offset sent by Jira
+            updated = parse_jira_datetime(api_issue.get('fields', {}).get('updated'))
+            if updated and issue.key:
+                updated_at[issue.key] = updated
+
+        return issues
+
+    def _fetch_range(start_at: int, size: int) -> Tuple[List[Issue], float]:
+        '''
+        Fetch a range of issues from the Jira search API. In adaptive mode, a timeout or server error
+        shrinks the page size and the range is fetched again as a series of smaller pages. A range
+        larger than the page size permitted by the Jira server is completed in the same way.
+
+        Returns:
+            Tuple of list of issues, and the response time in seconds
+        '''
+        started = time.monotonic()
+        try:
+            issues = _fetch_page(start_at, size)
+
+            if len(issues) == page_size.maximum < size:
+                # the page was capped by the Jira server, so fetch the remainder of the range
+                issues.extend(_fetch_pages(start_at + len(issues), start_at + size, page_size.maximum))
+
+        except (JiraApiError, JiraUnavailable) as e:
+            if isinstance(e, JiraApiError) and (e.status_code or 0) < 500:
+                raise
+            if not page_size.shrink(size):
+                raise
+
+            logger.info('Reducing page size to %s after error: %s', page_size.size, e)
+            issues = _fetch_pages(start_at, start_at + size, page_size.size)
+
+        return issues, time.monotonic() - started
+
+    def _fetch_pages(start_at: int, end: int, size: int) -> List[Issue]:
+        '''
+        Fetch the range of issues from `start_at` up to `end` as a series of pages of `size`
+        '''
+        issues = []
+        for offset in range(start_at, end, size):
+            page_issues, _ = _fetch_range(offset, min(size, end - offset))
+            issues.extend(page_issues)
+            if len(page_issues) < min(size, end - offset):
+                break
+        return issues
+
+    def _checkpoint(final: bool=False):
+        '''
+        Write the issues pulled so far, and advance last_updated to the newest of them once all issues
+        updated before it are confirmed to have been pulled. Issues can only have been missed once the
+        search results have changed during the pull, so only then are the matching keys listed.
+        '''
+        nonlocal since_checkpoint, confirmed
+
+        # JQL datetimes are in the timezone of the Jira user, which is configured on the project
+        tz = get_tz(project.timezone)
+
+        if high_watermark:
+            watermark = high_watermark.astimezone(tz).strftime('%Y-%m-%d %H:%M')
+
+            if final or watermark > confirmed:
+                if shifted:
+                    _pull_missed(confirmed, None if final else watermark)
+                confirmed = project.last_updated = watermark
+
+        elif final:
+            # no issues have been updated since last_updated
+            project.last_updated = datetime.datetime.now(tz).strftime('%Y-%m-%d %H:%M')
+
+        jira.write_issues()
+        jira.config.write_to_disk()
 
-            params = {'jql': jql, 'startAt': startAt, 'maxResults': 25}
+        since_checkpoint = 0
+
+    def _merge_issues(issues: List[Issue]):
+        '''Merge issues from the Jira API into the Jira dict'''
+        nonlocal high_watermark, shifted
+
+        for issue in issues:
+            key = issue.key
+            if not key:
+                continue
+
+            if key in pulled:
+                # an issue updated during the pull is returned again at the end of the results
+                shifted = True
+            pulled.add(key)
+
+            updated = updated_at.pop(key, None)
+            if updated and (high_watermark is None or updated > high_watermark):
+                high_watermark = updated
+
+            if not force:
+                try:
+                    # determine if local changes have been made
+                    if jira[key].diff_to_original:
+                        update_object: IssueUpdate = merge_issues(jira[key], issue)
+                        issue = update_object.merged_issue
+                except KeyError:
+                    pass
+
+            # insert issue into Jira dict
+            jira[key] = issue
+
+    def _process_page(issues: List[Issue], page: int, pbar=None):
+        '''Merge a single page of issues from the Jira API into the Jira dict'''
+        nonlocal since_checkpoint
+
+        _merge_issues(issues)
+
+        if pbar:
+            # update progress
+            pbar.update(len(issues))
+        else:
+            logger.info('Page number %s', page)
+            df = pd.DataFrame.from_dict(
+                {issue.key: issue.serialize() for issue in issues},
+                orient='index'
+            )
+            print_list(df)
+
+        since_checkpoint += len(issues)
+        if since_checkpoint >= PULL_CHECKPOINT_SIZE:
+            _checkpoint()
+
+    def _pull_missed(since: str, until: Optional[str]):
+        '''
+        Fetch any issues updated between `since` and `until` which were not pulled. Paging through the
+        search results by offset skips issues when the results change during the pull, for example
+        when an issue is moved to another project. The keys of the matching issues are listed in key
+        order, which is unaffected by issue updates.
+        '''
+        window = f'project = {project.key} AND updated >= "{since}"'
+        if until:
+            window += f' AND updated < "{until}"'
+
+        keys: List[str] = []
+        while True:
+            params = {
+                'jql': f'{window} ORDER BY key ASC', 'startAt': len(keys),
+                'maxResults': page_size.maximum, 'fields': 'key',
+            }
             data = api_get(project, 'search', params=params)
 
-            issues = data.get('issues', [])
-            if len(issues) == 0:
+            page_keys = [api_issue['key'] for api_issue in data.get('issues', [])]
+            if not page_keys:
                 break
-            page += 1
-            total += len(issues)
-
-            for api_issue in issues:
-                # convert from Jira object into Issue dataclass
-                issue = jiraapi_object_to_issue(project, api_issue)
-
-                if not force:
-                    try:
-                        # determine if local changes have been made
-                        if jira[api_issue['key']].diff_to_original:
-                            update_object: IssueUpdate = merge_issues(jira[api_issue['key']], issue)
-                            issue = update_object.merged_issue
-                    except KeyError:
-                        pass
-
-                # insert issue into Jira dict
-                jira[api_issue['key']] = issue
-
-            if pbar:
-                # update progress
-                pbar.update(len(issues))
-            else:
-                logger.info('Page number %s', page)
-                df = pd.DataFrame.from_dict(
-                    {
-                        issue['key']: jiraapi_object_to_issue(project, issue).serialize()
-                        for issue in issues
-                    },
-                    orient='index'
-                )
-                print_list(df)
+            keys.extend(page_keys)
 
-        return total
+        missed = [key for key in keys if key not in pulled]
+        if missed:
+            logger.info('Pulling %s issues missed as Jira was updated during the pull', len(missed))
+            _merge_issues(list(jira.fetch_issues(project, missed).values()))
+
+    def _run(expected_total: int, pbar=None) -> int:
+        page = 0
+        total = 0
+        start_at = 0
+
+        with ThreadPoolExecutor(max_workers=project.concurrency or 1) as executor:
+            while True:
+                size = page_size.size
+
+                if start_at < expected_total:
+                    # Fetch the pages known about from the initial query in parallel. In adaptive
+                    # mode, pages are fetched in batches so the page size can change between them
+                    count = math.ceil((expected_total - start_at) / size)
+                    if page_size.adaptive:
+                        count = min(count, project.concurrency or 1)
+                else:
+                    # Issues may have been updated on Jira since the initial query was made. Continue
+                    # walking pages serially until the search API returns no more issues
+                    count = 1
+
+                offsets = [start_at + i * size for i in range(count)]
+                slowest = 0.0
+
+                # Executor.map yields results in page order, so issues are merged in the same order
+                # as a serial pull
+                for issues, elapsed in executor.map(functools.partial(_fetch_range, size=size), offsets):
+                    if len(issues) == 0:
+                        return total
+                    page += 1
+                    total += len(issues)
+                    slowest = max(slowest, elapsed)
+                    _process_page(issues, page, pbar)
+
+                start_at = offsets[-1] + size
+                page_size.grow(slowest)
 
     try:
         # single quick query to get total number of issues
         params: Dict[str, Any] = {'jql': jql, 'maxResults': 1, 'fields': 'key'}
         data = api_get(project, 'search', params=params)
+        expected_total = data['total']
+
+        # the maximum page size permitted by the Jira server is learnt from the first pages fetched
+        page_size = PageSize(
+            project.page_size or 100,
+            maximum=PageSize.MAX_SIZE if project.page_size_adaptive else project.page_size or 100,
+            adaptive=bool(project.page_size_adaptive),
+        )
 
         pbar = None
 
         if verbose:
-            total = _run(jql)
+            total = _run(expected_total)
         else:
             # show progress bar
-            with tqdm(total=data['total'], unit=' issues') as pbar:
-                total = _run(jql, pbar)
+            with tqdm(total=expected_total, unit=' issues') as pbar:
+                total = _run(expected_total, pbar)
 
     except JiraApiError as e:
         raise FailedPullingIssues
@@ -165,12 +439,8 @@ def pull_single_project(jira: 'Jira', project: ProjectMeta, force: bool, verbose
 
     logger.info('Retrieved %s issues', total)
 
-    # dump issues to JSON cache
-    jira.write_issues()
-
-    # cache the last_updated value
-    project.last_updated = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
-    jira.config.write_to_disk()
+    # dump issues to JSON cache, and cache the last_updated value
+    _checkpoint(final=True)
 
 
 @dataclass
@@ -451,79 +721,218 @@ def parse_editor_result(update_object: IssueUpdate, editor_result_raw: str) -> I
     return Issue.deserialize(edited_issue_dict)
 
 
-def push_issues(jira: 'Jira', verbose: bool=False):
+class PushScheduler:
     '''
-    Push new/changed issues back to Jira server
+    Push issues to Jira concurrently, with a pool of workers per project bounded by the concurrency
+    configured for its Jira server. Conflicts are resolved on the calling thread, as resolution may be
+    interactive.
 
-    Params:
-        jira:     Dependency-injected jira.Jira object
-        verbose:  Verbose print all issues as they're pushed to Jira server (default is progress bar)
+    Issues linked to a new epic wait until the epic is created, as `Jira.new_issues` then relinks them
+    to the epic's Jira-generated key. All other issues are pushed immediately.
     '''
-    def _run(issues: list, pbar=None) -> int:
+    def __init__(self, jira: 'Jira', remote_issues: Dict[str, Issue], pbar=None):
+        self.jira = jira
+        self.remote_issues = remote_issues
+        self.pbar = pbar
+
+        # issues ready to push, and issues waiting on the creation of their epic
+        self.ready: List[Issue] = []
+        self.waiting: Dict[str, List[Issue]] = {}
+
+        self.executors: Dict[str, ThreadPoolExecutor] = {}
+        self.pending: Dict[Future, List[Issue]] = {}
+
+    def run(self, issues: List[Issue]) -> int:
+        '''
+        Push issues, and return the number pushed successfully
+
+        Params:
+            issues:  Issues to push, in the order they should be started
+        '''
+        new_epics = {i.key for i in issues if not i.exists and i.issuetype == 'Epic'}
+
+        for issue in issues:
+            if issue.epic_ref and issue.epic_ref in new_epics:
+                self.waiting.setdefault(issue.epic_ref, []).append(issue)
+            else:
+                self.ready.append(issue)
+
         count = 0
 
-        for local_issue in issues:
+        try:
+            while self.ready or self.pending:
+                self._submit_ready()
+                count += self._collect()
+        finally:
+            for executor in self.executors.values():
+                executor.shutdown()
+
+        return count
+
+    def _submit_ready(self):
+        '''
+        Merge each issue ready to push with its upstream version, and submit it to a worker. New issues
+        are grouped by project and submitted in chunks, for the bulk create API.
+        '''
+        new_issues: Dict[str, List[Tuple[Issue, IssueUpdate]]] = {}
+
+        ready, self.ready = self.ready, []
+
+        for local_issue in ready:
             # skip issues which belong to unconfigured projects
-            if local_issue.project_id not in jira.config.projects:
+            if local_issue.project_id not in self.jira.config.projects:
                 logger.warning('Skipped issue for unconfigured project: %s', local_issue.summary)
-                if pbar:
-                    # update progress
-                    pbar.update(1)
+                self._done(local_issue, False)
                 continue
 
-            # extract issue's project object into local variable
-            project: ProjectMeta = jira.config.projects[local_issue.project_id]
+            project: ProjectMeta = self.jira.config.projects[local_issue.project_id]
+
+            update_object = self._merge(local_issue)
 
-            # retrieve the upstream issue
-            remote_issue: Issue
-            if local_issue.exists:
-                remote_issue = jira.fetch_issue(project, local_issue.key)
+            if update_object.merged_issue.exists:
+                self._submit(project, self._push_update, update_object, [local_issue])
             else:
-                remote_issue = Issue.blank()
+                new_issues.setdefault(project.id, []).append((local_issue, update_object))
+
+        for project_id, new in new_issues.items():
+            for i in range(0, len(new), self.jira.BULK_CREATE_CHUNK_SIZE):
+                chunk = new[i:i + self.jira.BULK_CREATE_CHUNK_SIZE]
+                self._submit(
+                    self.jira.config.projects[project_id], self._push_new,
+                    [update_object for _, update_object in chunk],
+                    [local_issue for local_issue, _ in chunk],
+                )
 
-            # resolve any conflicts with upstream
-            update_object: IssueUpdate = merge_issues(local_issue, remote_issue)
+    def _submit(self, project: ProjectMeta, fn, arg, local_issues: List[Issue]):
+        '''
+        Submit a push to the worker pool of the issue's project
+        '''
+        if project.id not in self.executors:
+            self.executors[project.id] = ThreadPoolExecutor(max_workers=project.concurrency or 1)
+        self.pending[self.executors[project.id].submit(fn, project, arg)] = local_issues
 
-            update_dict: dict = issue_to_jiraapi_update(
-                project, update_object.merged_issue, update_object.modified
-            )
+    def _collect(self) -> int:
+        '''
+        Wait for at least one submitted push to complete, and record the result of each completed push
 
-            if update_object.merged_issue.exists:
-                jira.update_issue(project, update_object.merged_issue, update_dict)
-                logger.info(
-                    'Updated %s %s', update_object.merged_issue.issuetype, update_object.merged_issue.key
-                )
-                count += 1
-            else:
-                try:
-                    new_issue = jira.new_issue(project, update_dict)
-                    logger.info('Created new %s %s', new_issue.issuetype, new_issue.key)
-                    count += 1
-                except (EpicNotFound, EstimateFieldUnavailable) as e:
-                    logger.error(e)
+        Returns:
+            Number of issues pushed successfully
+        '''
+        count = 0
 
-            if pbar:
-                # update progress
-                pbar.update(1)
+        done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pushed_keys = future.result()
+            for local_issue in self.pending.pop(future):
+                pushed = local_issue.key in pushed_keys
+                if pushed:
+                    count += 1
+                self._done(local_issue, pushed)
 
         return count
 
+    def _done(self, issue: Issue, pushed: bool):
+        '''
+        Record an issue as finished, and release any issues waiting on it as their epic
+        '''
+        if self.pbar:
+            # update progress
+            self.pbar.update(1)
+
+        children = self.waiting.pop(issue.key, []) if issue.key else []
+        if pushed:
+            self.ready.extend(children)
+        else:
+            for child in children:
+                logger.error('Skipped issue as its epic was not created: %s', child.summary)
+                self._done(child, False)
+
+    def _merge(self, local_issue: Issue) -> IssueUpdate:
+        '''
+        Merge a local issue with its upstream version, resolving any conflicts
+        '''
+        if not local_issue.exists or not local_issue.key:
+            return merge_issues(local_issue, Issue.blank())
+
+        remote_issue = self.remote_issues.get(local_issue.key)
+        if remote_issue is None:
+            # not returned by the search, for example when the issue has moved project
+            remote_issue = self.jira.fetch_issue(
+                self.jira.config.projects[local_issue.project_id], local_issue.key
+            )
+
+        return merge_issues(local_issue, remote_issue)
+
+    def _push_update(self, project: ProjectMeta, update_object: IssueUpdate) -> Set[str]:
+        '''
+        Push a single merged existing issue to Jira. Called on a worker thread.
+
+        Returns:
+            Set of the issue's key, or an empty set if the update failed
+        '''
+        update_dict: dict = issue_to_jiraapi_update(
+            project, update_object.merged_issue, update_object.modified
+        )
 
-    # Build up a list of issues to push in a specific order.
+        issue = self.jira.update_issue(project, update_object.merged_issue, update_dict)
+        if not issue or not issue.key:
+            return set()
+
+        logger.info('Updated %s %s', issue.issuetype, issue.key)
+        return {issue.key}
+
+    def _push_new(self, project: ProjectMeta, update_objects: List[IssueUpdate]) -> Set[str]:
+        '''
+        Create a chunk of new issues on Jira with a single bulk request. Called on a worker thread.
+        '''
+        created = self.jira.new_issues(project, [
+            issue_to_jiraapi_update(project, update_object.merged_issue, update_object.modified)
+            for update_object in update_objects
+        ])
+
+        for new_issue in created.values():
+            logger.info('Created new %s %s', new_issue.issuetype, new_issue.key)
+
+        return set(created)
+
+
+def push_issues(jira: 'Jira', verbose: bool=False):
+    '''
+    Push new/changed issues back to Jira server
+
+    Params:
+        jira:     Dependency-injected jira.Jira object
+        verbose:  Verbose print all issues as they're pushed to Jira server (default is progress bar)
+    '''
+    # unchanged issues are skipped entirely
+    changed_issues: List[Issue] = jira.changed_issues()
+
+    # Build up a list of issues to push in a specific order. Issues are pushed concurrently, and this
+    # is the order in which they're started.
     #  1. Push existing issues with local changes first
-    issues_to_push: List[Issue] = [i for i in jira.values() if i.diff_to_original and i.exists]
+    issues_to_push: List[Issue] = [i for i in changed_issues if i.exists]
     #  2. Push new epics
-    issues_to_push.extend(i for i in jira.values() if not i.exists and i.issuetype == 'Epic')
+    issues_to_push.extend(i for i in changed_issues if not i.exists and i.issuetype == 'Epic')
     #  3. Push all other new issues
-    issues_to_push.extend(i for i in jira.values() if not i.exists and i.issuetype != 'Epic')
+    issues_to_push.extend(i for i in changed_issues if not i.exists and i.issuetype != 'Epic')
+
+    # retrieve the upstream version of all existing issues, with a few search queries per project
+    keys_by_project: Dict[str, List[str]] = {}
+    for issue in issues_to_push:
+        if issue.exists and issue.key and issue.project_id in jira.config.projects:
+            keys_by_project.setdefault(issue.project_id, []).append(issue.key)
+
+    remote_issues: Dict[str, Issue] = {}
+    for project_id, keys in keys_by_project.items():
+        remote_issues.update(jira.fetch_issues(jira.config.projects[project_id], keys))
 
     if verbose:
-        total = _run(issues_to_push)
+        total = PushScheduler(jira, remote_issues).run(issues_to_push)
     else:
         with critical_logger(logger):
             # show progress bar
             with tqdm(total=len(issues_to_push), unit=' issues') as pbar:
-                total = _run(issues_to_push, pbar)
+                total = PushScheduler(jira, remote_issues, pbar).run(issues_to_push)
 
     # write any changes to disk
     jira.write_issues()
@@ -1,19 +1,81 @@
 '''
 Utility functions for talking to Jira API
 '''
-import json
+import dataclasses
 import logging
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
 
 from jira_offline.exceptions import FailedAuthError, JiraApiError, JiraUnavailable
 from jira_offline.models import ProjectMeta
+from jira_offline.utils.codec import dumps as json_dumps, iter_object, JSONDecodeError, loads as json_loads
 
 
 logger = logging.getLogger('jira')
 
 
+# size of chunks read from a streamed response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+# keep-alive HTTP sessions, keyed by Jira server
+_sessions: Dict[str, requests.Session] = {}
+
+# auth objects, keyed by project id, each stored with a hash of the credentials it was created from
+_auths: Dict[str, Tuple[int, AuthBase]] = {}
+
+_lock = threading.Lock()
+
+
+def get_session(project: ProjectMeta) -> requests.Session:
+    '''
+    Return the pooled HTTP session for the project's Jira server, creating it on first use. The
+    connection pool is sized to the project's concurrency, so parallel requests each reuse a
+    keep-alive connection.
+
+    Projects on the same Jira server share a session, so the pool is sized by the concurrency of the
+    first project used on that server. Requests beyond the pool size still succeed, but their
+    connections are not kept alive.
+
+    Params:
+        project:  Configured Jira project instance to call
+    '''
+    with _lock:
+        session = _sessions.get(project.jira_server)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=project.concurrency or 1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[project.jira_server] = session
+        return session
+
+
+def get_auth(project: ProjectMeta) -> AuthBase:
+    '''
+    Return a cached auth object for the project's current credentials. A new auth object is created
+    only when the credentials change, for example after re-authenticating.
+
+    Params:
+        project:  Configured Jira project instance to call
+    '''
+    # hash the credentials, so they are compared without being held in the cache
+    credentials = hash((
+        project.username,
+        project.password,
+        dataclasses.astuple(project.oauth) if project.oauth else None,
+    ))
+    with _lock:
+        cached = _auths.get(project.id)
+        if cached is None or cached[0] != credentials:
+            cached = _auths[project.id] = (credentials, project.auth)
+        return cached[1]
+
+
 def _request(method: str, project: ProjectMeta, path: str, params: Optional[Dict[str, Any]]=None,
              data: Optional[Dict[str, Any]]=None) -> dict:
     '''
@@ -25,26 +87,95 @@ def _request(method: str, project: ProjectMeta, path: str, params: Optional[Dict
         params:   Key/value of parameters to send in request URL
         data:     Key/value of parameters to send as JSON in request body
     '''
+    resp = _send(method, project, path, params=params, data=data)
+
     try:
-        resp = requests.request(
+        return json_loads(resp.content)  # type: ignore[no-any-return]
+    except JSONDecodeError:
+        return {}
+
+
+def _request_stream(method: str, project: ProjectMeta, path: str, key: str,
+                    params: Optional[Dict[str, Any]]=None) -> dict:
+    '''
+    Make an authenticated HTTP request to the Jira API, and decode the response as it's read. The
+    array `key` in the response is returned as an iterator which decodes one item at a time, so the
+    response text is never held in memory in full.
+
+    Params:
+        project:  Configured Jira project instance to call
+        path:     API path to call
+        key:      Name of the top-level array in the response to decode incrementally
+        params:   Key/value of parameters to send in request URL
+    '''
+    resp = _send(method, project, path, params=params, stream=True)
+
+    def _iter_content():
+        try:
+            yield from resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout) as e:
+            raise JiraUnavailable(str(e))
+
+    def _iter_items(items):
+        try:
+            yield from items
+        except JSONDecodeError as e:
+            raise JiraUnavailable(f'Incomplete response from Jira: {e}')
+        finally:
+            # release the connection back to the pool
+            resp.close()
+
+    try:
+        data = iter_object(_iter_content(), key)
+    except JSONDecodeError:
+        resp.close()
+        return {}
+
+    if key in data:
+        data[key] = _iter_items(data[key])
+    else:
+        resp.close()
+
+    return data
+
+
+def _send(method: str, project: ProjectMeta, path: str, params: Optional[Dict[str, Any]]=None,
+          data: Optional[Dict[str, Any]]=None, stream: bool=False) -> requests.Response:
+    '''
+    Send an authenticated HTTP request to the Jira API, and handle error responses
+
+    Params:
+        project:  Configured Jira project instance to call
+        path:     API path to call
+        params:   Key/value of parameters to send in request URL
+        data:     Key/value of parameters to send as JSON in request body
+        stream:   Do not read the response body before returning
+    '''
+    try:
+        resp = get_session(project).request(
             method, f'{project.jira_server}/rest/api/2/{path}',
-            json=data,
+            data=json_dumps(data) if data is not None else None,
+            headers={'Content-Type': 'application/json'} if data is not None else None,
             params=params,
-            auth=project.auth,
+            auth=get_auth(project),
             verify=project.ca_cert if project.ca_cert else True,
+            stream=stream,
         )
-        # log the entire HTTP request for debug mode
-        logger.debug(30 * '-')
-        logger.debug('%s %s/rest/api/2/%s', method, project.jira_server, path)
-        logger.debug('\n'.join([f'{k}: {v}' for k,v in resp.request.headers.items()]))
-        logger.debug('')
-        logger.debug(json.dumps(data))
-        logger.debug('')
-        logger.debug('%s %s/rest/api/2/%s %s', method, project.jira_server, path, resp.status_code)
-        logger.debug('\n'.join([f'{k}: {v}' for k,v in resp.headers.items()]))
-        logger.debug('')
-        logger.debug(resp.text)
-        logger.debug(30 * '-')
+        # log the entire HTTP request for debug mode; skipped otherwise, as decoding the response
+        # body to text is expensive for large responses
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(30 * '-')
+            logger.debug('%s %s/rest/api/2/%s', method, project.jira_server, path)
+            logger.debug('\n'.join([f'{k}: {v}' for k,v in resp.request.headers.items()]))
+            logger.debug('')
+            logger.debug(json_dumps(data))
+            logger.debug('')
+            logger.debug('%s %s/rest/api/2/%s %s', method, project.jira_server, path, resp.status_code)
+            logger.debug('\n'.join([f'{k}: {v}' for k,v in resp.headers.items()]))
+            logger.debug('')
+            logger.debug('<streamed>' if stream else resp.text)
+            logger.debug(30 * '-')
 
         # raise an exception for non-200 range response
         resp.raise_for_status()
@@ -56,8 +187,8 @@ def _request(method: str, project: ProjectMeta, path: str, params: Optional[Dict
         if resp.status_code >= 400:
             message = ''
             try:
-                message = resp.json().get('errorMessages')
-            except json.decoder.JSONDecodeError:
+                message = json_loads(resp.content).get('errorMessages')
+            except JSONDecodeError:
                 if 'text/html' not in resp.headers['Content-Type']:
                     message = f'{resp.text}'
             raise JiraApiError(message, status_code=resp.status_code, method=method, path=path)
@@ -65,13 +196,11 @@ def _request(method: str, project: ProjectMeta, path: str, params: Optional[Dict
     except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
         raise JiraUnavailable(str(e))
 
-    try:
-        return resp.json()  # type: ignore[no-any-return]
-    except json.decoder.JSONDecodeError:
-        return {}
+    return resp
 
 
-def get(project: ProjectMeta, path: str, params: Optional[Dict[str, Any]]=None) -> dict:
+def get(project: ProjectMeta, path: str, params: Optional[Dict[str, Any]]=None,
+        stream: Optional[str]=None) -> dict:
     '''
     Make an authenticated GET request to the Jira API
 
@@ -79,7 +208,12 @@ def get(project: ProjectMeta, path: str, params: Optional[Dict[str, Any]]=None)
         project:  Configured Jira project instance to call
         path:     API path to call
         params:   Key/value of parameters to send in request URL
+        stream:   Name of a top-level array in the response, which is returned as an iterator that
+                  decodes each item as it's read. Keys following the array are not returned.
     '''
+    if stream:
+        return _request_stream('GET', project, path, stream, params=params)
+
     return _request('GET', project, path, params=params)
 
 
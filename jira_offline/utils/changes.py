@@ -0,0 +1,99 @@
+'''
+Track the keys of issues changed in `Jira`, so that the issue cache, `Jira.df` and the indexes over
+issue fields are each updated with only the issues changed since they were last written or built.
+'''
+import threading
+from typing import Optional, Set
+
+
+class IssueChanges:  # pylint: disable=too-many-instance-attributes
+    '''
+    Keys of issues changed since the issue cache was last written, and since each structure derived from
+    the issues was last updated.
+
+    Issues are changed by push worker threads, so every change is recorded while holding
+    `IssueChanges.lock`, which is also held while the changes are collected.
+    '''
+    def __init__(self):
+        # serializes changes made to `Jira` by `new_issues` and `update_issue`, which are called from
+        # worker threads during push
+        self.lock = threading.RLock()
+
+        # keys of issues set, modified in-place or deleted since the last write to the cache
+        self.modified: Set[str] = set()
+        self.deleted: Set[str] = set()
+
+        # keys of issues set, deleted or modified in-place, not yet passed on by `collect`
+        self.changed: Set[str] = set()
+
+        # keys of issues changed since Jira.df was last updated, and since the indexes were last updated
+        self.df: Set[str] = set()
+        self.index: Set[str] = set()
+
+        # number of entries in the cache log, or None if the cache has not been loaded
+        self.log_length: Optional[int] = None
+
+        # true when there is no cache file in the configured cache_format, so one is written by the
+        # next call to `Jira.write_issues`
+        self.rewrite_cache = False
+
+    def mark(self, key: str):
+        '''
+        Record an issue modified in-place. This is the observer registered on each Issue held by `Jira`,
+        and so is called whenever one of an issue's fields is set.
+
+        Params:
+            key:  Key of the changed issue
+        '''
+        with self.lock:
+            self.modified.add(key)
+            self.changed.add(key)
+
+    def reload(self, key: str):
+        '''
+        Record an issue read from the cache log, which replaces the version read from the cache file
+
+        Params:
+            key:  Key of the issue
+        '''
+        with self.lock:
+            self.changed.add(key)
+
+    def set(self, key: str):
+        '''
+        Record an issue set in `Jira`
+
+        Params:
+            key:  Key of the issue
+        '''
+        with self.lock:
+            self.modified.add(key)
+            self.deleted.discard(key)
+            self.changed.add(key)
+
+    def delete(self, key: str):
+        '''
+        Record an issue deleted from `Jira`
+
+        Params:
+            key:  Key of the issue
+        '''
+        with self.lock:
+            self.modified.discard(key)
+            self.deleted.add(key)
+            self.changed.add(key)
+
+    def collect(self, indexed: bool):
+        '''
+        Pass the keys of issues changed since the last call to each structure which is kept up to date
+        with changes: Jira.df, and the indexes
+
+        Params:
+            indexed:  True if any index has been built
+        '''
+        with self.lock:
+            if self.changed:
+                self.df.update(self.changed)
+                if indexed:
+                    self.index.update(self.changed)
+                self.changed.clear()
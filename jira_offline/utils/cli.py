@@ -1,78 +1,193 @@
 '''
 Print and text rendering utils for the CLI commands
 '''
-import arrow
+from typing import Iterator, List, Optional
+
 import click
+from dateutil.tz import tzlocal
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
 from jira_offline.models import Issue
 
 
+# number of rows formatted and written at a time by `print_list`
+TABLE_CHUNK_SIZE = 1000
+
+# upper bound in seconds of each relative time description, as used by `arrow.Arrow.humanize`
+HUMANIZE_THRESHOLDS = [
+    (10, 'just now'),
+    (45, 'seconds'),
+    (90, 'a minute'),
+    (2700, 'minutes'),
+    (5400, 'an hour'),
+    (79200, 'hours'),
+    (172800, 'a day'),
+    (554400, 'days'),
+    (907200, 'a week'),
+    (2419200, 'weeks'),
+    (3888000, 'a month'),
+    (29808000, 'months'),
+    (47260800, 'a year'),
+]
+
+# length in seconds of each counted unit; months are counted by calendar
+HUMANIZE_UNITS = {
+    'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400, 'weeks': 604800, 'years': 31536000,
+}
+
+
+def list_columns(verbose: bool=False, include_project_col: bool=False) -> List[str]:
+    '''
+    Return the columns displayed by `print_list`, so that only those columns need be built
+
+    Params:
+        verbose:              Display more information
+        include_project_col:  Include the project key in a column
+    '''
+    fields = ['project_key'] if include_project_col else []
+
+    if not verbose:
+        fields += ['issuetype', 'epic_ref', 'summary', 'assignee', 'updated']
+    else:
+        fields += [
+            'issuetype', 'epic_ref', 'epic_name', 'summary', 'assignee', 'fix_versions', 'updated'
+        ]
+    return fields
+
+
 def print_list(df: pd.DataFrame, width: int=60, verbose: bool=False, include_project_col: bool=False):
     '''
-    Helper to print abbreviated list of issues
+    Helper to print abbreviated list of issues. The DataFrame passed is not modified.
 
     Params:
         df:                   Issues to display in a DataFrame
         width:                Crop width for the summary string
         verbose:              Display more information
-        include_project_col:  Include the Issue.project field in a column
+        include_project_col:  Include the project key in a column
     '''
     if df.empty:
         click.echo('No issues in the cache')
         raise click.Abort
 
-    pd.set_option('mode.chained_assignment', None)
-
-    if include_project_col:
-        fields = ['project']
-    else:
-        fields = []
+    fields = list_columns(verbose, include_project_col)
 
-    if not verbose:
-        fields += ['issuetype', 'epic_ref', 'summary', 'assignee', 'updated']
-    else:
-        fields += [
-            'issuetype', 'epic_ref', 'epic_name', 'summary', 'assignee', 'fix_versions', 'updated'
-        ]
+    if verbose:
         width = 200
 
-    if 'assignee' not in df:
-        df['assignee'] = ''
+    # any missing assignee column is added
+    df = df.reindex(columns=['key', *fields])
+
+    columns = {}
+    for name in fields:
+        if name == 'updated':
+            updated = pd.to_datetime(df.updated, utc=True)
+            columns[name] = format_datetimes(updated) if verbose else humanize(updated)
+        elif name == 'epic_ref':
+            columns[name] = abbrev_keys(df.epic_ref)
+        elif name == 'fix_versions':
+            columns[name] = pd.Series(
+                [','.join(x) if isinstance(x, (set, list)) else '' for x in df.fix_versions],
+                index=df.index, dtype=object,
+            )
+        elif name == 'summary':
+            # shorten the summary field for printing
+            columns[name] = as_text(df.summary).str.slice(0, width)
+        else:
+            columns[name] = as_text(df[name])
 
-    # replace all NaNs in the DataFrame with blank str
-    df.fillna('', inplace=True)
+    table = pd.DataFrame(columns, index=df.index)
+    table.index = pd.Index(abbrev_keys(df.key), name='key')
 
-    # pretty dates for non-verbose
-    def format_datetime(raw):
-        if not raw or pd.isnull(raw):
-            return ''
-        dt = arrow.get(raw)
-        if verbose:
-            return f'{dt.format()}'
-        else:
-            return f'{dt.humanize()}'
-    df.updated = df.updated.apply(format_datetime)
-
-    # shorten the summary field for printing
-    df.summary = df.summary.str.slice(0, width)
-
-    def abbrev_key(key):
-        if key is None:
-            return ''
-        if len(key) == 36:
-            return key[0:8]
-        return key
-    # abbreviate long issue keys (offline-created issues have a UUID as the key)
-    df.key = df.key.apply(abbrev_key)
-    df.set_index('key', inplace=True)
-    df.epic_ref = df.epic_ref.apply(abbrev_key)
+    # the issue list can be long, so it's written in chunks as it's formatted
+    for lines in iter_table(table):
+        click.echo(lines)
 
-    if verbose:
-        df.fix_versions = df.fix_versions.apply(lambda x: '' if not x else ','.join(x))
 
-    print_table(df[fields])
+def as_text(column: pd.Series) -> pd.Series:
+    '''
+    Convert a column to str, with missing values blank
+
+    Params:
+        column:  Series of any type
+    '''
+    return column.astype(object).where(column.notna(), '').astype(str)
+
+
+def abbrev_keys(keys: pd.Series) -> pd.Series:
+    '''
+    Abbreviate long issue keys; offline-created issues have a UUID as the key
+
+    Params:
+        keys:  Series of issue keys, which may be missing
+    '''
+    keys = as_text(keys)
+    return keys.where(keys.str.len() != 36, keys.str.slice(0, 8))
+
+
+def format_datetimes(values: pd.Series) -> pd.Series:
+    '''
+    Format datetimes in the local timezone, as `arrow.Arrow.format` does by default
+
+    Params:
+        values:  Series of tz-aware datetimes
+    '''
+    text = values.dt.tz_convert(tzlocal()).dt.strftime('%Y-%m-%d %H:%M:%S%z')
+    # write the UTC offset as +HH:MM
+    text = text.str.slice(0, -2) + ':' + text.str.slice(-2)
+    return text.fillna('')
+
+
+def humanize(values: pd.Series, now: Optional[pd.Timestamp]=None) -> pd.Series:
+    '''
+    Describe datetimes relative to now, with the same text as `arrow.Arrow.humanize`. The descriptions
+    are picked with array arithmetic against a single `now`, instead of an arrow object per value.
+
+    Params:
+        values:  Series of tz-aware datetimes
+        now:     Time to compare against, defaults to the current time
+    Returns:
+        Series of str, blank for missing values
+    '''
+    if now is None:
+        now = pd.Timestamp.now(tz='UTC')
+
+    seconds = (values - now).dt.total_seconds().round().to_numpy()
+    missing = np.isnan(seconds)
+    seconds[missing] = 0
+    diff = np.abs(seconds)
+
+    description = np.select(
+        [diff < limit for limit, _ in HUMANIZE_THRESHOLDS],
+        [text for _, text in HUMANIZE_THRESHOLDS],
+        default='years',
+    ).astype(object)
+
+    count = np.zeros(len(diff))
+
+    # months are counted by calendar in the local timezone. Conversion to the local timezone is done
+    # per value, so it's limited to those values.
+    in_months = description == 'months'
+    if in_months.any():
+        local, now = values[in_months].dt.tz_convert(tzlocal()), now.tz_convert(tzlocal())
+        count[in_months] = np.abs(
+            (now.year * 12 + now.month) - (local.dt.year * 12 + local.dt.month).to_numpy()
+        )
+
+    for unit, length in HUMANIZE_UNITS.items():
+        count = np.where(description == unit, diff // length, count)
+
+    # counted units other than seconds are at least two
+    counted = np.isin(description, [*HUMANIZE_UNITS, 'months'])
+    count = np.where(description == 'seconds', count, np.maximum(count, 2))
+    description[counted] = count[counted].astype(np.int64).astype(str).astype(object) + ' ' + description[counted]
+
+    relative = description != 'just now'
+    text = np.where(relative & (seconds < 0), description + ' ago', description)
+    text = np.where(relative & (seconds >= 0), 'in ' + description, text)
+
+    return pd.Series(np.where(missing, '', text), index=values.index, dtype=object)
 
 
 def print_table(df):
@@ -80,6 +195,46 @@ def print_table(df):
     click.echo(tabulate(df, headers='keys', tablefmt='psql'))
 
 
+def iter_table(df: pd.DataFrame, chunk_size: int=TABLE_CHUNK_SIZE) -> Iterator[str]:
+    '''
+    Yield the lines of a table in the same layout as tabulate's "psql" format. The column widths are
+    measured first, then the rows are yielded in chunks of newline-separated lines, so output begins
+    before the whole table is rendered.
+
+    Params:
+        df:          DataFrame to render, with its index as the first column
+        chunk_size:  Number of rows to format at a time
+    '''
+    headers = [str(df.index.name or ''), *(str(name) for name in df.columns)]
+    values = [df.index.to_series(), *(df[name] for name in df.columns)]
+
+    cells = [as_text(v).reset_index(drop=True) for v in values]
+    # numeric columns are right-aligned
+    right = [pd.api.types.is_numeric_dtype(v) and not pd.api.types.is_bool_dtype(v) for v in values]
+    widths = [
+        max(len(header) + 2, int(text.str.len().max()) if len(text) else 0)
+        for header, text in zip(headers, cells)
+    ]
+
+    def pad(text, width, rjust):
+        return text.rjust(width) if rjust else text.ljust(width)
+
+    rule = '+'.join('-' * (width + 2) for width in widths)
+    yield f'+{rule}+'
+    yield '| ' + ' | '.join(pad(h, w, r) for h, w, r in zip(headers, widths, right)) + ' |'
+    yield f'|{rule}|'
+
+    for start in range(0, len(df), chunk_size):
+        lines = pd.Series('|', index=range(start, min(start + chunk_size, len(df))), dtype=str)
+        for text, width, rjust in zip(cells, widths, right):
+            text = text.iloc[start:start + chunk_size]
+            text = text.str.rjust(width) if rjust else text.str.ljust(width)
+            lines = lines + ' ' + text + ' |'
+        yield '\n'.join(lines)
+
+    yield f'+{rule}+'
+
+
 def print_diff(issue: Issue):
     if not issue.exists:
         # this issue was locally created offline so no diff is available; just do a plain print
@@ -0,0 +1,238 @@
+'''
+Encode and decode JSON for the issue cache, the Jira API and JSON output. The fast orjson library is
+used when installed with `pip install jira-offline[orjson]`, otherwise the stdlib json module.
+'''
+import codecs
+import json
+import re
+from types import ModuleType
+from typing import Any, cast, Iterable, Iterator, Optional, Tuple, Union
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# raised on invalid JSON; orjson.JSONDecodeError is a subclass of this
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> str:
+    '''
+    Encode an object to a compact JSON string
+
+    Params:
+        obj:  Object to encode
+    Returns:
+        JSON string
+    Raises:
+        TypeError if the object contains types which cannot be encoded
+    '''
+    if orjson is not None:
+        return cast(str, orjson.dumps(obj).decode())
+
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    '''
+    Decode a JSON string
+
+    Params:
+        data:  JSON as a string, or UTF-8 encoded bytes
+    Returns:
+        Decoded object
+    Raises:
+        JSONDecodeError if the data is not valid JSON
+    '''
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def iter_object(chunks: Iterable[bytes], key: str) -> dict:
+    '''
+    Incrementally decode a JSON object from a stream of UTF-8 encoded chunks, where the array `key`
+    may be too large to hold in memory at once.
+
+    The members preceding `key` are decoded immediately. `key` is returned as an iterator, which
+    decodes each item of the array as it's read from the stream. Any members following the array
+    are not decoded.
+
+    Params:
+        chunks:  Iterable of bytes, such as `requests.Response.iter_content`
+        key:     Name of the top-level array to decode incrementally
+    Returns:
+        Dict of the object's members
+    Raises:
+        JSONDecodeError if the stream is not a valid JSON object
+    '''
+    stream = _Stream(chunks)
+    stream.expect('{')
+
+    obj: dict = {}
+    if stream.peek() == '}':
+        return obj
+
+    while True:
+        name = stream.value()
+        stream.expect(':')
+
+        if name == key and stream.peek() == '[':
+            stream.pos += 1
+            obj[key] = _iter_array(stream)
+            return obj
+
+        obj[name] = stream.value()
+
+        if stream.delimiter('}'):
+            return obj
+
+
+def _iter_array(stream: '_Stream') -> Iterator[Any]:
+    if stream.peek() == ']':
+        stream.pos += 1
+        return
+
+    while True:
+        yield stream.value()
+
+        if stream.delimiter(']'):
+            return
+
+
+# the next character which changes the nesting depth of an object or array, or starts a string
+_STRUCTURE = re.compile(r'["{}\[\]]')
+
+# the remainder of a string following its opening quote
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+class _Stream:
+    '''
+    Buffer of decoded text read from a stream of chunks. Parsed text is dropped from the buffer when
+    the next chunk is read, once it's longer than TRIM_SIZE, rather than sliced off every chunk.
+    '''
+    TRIM_SIZE = 1024 * 1024
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+
+    def fill(self) -> bool:
+        '''
+        Read the next chunk into the buffer. Returns False at the end of the stream.
+        '''
+        for chunk in self.chunks:
+            text = self.utf8.decode(chunk)
+            if text:
+                if self.pos > self.TRIM_SIZE:
+                    self.buf = self.buf[self.pos:] + text
+                    self.pos = 0
+                else:
+                    self.buf += text
+                return True
+        return False
+
+    def peek(self) -> str:
+        '''
+        Skip whitespace, and return the next character, or an empty string at the end of the stream
+        '''
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise JSONDecodeError(f'Expecting {char!r}', self.buf, self.pos)
+        self.pos += 1
+
+    def delimiter(self, closing: str) -> bool:
+        '''
+        Consume a comma or the closing character of an object or array. Returns True when closed.
+        '''
+        char = self.peek()
+        if char not in (',', closing):
+            raise JSONDecodeError(f"Expecting ',' or {closing!r}", self.buf, self.pos)
+        self.pos += 1
+        return char == closing
+
+    def value(self) -> Any:
+        '''
+        Decode the next value, reading more chunks until it's complete. Objects and arrays are scanned
+        for their end, and then decoded in one call to `loads`.
+        '''
+        if self.peek() in ('{', '['):
+            start, end = self._scan()
+            return loads(self.buf[start:end])
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except JSONDecodeError:
+                # the value is incomplete, unless the stream has ended
+                if not self.fill():
+                    raise
+                continue
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def _scan(self) -> Tuple[int, int]:
+        '''
+        Find the end of the object or array at the current position, reading more chunks until it's
+        complete. The position is moved past the end.
+
+        Returns:
+            Tuple of the start and end index of the value in the buffer
+        '''
+        start = self.pos
+        scanned = start
+        depth = 0
+
+        while True:
+            match = _STRUCTURE.search(self.buf, scanned)
+
+            while match:
+                char = match.group()
+
+                if char == '"':
+                    tail = _STRING_TAIL.match(self.buf, match.end())
+                    if tail is None:
+                        # the string continues in the next chunk
+                        break
+                    scanned = tail.end()
+
+                else:
+                    scanned = match.end()
+                    depth += 1 if char in '{[' else -1
+                    if depth == 0:
+                        self.pos = scanned
+                        return start, scanned
+
+                match = _STRUCTURE.search(self.buf, scanned)
+
+            else:
+                scanned = len(self.buf)
+
+            # offsets are relative to the position, as the buffer may be trimmed when filled
+            offset = scanned - self.pos
+            if not self.fill():
+                raise JSONDecodeError('Unterminated value', self.buf, start)
+            start = self.pos
+            scanned = start + offset
@@ -2,7 +2,8 @@
 Two util functions for converting _from_ an API response to an Issue, and for converting an Issue
 _to_ an object good for an API post.
 '''
-from typing import TYPE_CHECKING
+import dataclasses
+from typing import List, TYPE_CHECKING
 
 from jira_offline.models import Issue
 
@@ -10,6 +11,48 @@ if TYPE_CHECKING:
     from jira_offline.models import ProjectMeta
 
 
+# Issue fields which are local-only, or are returned at the top-level of a Jira API issue object
+LOCAL_ISSUE_FIELDS = {'project_id', 'project', 'id', 'key', 'original', 'diff_to_original'}
+
+# Issue fields which are named differently on the Jira API
+ISSUE_FIELDS_RENAMED = {'fix_versions': 'fixVersions'}
+
+
+def jiraapi_fields(project: 'ProjectMeta') -> List[str]:
+    '''
+    Build the list of Jira API fields required to create an Issue via `jiraapi_object_to_issue`. This
+    is passed to the Jira API to avoid fetching every field on an issue.
+
+    Params:
+        project:  Properties of the project being pulled
+    Return:
+        Sorted list of Jira API field names
+    '''
+    custom_fields = {
+        'epic_name': project.custom_fields.epic_name,
+        'epic_ref': project.custom_fields.epic_ref,
+        'estimate': project.custom_fields.estimate,
+    }
+
+    fields = set()
+
+    for f in dataclasses.fields(Issue):
+        if f.name in LOCAL_ISSUE_FIELDS:
+            continue
+
+        if f.name in custom_fields:
+            # skip custom fields which are not in use on this project
+            if custom_fields[f.name]:
+                fields.add(f'customfield_{custom_fields[f.name]}')
+        else:
+            fields.add(ISSUE_FIELDS_RENAMED.get(f.name, f.name))
+
+    if project.extra_fields:
+        fields.update(project.extra_fields)
+
+    return sorted(fields)
+
+
 def jiraapi_object_to_issue(project: 'ProjectMeta', issue: dict) -> Issue:
     '''
     Convert raw JSON from Jira API to Issue object
@@ -0,0 +1,199 @@
+'''
+Build the DataFrame of issues found at `Jira.df`, with an explicit column schema. Low-cardinality fields
+are categorical, datetimes are held in UTC, and strings are Arrow-backed when pyarrow is installed.
+'''
+import dataclasses
+import datetime
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from jira_offline.models import Issue, ProjectMeta
+from jira_offline.utils.serializer import compile_deserializer
+
+try:
+    import pyarrow  # pylint: disable=unused-import
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
+
+
+# fields with few distinct values across all issues
+CATEGORY_FIELDS = ('project_key', 'project_id', 'issuetype', 'status', 'priority', 'assignee',
+                   'creator', 'reporter')
+
+DATETIME_FIELDS = ('created', 'updated')
+
+# set fields, which remain python objects
+OBJECT_FIELDS = ('fix_versions', 'components', 'labels')
+
+# columns of the DataFrame, in Issue field order. The project is represented by its key.
+COLUMNS = [
+    'project_key' if f.name == 'project' else f.name
+    for f in dataclasses.fields(Issue) if f.name not in ('original', 'diff_to_original')
+]
+
+
+def _dtype(name: str) -> Any:
+    if name in CATEGORY_FIELDS:
+        return 'category'
+    if name in DATETIME_FIELDS:
+        return 'datetime64[ns, UTC]'
+    if name in OBJECT_FIELDS:
+        return object
+    if name == 'estimate':
+        return 'Int64'
+    return STRING_DTYPE
+
+DTYPES: Dict[str, Any] = {name: _dtype(name) for name in COLUMNS}
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# functions to convert a serialized field to the value held on an Issue
+DESERIALIZERS = {
+    f.name: compile_deserializer(f.type) for f in dataclasses.fields(Issue) if f.name in COLUMNS
+}
+
+
+def issue_row(issue: Issue, columns: Sequence[str]=COLUMNS) -> Dict[str, Any]:
+    '''
+    Return the values of an issue as a row of the DataFrame
+
+    Params:
+        issue:    Issue to convert
+        columns:  Columns to include in the row
+    '''
+    row = {name: getattr(issue, name) for name in columns if name != 'project_key'}
+    if 'project_key' in columns:
+        row['project_key'] = issue.project.key if issue.project else None
+    return row
+
+
+def serialized_row(obj: Dict[str, Any], project: ProjectMeta, columns: Sequence[str]=COLUMNS) -> Dict[str, Any]:
+    '''
+    Return the values of a serialized issue as a row of the DataFrame, with the same values as
+    `issue_row` would return for the deserialized Issue. Only the requested columns are converted.
+
+    Params:
+        obj:      Serialized issue, as held in the issue cache
+        project:  Project the issue belongs to
+        columns:  Columns to include in the row
+    '''
+    row = {
+        name: DESERIALIZERS[name](obj.get(name), None) for name in columns if name != 'project_key'
+    }
+    if 'project_key' in columns:
+        row['project_key'] = project.key
+    return row
+
+
+def build_df(rows: Dict[str, Dict[str, Any]], columns: Sequence[str]=COLUMNS) -> pd.DataFrame:
+    '''
+    Build a DataFrame of issues with the schema applied
+
+    Params:
+        rows:     Map of issue key to row, as returned by `issue_row`
+        columns:  Columns of the DataFrame, which must be present in every row
+    '''
+    # build each column directly in its final type, which avoids pandas inferring types from a
+    # frame of python objects
+    return pd.DataFrame(
+        {name: _column(name, [row[name] for row in rows.values()]) for name in columns},
+        index=pd.Index(list(rows), dtype=object),
+    )
+
+
+def _column(name: str, values: List[Any]) -> Any:
+    if name in DATETIME_FIELDS:
+        # nanoseconds since the epoch, with NaT for missing values
+        nat = np.iinfo(np.int64).min
+        ns = np.array([_epoch_ns(v) if v is not None else nat for v in values], dtype=np.int64)
+        return pd.DatetimeIndex(ns.view('M8[ns]')).tz_localize('UTC')
+
+    if name in OBJECT_FIELDS:
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    if name in CATEGORY_FIELDS:
+        # via object dtype, so that a column of only missing values still has string categories
+        return pd.Series(values, dtype=object).astype('category').array
+
+    return pd.array(values, dtype=DTYPES[name])
+
+
+def _epoch_ns(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - EPOCH) // datetime.timedelta(microseconds=1) * 1000
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Convert the columns of a DataFrame of issues to the types in the schema
+
+    Params:
+        df:  DataFrame of issue fields, with the project key. Datetimes may be datetime objects, or ISO
+             format strings. Missing columns are added empty.
+    '''
+    df = df.reindex(columns=COLUMNS)
+
+    columns = {}
+    for name in COLUMNS:
+        if name in DATETIME_FIELDS:
+            columns[name] = pd.to_datetime(df[name], utc=True)
+        elif name in CATEGORY_FIELDS:
+            columns[name] = df[name].astype(object).astype('category')
+        else:
+            columns[name] = df[name].astype(DTYPES[name])
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def set_row(df: pd.DataFrame, key: str, row: Dict[str, Any]):
+    '''
+    Update an existing row of the DataFrame in place
+
+    Params:
+        df:   DataFrame of issues
+        key:  Key of the row to update
+        row:  New values for the row, as returned by `issue_row`
+    '''
+    for name, value in row.items():
+        if value is None:
+            pass
+        elif name in CATEGORY_FIELDS and value not in df[name].cat.categories:
+            # categories are kept sorted, as they are by build_df, so that grouped output is ordered
+            df[name] = df[name].cat.set_categories(sorted([*df[name].cat.categories, value]))
+        elif name in DATETIME_FIELDS:
+            value = _to_utc(value)
+
+        df.at[key, name] = value
+
+
+def append_rows(df: pd.DataFrame, rows: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    '''
+    Return a new DataFrame with rows appended, retaining the categorical columns
+
+    Params:
+        df:    DataFrame of issues
+        rows:  Map of issue key to row with a value for each column of df
+    '''
+    new = build_df(rows, list(df.columns))
+    out = pd.concat([df, new])
+
+    # concat falls back to object dtype when the categories differ
+    for name in CATEGORY_FIELDS:
+        if name in df:
+            out[name] = union_categoricals([df[name].array, new[name].array], sort_categories=True)
+
+    return out
+
+
+def _to_utc(value: Any) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        return ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
@@ -0,0 +1,469 @@
+'''
+Parse the filter expressions passed to the `--filter` option of CLI commands, for example:
+
+    status in (Open, "In Progress") and assignee = me and updated > -7d and labels ~ backend
+
+A filter is parsed once into an `Expression`, which can then be evaluated against an Issue, or against
+a DataFrame of issues to produce a boolean mask. The equality tests in a filter can also be returned as
+criteria, so that an indexed store can narrow the issues to evaluate.
+
+Comparisons are `=`, `!=`, `~` (contains, ignoring case), `!~`, `<`, `<=`, `>`, `>=`, `in (..)`,
+`not in (..)`, `is empty` and `is not empty`, which are combined with `and`, `or`, `not` and
+parentheses. On fields which hold a set, such as `labels`, a comparison matches any member.
+
+Datetimes are given as ISO dates, or relative to now as a number of weeks, days, hours or minutes, such
+as `-7d`. The value `me` matches the username configured for the issue's project.
+'''
+from abc import ABC, abstractmethod
+import operator
+import re
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+
+from dateutil.tz import tzlocal
+import numpy as np
+import pandas as pd
+
+from jira_offline.exceptions import InvalidFilter
+
+
+# Issue fields which can be filtered on, with the project represented by its key
+FIELDS = (
+    'project_key', 'project_id', 'issuetype', 'summary', 'assignee', 'created', 'creator', 'epic_name',
+    'epic_ref', 'estimate', 'description', 'fix_versions', 'components', 'id', 'key', 'labels',
+    'priority', 'reporter', 'status', 'updated',
+)
+
+# alternative field names, as used in Jira's JQL
+ALIASES = {'project': 'project_key', 'type': 'issuetype', 'fixversion': 'fix_versions'}
+
+# fields which hold a set of values
+SET_FIELDS = ('fix_versions', 'components', 'labels')
+
+DATETIME_FIELDS = ('created', 'updated')
+
+INT_FIELDS = ('estimate',)
+
+# fields which can be compared with `me`
+USER_FIELDS = ('assignee', 'creator', 'reporter')
+
+# ordering comparisons, applied to a single value or to a DataFrame column
+ORDERING = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+RELATIVE_UNITS = {'w': 'weeks', 'd': 'days', 'h': 'hours', 'm': 'minutes'}
+
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op>!=|>=|<=|!~|=|>|<|~|\(|\)|,)
+        |(?P<word>[^\s()=<>!~,"']+)
+    )
+''', re.VERBOSE)
+
+RELATIVE_RE = re.compile(r'^([-+]?\d+)([wdhm])$')
+
+KEYWORDS = ('and', 'or', 'not', 'in', 'is', 'empty', 'null')
+
+
+class _Me:
+    '''
+    Placeholder for the username of the issue's project
+    '''
+    def __repr__(self):
+        return 'me'
+
+ME = _Me()
+
+
+class Expression(ABC):
+    '''
+    A parsed filter, or part of one
+    '''
+    # DataFrame columns needed by `Expression.mask`
+    fields: Set[str]
+
+    @abstractmethod
+    def match(self, issue) -> bool:
+        '''
+        Evaluate against a single Issue
+        '''
+
+    @abstractmethod
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        '''
+        Evaluate against a DataFrame of issues, which has a column for each of `Expression.fields`
+
+        Params:
+            df:         DataFrame of issues, as returned by `Jira.get_df`
+            usernames:  Map of project key to the username configured for the project
+        Returns:
+            Boolean Series with the index of df
+        '''
+
+    def criteria(self, indexed: Collection[str]) -> Dict[str, Set[Any]]:  # pylint: disable=unused-argument, no-self-use
+        '''
+        Return equality criteria which all matching issues meet, for use with an indexed store. The
+        criteria may match issues which this expression does not, but never exclude one which matches.
+
+        Params:
+            indexed:  Fields which can be used in the criteria
+        Returns:
+            Map of field name to a set of values, any of which match
+        '''
+        return {}
+
+
+class And(Expression):
+    def __init__(self, items: List[Expression]):
+        self.items = items
+        self.fields = set().union(*(item.fields for item in items))
+
+    def match(self, issue) -> bool:
+        return all(item.match(issue) for item in self.items)
+
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        result = self.items[0].mask(df, usernames)
+        for item in self.items[1:]:
+            result &= item.mask(df, usernames)
+        return result
+
+    def criteria(self, indexed: Collection[str]) -> Dict[str, Set[Any]]:
+        criteria: Dict[str, Set[Any]] = {}
+        for item in self.items:
+            for name, values in item.criteria(indexed).items():
+                if name not in criteria:
+                    criteria[name] = values
+                elif name not in SET_FIELDS:
+                    # any member of a set field may match, so only single-valued fields are narrowed
+                    criteria[name] = criteria[name] & values
+        return criteria
+
+    def __repr__(self):
+        return '({})'.format(' and '.join(repr(item) for item in self.items))
+
+
+class Or(Expression):
+    def __init__(self, items: List[Expression]):
+        self.items = items
+        self.fields = set().union(*(item.fields for item in items))
+
+    def match(self, issue) -> bool:
+        return any(item.match(issue) for item in self.items)
+
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        result = self.items[0].mask(df, usernames)
+        for item in self.items[1:]:
+            result |= item.mask(df, usernames)
+        return result
+
+    def __repr__(self):
+        return '({})'.format(' or '.join(repr(item) for item in self.items))
+
+
+class Not(Expression):
+    def __init__(self, item: Expression):
+        self.item = item
+        self.fields = item.fields
+
+    def match(self, issue) -> bool:
+        return not self.item.match(issue)
+
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        return ~self.item.mask(df, usernames)
+
+    def __repr__(self):
+        return f'not {self.item!r}'
+
+
+class Comparison(Expression):
+    '''
+    Compare a single field against one or more values
+
+    Params:
+        field:   Name of the Issue field
+        op:      One of `=`, `!=`, `~`, `!~`, `<`, `<=`, `>`, `>=`, or `empty`. The equality operators
+                 match any of the values.
+        values:  Values to compare against, already converted to the type of the field
+    '''
+    def __init__(self, field: str, op: str, values: List[Any]):
+        self.field = field
+        self.op = op
+        self.values = values
+        self.fields = {field, 'project_key'} if ME in values else {field}
+
+    def __repr__(self):
+        return f'{self.field} {self.op} {self.values!r}'
+
+
+    def match(self, issue) -> bool:
+        if self.field == 'project_key':
+            value = issue.project.key if issue.project else None
+        else:
+            value = getattr(issue, self.field)
+
+        return self._test(value, self._resolve(issue.project.username if issue.project else None))
+
+    def _resolve(self, username: Optional[str]) -> List[Any]:
+        return [username if v is ME else v for v in self.values]
+
+    def _test(self, value: Any, targets: List[Any]) -> bool:  # pylint: disable=too-many-return-statements
+        if self.op == 'empty':
+            return value is None or value == '' or (self.field in SET_FIELDS and not value)
+
+        if self.field in SET_FIELDS:
+            members = value or set()
+            if self.op in ('~', '!~'):
+                found = any(t.lower() in m.lower() for m in members for t in targets)
+            else:
+                found = bool(members & set(targets))
+            return found if self.op in ('=', '~') else not found
+
+        if value is None:
+            # a missing value is only matched by negative comparisons
+            return self.op in ('!=', '!~')
+
+        if self.op == '=':
+            return value in targets
+        if self.op == '!=':
+            return value not in targets
+        if self.op in ('~', '!~'):
+            found = str(targets[0]).lower() in str(value).lower()
+            return found if self.op == '~' else not found
+        return bool(ORDERING[self.op](value, targets[0]))
+
+
+    def mask(self, df: pd.DataFrame, usernames: Dict[str, Optional[str]]) -> pd.Series:
+        column = df[self.field]
+
+        if self.field in SET_FIELDS:
+            # sets are held as python objects, so are tested one by one
+            targets = self._resolve(None)
+            return pd.Series(
+                np.fromiter((self._test(v, targets) for v in column), dtype=bool, count=len(column)),
+                index=df.index,
+            )
+
+        if self.op == 'empty':
+            result = column.isna()
+            if self.field not in DATETIME_FIELDS + INT_FIELDS:
+                result |= _string_mask(column, lambda s: s == '')
+            return _as_bool(result)
+
+        if self.op in ('=', '!='):
+            result = _as_bool(column.isin([v for v in self.values if v is not ME]))
+            if ME in self.values:
+                result |= _as_bool(column.astype(object) == df.project_key.astype(object).map(usernames))
+            return result if self.op == '=' else ~result
+
+        if self.op in ('~', '!~'):
+            target = self.values[0].lower()
+            result = _string_mask(column, lambda s: s.str.lower().str.contains(target, regex=False))
+            return result if self.op == '~' else ~result
+
+        return _as_bool(ORDERING[self.op](column, self.values[0]))
+
+
+    def criteria(self, indexed: Collection[str]) -> Dict[str, Set[Any]]:
+        if self.op != '=' or ME in self.values or self.field not in indexed:
+            return {}
+        if self.field in DATETIME_FIELDS + INT_FIELDS:
+            # indexes hold these fields in serialized form
+            return {}
+        return {self.field: set(self.values)}
+
+
+def _as_bool(result: pd.Series) -> pd.Series:
+    '''
+    Convert a comparison result to plain bool, where missing values do not match
+    '''
+    return result.fillna(False).astype(bool)
+
+
+def _string_mask(column: pd.Series, test) -> pd.Series:
+    '''
+    Apply a test to a column of strings, where missing values do not match. A categorical column is
+    tested once per category.
+    '''
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = pd.Series(column.cat.categories, dtype=object).astype(str)
+        hits = np.append(_as_bool(test(categories)).to_numpy(), False)
+        # missing values have code -1, which indexes the appended False
+        return pd.Series(hits[column.cat.codes.to_numpy()], index=column.index)
+
+    return _as_bool(test(column.astype('string')))
+
+
+def parse_filter(query: str, now: Optional[pd.Timestamp]=None) -> Expression:
+    '''
+    Parse a filter expression
+
+    Params:
+        query:  Filter expression
+        now:    Time which relative datetimes are resolved against, defaults to the current time
+    Returns:
+        Parsed Expression
+    Raises:
+        InvalidFilter if the expression cannot be parsed
+    '''
+    if now is None:
+        now = pd.Timestamp.now(tz='UTC')
+
+    parser = _Parser(_tokenize(query), now)
+    expr = parser.expression()
+    token = parser.peek()
+    if token is not None:
+        raise InvalidFilter(f'Unexpected "{token[1]}" in filter')
+    return expr
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        match = TOKEN_RE.match(query, pos)
+        if not match:
+            raise InvalidFilter(f'Unexpected "{query[pos:].strip()[:10]}" in filter')
+
+        kind = str(match.lastgroup)
+        text = match.group(kind)
+        if kind == 'string':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        elif kind == 'word' and text.lower() in KEYWORDS:
+            kind, text = 'keyword', text.lower()
+
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    '''
+    Recursive descent parser, where `and` binds more tightly than `or`
+    '''
+    def __init__(self, tokens: List[Tuple[str, str]], now: pd.Timestamp):
+        self.tokens = tokens
+        self.pos = 0
+        self.now = now
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self, expected: str) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise InvalidFilter(f'Expected {expected} at end of filter')
+        self.pos += 1
+        return token
+
+    def accept(self, kind: str, text: str) -> bool:
+        if self.peek() == (kind, text):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: str):
+        token = self.next(f'"{text}"')
+        if token != (kind, text):
+            raise InvalidFilter(f'Expected "{text}" but found "{token[1]}" in filter')
+
+
+    def expression(self) -> Expression:
+        items = [self.conjunction()]
+        while self.accept('keyword', 'or'):
+            items.append(self.conjunction())
+        return items[0] if len(items) == 1 else Or(items)
+
+    def conjunction(self) -> Expression:
+        items = [self.negation()]
+        while self.accept('keyword', 'and'):
+            items.append(self.negation())
+        return items[0] if len(items) == 1 else And(items)
+
+    def negation(self) -> Expression:
+        if self.accept('keyword', 'not'):
+            return Not(self.negation())
+        if self.accept('op', '('):
+            expr = self.expression()
+            self.expect('op', ')')
+            return expr
+        return self.comparison()
+
+    def comparison(self) -> Expression:
+        kind, name = self.next('a field name')
+        if kind not in ('word', 'string'):
+            raise InvalidFilter(f'Expected a field name but found "{name}" in filter')
+
+        field = ALIASES.get(name.lower(), name.lower())
+        if field not in FIELDS:
+            raise InvalidFilter(f'Unknown field "{name}" in filter')
+
+        if self.accept('keyword', 'is'):
+            negate = self.accept('keyword', 'not')
+            if not (self.accept('keyword', 'empty') or self.accept('keyword', 'null')):
+                raise InvalidFilter(f'Expected "empty" after "{name} is" in filter')
+            expr: Expression = Comparison(field, 'empty', [])
+            return Not(expr) if negate else expr
+
+        if self.accept('keyword', 'not'):
+            self.expect('keyword', 'in')
+            return Comparison(field, '!=', self.value_list(field))
+
+        if self.accept('keyword', 'in'):
+            return Comparison(field, '=', self.value_list(field))
+
+        kind, op = self.next(f'an operator after "{name}"')
+        if kind != 'op' or op in ('(', ')', ','):
+            raise InvalidFilter(f'Expected an operator after "{name}" but found "{op}" in filter')
+
+        if op in ('<', '<=', '>', '>=') and field not in DATETIME_FIELDS + INT_FIELDS:
+            raise InvalidFilter(f'Operator "{op}" cannot be used with field "{name}"')
+        if op in ('~', '!~') and field in DATETIME_FIELDS + INT_FIELDS:
+            raise InvalidFilter(f'Operator "{op}" cannot be used with field "{name}"')
+
+        value = self.value(field)
+        if value is ME and op not in ('=', '!='):
+            raise InvalidFilter(f'Operator "{op}" cannot be used with "me"')
+
+        return Comparison(field, op, [value])
+
+    def value_list(self, field: str) -> List[Any]:
+        self.expect('op', '(')
+        values = [self.value(field)]
+        while self.accept('op', ','):
+            values.append(self.value(field))
+        self.expect('op', ')')
+        return values
+
+    def value(self, field: str) -> Any:
+        kind, text = self.next(f'a value for "{field}"')
+        if kind == 'op':
+            raise InvalidFilter(f'Expected a value for "{field}" but found "{text}" in filter')
+
+        if kind == 'word' and text == 'me' and field in USER_FIELDS:
+            return ME
+
+        if field in DATETIME_FIELDS:
+            return self.datetime(text)
+
+        if field in INT_FIELDS:
+            try:
+                return int(text)
+            except ValueError:
+                raise InvalidFilter(f'Expected a number for "{field}" but found "{text}" in filter')
+
+        return text
+
+    def datetime(self, text: str) -> pd.Timestamp:
+        match = RELATIVE_RE.match(text)
+        if match:
+            return self.now + pd.Timedelta(**{RELATIVE_UNITS[match[2]]: int(match[1])})
+
+        try:
+            ts = pd.Timestamp(text)
+        except ValueError:
+            raise InvalidFilter(f'Expected a date, or a relative date such as -7d, but found "{text}" in filter')
+
+        if ts.tzinfo is None:
+            # dates without a timezone are local
+            ts = ts.tz_localize(tzlocal())
+        return ts.tz_convert('UTC')
@@ -0,0 +1,172 @@
+'''
+Indexes over issue fields, held by `Jira` and kept up to date as issues are set, modified and deleted.
+Each index declares the fields it needs, and is passed a row of those fields for each issue.
+'''
+from abc import ABC, abstractmethod
+import re
+from typing import Any, Dict, Hashable, MutableMapping, Optional, Sequence, Set, Tuple, TypeVar
+
+
+class IssueIndex(ABC):
+    '''
+    Base class for an index over issue fields
+    '''
+    # Issue fields passed to `IssueIndex.add`, from `utils.dataframe.COLUMNS`
+    FIELDS: Sequence[str] = ()
+
+    @abstractmethod
+    def add(self, key: str, row: Dict[str, Any]):
+        '''
+        Index an issue, replacing any earlier entry for the same key
+
+        Params:
+            key:  Issue key
+            row:  Values of the issue's fields, as returned by `utils.dataframe.issue_row`
+        '''
+
+    @abstractmethod
+    def remove(self, key: str):
+        '''
+        Remove an issue from the index, if present
+
+        Params:
+            key:  Issue key
+        '''
+
+
+# words ignored when comparing summaries for near-duplicates
+SUMMARY_STOPWORDS = frozenset(('a', 'an', 'the'))
+
+
+def normalise_summary(summary: Optional[str]) -> str:
+    '''
+    Return a summary with differences in case and whitespace removed
+    '''
+    return ' '.join((summary or '').casefold().split())
+
+
+def fuzzy_summary(summary: Optional[str]) -> str:
+    '''
+    Return a summary reduced to its significant words, so that near-duplicate summaries which differ
+    only in case, punctuation, articles or plurals are equal
+    '''
+    words = re.findall(r'\w+', (summary or '').casefold())
+    return ' '.join(
+        word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+        for word in words if word not in SUMMARY_STOPWORDS
+    )
+
+
+# the type of the values by which an index maps to issue keys
+K = TypeVar('K', bound=Hashable)
+
+
+def _add(index: MutableMapping[K, Set[str]], value: K, key: str):
+    index.setdefault(value, set()).add(key)
+
+
+def _discard(index: MutableMapping[K, Set[str]], value: K, key: str):
+    keys = index.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
+
+class EpicIndex(IssueIndex):
+    '''
+    Index of epics, and the issues linked to each epic
+
+    Attributes:
+        epics:     Keys of all epics
+        children:  Map of epic key to the keys of issues linked to it by `Issue.epic_ref`
+        names:     Map of an epic's summary and epic_name to the keys of epics using it
+    '''
+    FIELDS = ('issuetype', 'epic_ref', 'summary', 'epic_name')
+
+    def __init__(self):
+        self.epics: Set[str] = set()
+        self.children: Dict[str, Set[str]] = {}
+        self.names: Dict[str, Set[str]] = {}
+
+        # values indexed for each key, so an entry can be removed when the issue changes
+        self._entries: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+
+    def add(self, key: str, row: Dict[str, Any]):
+        self.remove(key)
+
+        epic_ref = row['epic_ref'] or None
+        if epic_ref:
+            _add(self.children, epic_ref, key)
+
+        names: Tuple[str, ...] = ()
+        if row['issuetype'] == 'Epic':
+            self.epics.add(key)
+            names = tuple({row['summary'], row['epic_name']}.difference({None, ''}))
+            for name in names:
+                _add(self.names, name, key)
+
+        self._entries[key] = (epic_ref, names)
+
+    def remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        epic_ref, names = entry
+        if epic_ref:
+            _discard(self.children, epic_ref, key)
+        for name in names:
+            _discard(self.names, name, key)
+        self.epics.discard(key)
+
+
+class SummaryIndex(IssueIndex):
+    '''
+    Index of issue summaries in each project, for constant-time duplicate checks
+
+    Attributes:
+        exact:  Map of project ID and normalised summary to the keys of issues using it
+        fuzzy:  Map of project ID and summary reduced by `fuzzy_summary` to the keys of issues
+    '''
+    FIELDS = ('project_id', 'summary')
+
+    def __init__(self):
+        self.exact: Dict[Tuple[str, str], Set[str]] = {}
+        self.fuzzy: Dict[Tuple[str, str], Set[str]] = {}
+
+        # values indexed for each key, so an entry can be removed when the issue changes
+        self._entries: Dict[str, Tuple[Tuple[str, str], Tuple[str, str]]] = {}
+
+    def add(self, key: str, row: Dict[str, Any]):
+        self.remove(key)
+
+        exact = (row['project_id'], normalise_summary(row['summary']))
+        fuzzy = (row['project_id'], fuzzy_summary(row['summary']))
+        _add(self.exact, exact, key)
+        _add(self.fuzzy, fuzzy, key)
+
+        self._entries[key] = (exact, fuzzy)
+
+    def remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        exact, fuzzy = entry
+        _discard(self.exact, exact, key)
+        _discard(self.fuzzy, fuzzy, key)
+
+    def find(self, project_id: str, summary: str, fuzzy: bool=False) -> Set[str]:
+        '''
+        Return the keys of issues in a project with the same summary
+
+        Params:
+            project_id:  ID of the project to search
+            summary:     Summary to look up
+            fuzzy:       Also match near-duplicate summaries, as reduced by `fuzzy_summary`
+        '''
+        keys = set(self.exact.get((project_id, normalise_summary(summary)), ()))
+        if fuzzy:
+            keys.update(self.fuzzy.get((project_id, fuzzy_summary(summary)), ()))
+        return keys
@@ -0,0 +1,123 @@
+'''
+Read and write the issue cache in the Apache Parquet columnar format. This requires the optional
+pyarrow library, which is installed with `pip install jira-offline[parquet]`.
+'''
+import dataclasses
+import functools
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from jira_offline.exceptions import CacheFormatUnavailable
+from jira_offline.models import Issue
+from jira_offline.utils.codec import dumps as json_dumps, loads as json_loads
+from jira_offline.utils.serializer import get_base_type
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Issue fields which are not written to the cache
+SKIP_FIELDS = {'project', 'original'}
+
+
+@functools.lru_cache()
+def issue_schema() -> 'pa.Schema':
+    '''
+    Build the Parquet schema for the issue cache from the Issue dataclass.
+
+    Datetimes are stored in their serialized ISO format to retain the timezone offset. The
+    `diff_to_original` field has no fixed type, and so is stored as a JSON string.
+    '''
+    columns = []
+
+    for f in dataclasses.fields(Issue):
+        if f.name in SKIP_FIELDS:
+            continue
+
+        base_type = get_base_type(f.type)
+
+        if f.name == 'diff_to_original':
+            type_ = pa.string()
+        elif base_type in (set, list):
+            type_ = pa.list_(pa.string())
+        elif base_type is int:
+            type_ = pa.int64()
+        else:
+            type_ = pa.string()
+
+        columns.append(pa.field(f.name, type_))
+
+    return pa.schema(columns)
+
+
+def write_parquet(path: str, records: List[dict]):
+    '''
+    Write serialized issues to a Parquet file
+
+    Params:
+        path:     Path to the cache file
+        records:  List of serialized Issue dicts, including the diff_to_original field
+    '''
+    if pa is None:
+        raise CacheFormatUnavailable('parquet')
+
+    schema = issue_schema()
+
+    columns = {name: [r.get(name) for r in records] for name in schema.names}
+    columns['diff_to_original'] = [
+        json_dumps(d) if d is not None else None for d in columns['diff_to_original']
+    ]
+
+    pq.write_table(pa.Table.from_pydict(columns, schema=schema), path)
+
+
+def read_parquet(path: str) -> Tuple[pd.DataFrame, Iterator[dict]]:
+    '''
+    Read issues from a Parquet file
+
+    Params:
+        path:  Path to the cache file
+    Returns:
+        Tuple of a DataFrame of the issues indexed by key (with datetimes as ISO strings, ready for
+        `utils.dataframe.apply_schema`), and an iterator of serialized issue dicts, suitable for
+        passing to `Issue.deserialize`. The dicts are converted one record batch at a time as the
+        iterator is consumed.
+    Raises:
+        ValueError if the file is not a valid issue cache
+    '''
+    if pa is None:
+        raise CacheFormatUnavailable('parquet')
+
+    try:
+        table = pq.read_table(path)
+        df = table.drop(['diff_to_original']).to_pandas()
+    except pa.ArrowException as e:
+        raise ValueError(f'Failed reading {path} ({e})') from e
+
+    def to_set(value: Optional[list]) -> Optional[set]:
+        return set(value) if value is not None else None
+
+    # match the python types of the Issue set attributes found in `Jira.df`
+    for f in dataclasses.fields(Issue):
+        if f.name in df and get_base_type(f.type) is set:
+            df[f.name] = df[f.name].map(to_set)
+
+    # copy the keys, so the index does not share memory with the key column
+    df.index = df['key'].to_numpy(copy=True)
+    return df, _iter_records(table)
+
+
+def _iter_records(table: 'pa.Table') -> Iterator[dict]:
+    '''
+    Convert the rows of a table to serialized issue dicts, one record batch at a time
+    '''
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            obj = {k: v for k, v in row.items() if v is not None}
+            if 'diff_to_original' in obj:
+                obj['diff_to_original'] = json_loads(obj['diff_to_original'])
+            yield obj
@@ -2,7 +2,9 @@ import dataclasses
 import datetime
 import decimal
 import enum
-from typing import Any, Optional
+import functools
+import re
+from typing import Any, Callable, cast, List, Optional, Tuple, TypeVar
 import uuid
 
 import arrow
@@ -12,6 +14,23 @@ import typing_inspect
 from jira_offline.exceptions import DeserializeError
 
 
+# ISO-8601 datetime as emitted by Jira, and by `datetime.isoformat` into the cache. The UTC offset is
+# matched but not used, as deserialized datetimes take the timezone passed to the deserializer.
+ISO_DATETIME = re.compile(
+    r'(\d{4}-\d\d-\d\d)[T ](\d\d:\d\d:\d\d)(?:\.(\d{1,6}))?(?:Z|[+-]\d\d(?::?\d\d)?)?$'
+)
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+def _memoize(func: F) -> F:
+    '''
+    Cache the results of `func` for the lifetime of the process. This is `functools.lru_cache`, typed
+    as the function it wraps, since a dataclass type is not `Hashable` to mypy.
+    '''
+    return cast(F, functools.lru_cache(maxsize=None)(func))
+
+
 def unwrap_optional_type(type_):
     '''
     Unwrap typing.Optional around a type.
@@ -66,6 +85,40 @@ def get_enum(type_: type) -> Optional[type]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def get_tz(tz: Optional[str]=None) -> Optional[datetime.tzinfo]:
+    '''
+    Return a timezone object by name, or the local timezone if no name is supplied. Timezone objects
+    are created once, and reused.
+    '''
+    zone: Optional[datetime.tzinfo] = gettz(tz) if tz else tzlocal()
+    return zone
+
+
+def parse_datetime(value: Any, tz: Optional[datetime.tzinfo]) -> datetime.datetime:
+    '''
+    Parse a datetime, and set its timezone to `tz`. ISO-8601 strings are parsed directly, and any
+    other format is parsed by arrow.
+
+    Params:
+        value:  Value to parse
+        tz:     Timezone to apply to the datetime
+    '''
+    match = ISO_DATETIME.match(value) if isinstance(value, str) else None
+    if match:
+        date, time, fraction = match.groups()
+        try:
+            return datetime.datetime.fromisoformat(
+                f'{date}T{time}.{(fraction or "").ljust(6, "0")}'
+            ).replace(tzinfo=tz)
+        except ValueError:
+            # out of range values, such as month 13, are reported by arrow below
+            pass
+
+    dt: datetime.datetime = arrow.get(value).replace(tzinfo=tz).datetime
+    return dt
+
+
 def istype(type_: type, typ: type) -> bool:
     '''
     Return True if type_ is typ, else return False. Handles Optional types.
@@ -73,7 +126,7 @@ def istype(type_: type, typ: type) -> bool:
     return typ is unwrap_optional_type(type_)
 
 
-def deserialize_value(type_, value: Any, tz: Optional[datetime.tzinfo]=None) -> Any:  # pylint: disable=too-many-branches, too-many-return-statements, too-many-statements
+def deserialize_value(type_, value: Any, tz: Optional[datetime.tzinfo]=None) -> Any:
     '''
     Utility function to deserialize `value` into `type_`. Used by DataclassSerializer.
 
@@ -84,118 +137,149 @@ def deserialize_value(type_, value: Any, tz: Optional[datetime.tzinfo]=None) ->
         value:  Value to serialize to `type_`
         tz:     Timezone to apply to deserialized date/datetime
     '''
-    if value is None:
-        return None
+    return compile_deserializer(type_)(value, tz)
+
+
+@_memoize
+def compile_deserializer(type_) -> Callable[[Any, Optional[datetime.tzinfo]], Any]:  # pylint: disable=too-many-statements, too-many-branches, too-many-return-statements
+    '''
+    Build a function which deserializes a value into `type_`. The type inspection is done once here,
+    and the returned function is cached for reuse on every value of the same type.
 
+    Params:
+        type_:  The dataclass field type
+    Returns:
+        Function accepting the value to deserialize, and the timezone to apply to date/datetime
+    '''
     # unwrap any typing.Optional to expose the underlying type
     type_ = unwrap_optional_type(type_)
 
     # extract the base type (eg. typing.Dict becomes dict)
     base_type = get_base_type(type_)
 
+    convert: Callable[[Any, Optional[datetime.tzinfo]], Any]
+
     if dataclasses.is_dataclass(base_type):
-        return base_type.deserialize(value)
+        def convert(value, _tz):
+            return base_type.deserialize(value)
 
     elif base_type is decimal.Decimal:
-        try:
-            return decimal.Decimal(value)
-        except decimal.InvalidOperation:
-            raise DeserializeError(f'Failed deserializing "{value}" to Decimal')
+        def convert(value, _tz):
+            try:
+                return decimal.Decimal(value)
+            except decimal.InvalidOperation:
+                raise DeserializeError(f'Failed deserializing "{value}" to Decimal')
 
     elif base_type is uuid.UUID:
-        try:
-            return uuid.UUID(value)
-        except ValueError:
-            raise DeserializeError(f'Failed deserializing "{value}" to UUID')
+        def convert(value, _tz):
+            try:
+                return uuid.UUID(value)
+            except ValueError:
+                raise DeserializeError(f'Failed deserializing "{value}" to UUID')
 
     elif base_type is datetime.date:
-        if tz is None:
-            tz = tzlocal()
-        try:
-            return arrow.get(value).replace(tzinfo=tz).datetime.date()
-        except arrow.parser.ParserError:
-            raise DeserializeError(f'Failed deserializing "{value}" to Arrow datetime.date')
+        def convert(value, tz):
+            if tz is None:
+                tz = get_tz()
+            try:
+                return parse_datetime(value, tz).date()
+            except arrow.parser.ParserError:
+                raise DeserializeError(f'Failed deserializing "{value}" to Arrow datetime.date')
 
     elif base_type is datetime.datetime:
-        if tz is None:
-            tz = tzlocal()
-        try:
-            return arrow.get(value).replace(tzinfo=tz).datetime
-        except arrow.parser.ParserError:
-            raise DeserializeError(f'Failed deserializing "{value}" to Arrow datetime.datetime')
+        def convert(value, tz):
+            if tz is None:
+                tz = get_tz()
+            try:
+                return parse_datetime(value, tz)
+            except arrow.parser.ParserError:
+                raise DeserializeError(f'Failed deserializing "{value}" to Arrow datetime.datetime')
 
     elif base_type is set:
-        if not isinstance(value, set) and not isinstance(value, list):
-            raise DeserializeError('Value passed to set type must be set or list')
-        return set(value)
+        def convert(value, _tz):
+            if not isinstance(value, set) and not isinstance(value, list):
+                raise DeserializeError('Value passed to set type must be set or list')
+            return set(value)
 
     elif base_type is int:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            raise DeserializeError(f'Failed deserializing {value} to int')
+        def convert(value, _tz):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise DeserializeError(f'Failed deserializing {value} to int')
 
     elif base_type is dict and typing_inspect.is_generic_type(type_):
         # extract key and value types for the generic Dict
-        generic_key_type, generic_value_type = type_.__args__[0], type_.__args__[1]
+        convert_key = compile_deserializer(type_.__args__[0])
+        convert_value = compile_deserializer(type_.__args__[1])
 
-        try:
-            # deserialize keys and values individually, constructing a new dict
-            return {
-                deserialize_value(generic_key_type, item_key, tz=tz):
-                    deserialize_value(generic_value_type, item_value, tz=tz)
-                for item_key, item_value in value.items()
-            }
-        except AttributeError:
-            raise DeserializeError(f'Failed serializing "{value}" to {base_type}')
+        def convert(value, tz):
+            try:
+                # deserialize keys and values individually, constructing a new dict
+                return {
+                    convert_key(item_key, tz): convert_value(item_value, tz)
+                    for item_key, item_value in value.items()
+                }
+            except AttributeError:
+                raise DeserializeError(f'Failed serializing "{value}" to {base_type}')
 
     elif base_type is dict:
-        # additional error handling for non-generic dict type
-        if not isinstance(value, dict):
-            raise DeserializeError('Value passed for dict types must be dict')
+        def convert(value, _tz):
+            # additional error handling for non-generic dict type
+            if not isinstance(value, dict):
+                raise DeserializeError('Value passed for dict types must be dict')
 
-        # a python dict is JSON-compatible, so no additional conversion necessary
+            # a python dict is JSON-compatible, so no additional conversion necessary
+            return value
 
     elif base_type is list and typing_inspect.is_generic_type(type_):
-        if not isinstance(value, list):
-            # additional error handling is required here as python will iterate a string as though its
-            # a list; causing subsequent code to produce incorrect results when a string is fed to
-            # the deserializer
-            raise DeserializeError('Value passed for list types must be list')
-
         # extract value type for the generic List
-        generic_type = type_.__args__[0]
+        convert_item = compile_deserializer(type_.__args__[0])
 
-        try:
-            # deserialize values individually into a new list
-            return [
-                deserialize_value(generic_type, v, tz=tz) for v in value
-            ]
-        except (AttributeError, TypeError):
-            raise DeserializeError(f'Failed serializing "{value}" to {type_}')
+        def convert(value, tz):
+            if not isinstance(value, list):
+                # additional error handling is required here as python will iterate a string as though
+                # its a list; causing subsequent code to produce incorrect results when a string is fed
+                # to the deserializer
+                raise DeserializeError('Value passed for list types must be list')
+
+            try:
+                # deserialize values individually into a new list
+                return [convert_item(v, tz) for v in value]
+            except (AttributeError, TypeError):
+                raise DeserializeError(f'Failed serializing "{value}" to {type_}')
 
     elif base_type is list:
-        # additional error handling for non-generic list type
-        if not isinstance(value, list):
-            raise DeserializeError('Value passed for list types must be list')
+        def convert(value, _tz):
+            # additional error handling for non-generic list type
+            if not isinstance(value, list):
+                raise DeserializeError('Value passed for list types must be list')
 
-        # a python list is JSON-compatible, so no additional conversion necessary
+            # a python list is JSON-compatible, so no additional conversion necessary
+            return value
 
-    else:
-        # handle enum
-        enum_type = get_enum(base_type)
-        if enum_type:
+    elif get_enum(base_type):
+        def convert(value, _tz):
             try:
                 # convert string to Enum instance
-                return enum_type(value)
+                return base_type(value)
             except ValueError:
                 raise DeserializeError(f'Failed deserializing {value} to {type_}')
 
-    # no deserialize necessary
-    return value
+    else:
+        # no deserialize necessary
+        def convert(value, _tz):
+            return value
 
+    def deserialize(value: Any, tz: Optional[datetime.tzinfo]=None) -> Any:
+        if value is None:
+            return None
+        return convert(value, tz)
 
-def serialize_value(type_, value: Any) -> Any:  # pylint: disable=too-many-return-statements
+    return deserialize
+
+
+def serialize_value(type_, value: Any) -> Any:
     '''
     Utility function to serialize `value` into `type_`. Used by DataclassSerializer.
 
@@ -205,51 +289,79 @@ def serialize_value(type_, value: Any) -> Any:  # pylint: disable=too-many-retur
         type_:  The dataclass field type
         value:  Value to serialize to `type_`
     '''
+    return compile_serializer(type_)(value)
+
+
+@_memoize
+def compile_serializer(type_) -> Callable[[Any], Any]:
+    '''
+    Build a function which serializes a value of `type_`. The type inspection is done once here,
+    and the returned function is cached for reuse on every value of the same type.
+
+    Params:
+        type_:  The dataclass field type
+    Returns:
+        Function accepting the value to serialize
+    '''
     # unwrap any typing.Optional to expose the underlying type
     type_ = unwrap_optional_type(type_)
 
     # extract the base type (eg. typing.Dict becomes dict)
     base_type = get_base_type(type_)
 
-    if value is None:
-        return None
+    convert: Callable[[Any], Any]
 
-    elif dataclasses.is_dataclass(base_type):
-        return value.serialize()
+    if dataclasses.is_dataclass(base_type):
+        def convert(value):
+            return value.serialize()
 
     elif base_type in (decimal.Decimal, uuid.UUID):
-        return str(value)
+        convert = str
 
     elif base_type in (datetime.date, datetime.datetime):
-        return value.isoformat()
+        def convert(value):
+            return value.isoformat()
 
     elif base_type in (set,):
-        return sorted(list(value))
+        convert = sorted
 
     elif base_type is dict and typing_inspect.is_generic_type(type_):
         # extract key and value types for the generic Dict
-        generic_key_type, generic_value_type = type_.__args__[0], type_.__args__[1]
+        convert_key = compile_serializer(type_.__args__[0])
+        convert_value = compile_serializer(type_.__args__[1])
 
-        # serialize keys and values individually, constructing a new dict
-        return {
-            serialize_value(generic_key_type, item_key):
-                serialize_value(generic_value_type, item_value)
-            for item_key, item_value in value.items()
-        }
+        def convert(value):
+            # serialize keys and values individually, constructing a new dict
+            return {
+                convert_key(item_key): convert_value(item_value)
+                for item_key, item_value in value.items()
+            }
 
     elif base_type is list and typing_inspect.is_generic_type(type_):
         # extract value type for the generic List
-        generic_type = type_.__args__[0]
+        convert_item = compile_serializer(type_.__args__[0])
 
-        # serialize values individually into a new list
-        return [serialize_value(generic_type, v) for v in value]
+        def convert(value):
+            # serialize values individually into a new list
+            return [convert_item(v) for v in value]
 
-    else:
-        # handle enum
-        if get_enum(base_type):
+    elif get_enum(base_type):
+        def convert(value):
             return value.value
 
-    # no serialize necessary
+    else:
+        # no serialize necessary
+        return _identity
+
+    def serialize(value: Any) -> Any:
+        if value is None:
+            return None
+        return convert(value)
+
+    return serialize
+
+
+def _identity(value: Any) -> Any:
     return value
 
 
@@ -262,6 +374,52 @@ def _validate_optional_fields_have_a_default(field):
         raise DeserializeError(f'Field {field.name} is Optional with no default configured')
 
 
+@_memoize
+def _deserialize_plan(cls: type) -> List[Tuple[str, bool, Callable]]:
+    '''
+    Compile the list of fields to deserialize for a dataclass, once per class
+
+    Returns:
+        List of tuples of field name, is the field optional, and the field's deserialize function
+    '''
+    plan = []
+
+    for f in dataclasses.fields(cls):
+        # check for field read/write metadata, which determines if fields are ignored
+        # if the "r" field is not present, do not deserialize this field
+        rw_flag = f.metadata.get('rw', 'rw')
+        if 'r' not in rw_flag:
+            continue
+
+        _validate_optional_fields_have_a_default(f)
+
+        plan.append((f.name, typing_inspect.is_optional_type(f.type), compile_deserializer(f.type)))
+
+    return plan
+
+
+@_memoize
+def _serialize_plan(cls: type) -> List[Tuple[str, Callable]]:
+    '''
+    Compile the list of fields to serialize for a dataclass, once per class
+
+    Returns:
+        List of tuples of field name, and the field's serialize function
+    '''
+    plan = []
+
+    for f in dataclasses.fields(cls):
+        # check for field read/write metadata, which determines if fields are ignored
+        # if the "w" field is not present, do not serialize this field
+        rw_flag = f.metadata.get('rw', 'rw')
+        if 'w' not in rw_flag:
+            continue
+
+        plan.append((f.name, compile_serializer(f.type)))
+
+    return plan
+
+
 @dataclasses.dataclass
 class DataclassSerializer:
     @classmethod
@@ -280,42 +438,31 @@ class DataclassSerializer:
         '''
         data = {}
 
-        for f in dataclasses.fields(cls):
-            # check for field read/write metadata, which determines if fields are ignored
-            # if the "r" field is not present, do not deserialize this field
-            rw_flag = f.metadata.get('rw', 'rw')
-            if 'r' not in rw_flag:
-                continue
+        tzobj = get_tz(tz) if tz else None
 
+        for name, is_optional, deserialize in _deserialize_plan(cls):
             raw_value = None
 
-            _validate_optional_fields_have_a_default(f)
-
             try:
                 # pull value from dataclass field name, or by property name, if defined on the dataclass.field
-                raw_value = attrs[f.name]
+                raw_value = attrs[name]
 
             except KeyError as e:
                 # handle key missing from passed dict
                 if ignore_missing is False:
                     # if the missing key's type is non-optional, raise an exception
-                    if not typing_inspect.is_optional_type(f.type):
-                        raise DeserializeError(f'Missing input data for mandatory key {f.name}')
+                    if not is_optional:
+                        raise DeserializeError(f'Missing input data for mandatory key {name}')
                     continue
 
             except TypeError as e:
-                raise DeserializeError(f'Fatal TypeError for key {f.name} ({e})')
+                raise DeserializeError(f'Fatal TypeError for key {name} ({e})')
 
             try:
-                if tz:
-                    tzobj = gettz(tz)
-                else:
-                    tzobj = None
-
-                data[f.name] = deserialize_value(f.type, raw_value, tz=tzobj)
+                data[name] = deserialize(raw_value, tzobj)
 
             except DeserializeError as e:
-                raise DeserializeError(f'{e} in field {f.name}')
+                raise DeserializeError(f'{e} in field {name}')
 
         # feed additional kwargs to the target class constructor
         if constructor_kwargs:
@@ -333,15 +480,9 @@ class DataclassSerializer:
         '''
         data = {}
 
-        for f in dataclasses.fields(self):
-            # check for field read/write metadata, which determines if fields are ignored
-            # if the "w" field is not present, do not serialize this field
-            rw_flag = f.metadata.get('rw', 'rw')
-            if 'w' not in rw_flag:
-                continue
-
-            serialized_value = serialize_value(f.type, getattr(self, f.name))
+        for name, serialize in _serialize_plan(type(self)):
+            serialized_value = serialize(getattr(self, name))
             if serialized_value:
-                data[f.name] = serialized_value
+                data[name] = serialized_value
 
         return data
@@ -0,0 +1,253 @@
+'''
+Store the issue cache in an SQLite database. Selected issue fields are held in indexed columns, so
+that lookups can be resolved by query instead of scanning every issue in the cache.
+'''
+import collections.abc
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from jira_offline.utils.codec import dumps as json_dumps, loads as json_loads
+
+
+# Issue fields held in indexed columns
+INDEXED_FIELDS = ('project_id', 'issuetype', 'status', 'epic_ref', 'assignee', 'updated')
+
+# Issue fields held in columns, which can be passed to `SqliteStore.select`
+COLUMNS = INDEXED_FIELDS + ('epic_name', 'summary')
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS issues (key TEXT PRIMARY KEY, {}, data TEXT NOT NULL)'.format(
+        ', '.join(f'{name} TEXT' for name in COLUMNS)
+    ),
+    'CREATE TABLE IF NOT EXISTS fix_versions (key TEXT NOT NULL, version TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS ix_fix_versions_version ON fix_versions (version)',
+    'CREATE INDEX IF NOT EXISTS ix_fix_versions_key ON fix_versions (key)',
+    *(f'CREATE INDEX IF NOT EXISTS ix_issues_{name} ON issues ({name})' for name in INDEXED_FIELDS),
+]
+
+
+class SqliteStore(collections.abc.MutableMapping):
+    '''
+    A mapping of issue key to issue, backed by an SQLite database.
+
+    Issues are read from the database in serialized form. Any value accessed or set is held in memory,
+    and changes are only written to the database by `SqliteStore.write`.
+    '''
+    def __init__(self, path: str):
+        # the connection is shared with push worker threads, which hold `IssueChanges.lock` while using it
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+        # issues accessed or set since load
+        self.loaded: Dict[str, Any] = dict()
+
+        # keys of issues deleted since the last write
+        self._deleted: Set[str] = set()
+
+
+    def __getitem__(self, key):
+        if key in self.loaded:
+            return self.loaded[key]
+        if key in self._deleted:
+            raise KeyError(key)
+
+        row = self.conn.execute('SELECT data FROM issues WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        obj = self.loaded[key] = json_loads(row[0])
+        return obj
+
+    def __setitem__(self, key, value):
+        self.loaded[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.loaded.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+        if key in self.loaded:
+            return True
+        if key in self._deleted:
+            return False
+        return self.conn.execute('SELECT 1 FROM issues WHERE key = ?', (key,)).fetchone() is not None
+
+    def __iter__(self):
+        for key, _ in self._iter_rows('SELECT key, NULL FROM issues ORDER BY rowid'):
+            yield key
+
+    def __len__(self):
+        count = self.conn.execute('SELECT COUNT(*) FROM issues').fetchone()[0]
+
+        # adjust for changes not yet written to the database
+        persisted = self._persisted(self.loaded.keys() | self._deleted)
+        return (
+            count + sum(1 for key in self.loaded if key not in persisted)
+            - sum(1 for key in self._deleted if key in persisted)
+        )
+
+    def items(self) -> Iterator[Tuple[str, Any]]:  # type: ignore[override]
+        '''
+        Iterate all issues with a single query, rather than one query per key
+        '''
+        for key, data in self._iter_rows('SELECT key, data FROM issues ORDER BY rowid'):
+            yield key, self.loaded[key] if key in self.loaded else json_loads(data)
+
+    def changed_items(self) -> Iterator[Tuple[str, Any]]:
+        '''
+        Iterate the issues which may have local changes to push to Jira. Only the rows of new issues,
+        without an id, and of issues with a diff_to_original are read and decoded. Issues accessed or
+        set since load are all included, for the caller to check.
+        '''
+        sql = (
+            "SELECT key, data FROM issues WHERE json_extract(data, '$.id') IS NULL "
+            "OR json_array_length(data, '$.diff_to_original') > 0 ORDER BY rowid"
+        )
+        for key, data in self._iter_rows(sql):
+            yield key, self.loaded[key] if key in self.loaded else json_loads(data)
+
+    def _iter_rows(self, sql: str) -> Iterator[Tuple[str, Any]]:
+        '''
+        Iterate rows of (key, value) from a query in the order issues were first written to the
+        database, merging in changes not yet written. Deleted issues are skipped, and issues set since
+        the last write follow in the order they were set.
+
+        Params:
+            sql:  Query returning rows of (key, value) from the issues table
+        '''
+        seen: Set[str] = set()
+
+        for key, value in self.conn.execute(sql):
+            if key in self._deleted:
+                continue
+            if key in self.loaded:
+                seen.add(key)
+            yield key, value
+
+        for key in list(self.loaded):
+            if key not in seen:
+                yield key, None
+
+    def _persisted(self, keys: Iterable[str]) -> Set[str]:
+        '''
+        Return the subset of keys which are held in the database
+
+        Params:
+            keys:  Issue keys to look up
+        '''
+        keys = list(keys)
+        persisted: Set[str] = set()
+
+        # stay within SQLite's limit on the number of parameters in a statement
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i+500]
+            persisted.update(key for (key,) in self.conn.execute(
+                'SELECT key FROM issues WHERE key IN ({})'.format(', '.join('?' * len(chunk))), chunk
+            ))
+
+        return persisted
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        for _, value in self.items():
+            yield value
+
+    def column_values(self, columns: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate the values held in columns for each issue in the database, without decoding the issues.
+        Issues accessed or set since load are skipped, as they're held in `SqliteStore.loaded`.
+
+        Params:
+            columns:  Names of columns, from `sqlite.COLUMNS`
+        '''
+        for key, *values in self.conn.execute('SELECT key, {} FROM issues'.format(', '.join(columns))):
+            if key not in self.loaded and key not in self._deleted:
+                yield key, dict(zip(columns, values))
+
+
+    def select(self, criteria: Dict[str, Any]) -> List[str]:
+        '''
+        Query the database for the keys of issues matching all criteria. Changes not yet written to
+        the database are not reflected.
+
+        Params:
+            criteria:  Map of field name to value. A value of None matches a missing field, and a set
+                       of values matches any of them. For `fix_versions`, issues with any of the
+                       values match.
+        Returns:
+            List of issue keys
+        '''
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        for name, value in criteria.items():
+            if name == 'fix_versions':
+                values = list(value) if isinstance(value, (set, frozenset, list, tuple)) else [value]
+                clauses.append('key IN (SELECT key FROM fix_versions WHERE version IN ({}))'.format(
+                    ', '.join('?' * len(values))
+                ))
+                params.extend(values)
+                continue
+
+            if name not in COLUMNS:
+                raise ValueError(f'Cannot select issues on field {name}')
+
+            if value is None:
+                clauses.append(f'{name} IS NULL')
+            elif isinstance(value, (set, frozenset, list, tuple)):
+                clauses.append('{} IN ({})'.format(name, ', '.join('?' * len(value))))
+                params.extend(value)
+            else:
+                clauses.append(f'{name} = ?')
+                params.append(value)
+
+        sql = 'SELECT key FROM issues'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+
+        return [key for (key,) in self.conn.execute(sql, params) if key not in self._deleted]
+
+
+    def write(self, issues_json: List[dict], deleted: Iterable[str]):
+        '''
+        Write serialized issues to the database, and remove deleted issues, in a single transaction
+
+        Params:
+            issues_json:  List of serialized Issue dicts, including the diff_to_original field
+            deleted:      Keys of issues to delete
+        '''
+        deleted = list(deleted)
+
+        with self.conn:
+            keys = [(obj['key'],) for obj in issues_json] + [(key,) for key in deleted]
+            self.conn.executemany('DELETE FROM fix_versions WHERE key = ?', keys)
+            self.conn.executemany('DELETE FROM issues WHERE key = ?', [(key,) for key in deleted])
+
+            rows = [
+                (*(obj.get(name) for name in COLUMNS), json_dumps(obj), obj['key'])
+                for obj in issues_json
+            ]
+
+            # update existing rows in place, so issues keep their position in iteration order
+            self.conn.executemany(
+                'UPDATE issues SET {}, data = ? WHERE key = ?'.format(
+                    ', '.join(f'{name} = ?' for name in COLUMNS)
+                ),
+                rows
+            )
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO issues ({}, data, key) VALUES ({}, ?, ?)'.format(
+                    ', '.join(COLUMNS), ', '.join('?' * len(COLUMNS))
+                ),
+                rows
+            )
+            self.conn.executemany(
+                'INSERT INTO fix_versions (key, version) VALUES (?, ?)',
+                [(obj['key'], version) for obj in issues_json for version in obj.get('fix_versions') or []]
+            )
+
+        self._deleted.difference_update(deleted)
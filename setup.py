@@ -22,6 +22,11 @@ setup(
     package_dir={'': '.'},
     include_package_data=True,
     install_requires=REQUIRES,
+    python_requires='>=3.7.1',
+    extras_require={
+        'parquet': ['pyarrow>=1.0'],
+        'orjson': ['orjson'],
+    },
     license='MIT License',
     entry_points={
         'console_scripts': [
@@ -36,7 +41,6 @@ setup(
         'Natural Language :: English',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ),
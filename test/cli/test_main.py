@@ -6,7 +6,7 @@ import click
 from click.testing import CliRunner
 import pytest
 
-from fixtures import ISSUE_1, ISSUE_NEW
+from fixtures import ISSUE_1, ISSUE_2, ISSUE_NEW
 from jira_offline.cli import cli
 from jira_offline.jira import Issue
 
@@ -76,6 +76,61 @@ def test_cli_commands_can_return_json(mock_jira_local, mock_jira, command, param
         pytest.fail('Invalid JSON returned!')
 
 
+@pytest.mark.parametrize('command,params', [
+    ('ls', ('--json',)),
+    ('show', ('--json', 'TEST-71')),
+])
+@mock.patch('jira_offline.cli.Jira')
+def test_cli_json_output_matches_stdlib_json(mock_jira_local, mock_jira, command, params):
+    '''
+    Ensure JSON output is encoded as by the stdlib json module, even when orjson is installed
+    '''
+    # set function-local instance of Jira class to our test mock
+    mock_jira_local.return_value = mock_jira
+
+    mock_jira['TEST-71'] = issue = Issue.deserialize(ISSUE_1)
+    issue.summary = 'Summary with ünïcode'
+
+    runner = CliRunner()
+    result = runner.invoke(cli, [command, *params])
+    assert result.exit_code == 0
+    assert result.output == json.dumps(issue.serialize()) + '\n'
+
+
+@mock.patch('jira_offline.cli.Jira')
+def test_cli_ls_filter_option(mock_jira_local, mock_jira):
+    '''
+    Ensure ls lists only the issues matching the --filter expression
+    '''
+    # set function-local instance of Jira class to our test mock
+    mock_jira_local.return_value = mock_jira
+
+    mock_jira['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira['TEST-72'] = Issue.deserialize(ISSUE_2)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ['ls', '--filter', 'status in (Backlog, Done)'])
+    assert result.exit_code == 0
+    assert 'TEST-72' in result.output
+    assert 'TEST-71' not in result.output
+
+
+@mock.patch('jira_offline.cli.Jira')
+def test_cli_ls_invalid_filter_option(mock_jira_local, mock_jira):
+    '''
+    Ensure ls reports an unparseable --filter expression
+    '''
+    # set function-local instance of Jira class to our test mock
+    mock_jira_local.return_value = mock_jira
+
+    mock_jira['TEST-71'] = Issue.deserialize(ISSUE_1)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ['ls', '--filter', 'status = '])
+    assert result.exit_code == 1
+    assert 'Expected a value for "status" at end of filter' in result.output
+
+
 @mock.patch('jira_offline.cli.main.pull_issues')
 @mock.patch('jira_offline.cli.Jira')
 def test_cli_pull_reset_hard_flag_calls_confirm_abort(mock_jira_local, mock_pull_issues, mock_jira):
@@ -105,7 +160,7 @@ def test_cli_new_error_when_passed_project_not_in_config(mock_jira_local, mock_j
     runner = CliRunner()
     result = runner.invoke(cli, ['new', 'EGG', 'Story', 'Summary of issue'])
     assert result.exit_code == 1
-    assert not mock_jira.new_issue.called
+    assert not mock_jira.new_issues.called
 
 
 @mock.patch('jira_offline.cli.Jira')
@@ -119,7 +174,7 @@ def test_cli_new_error_when_not_passed_epic_name_for_epic(mock_jira_local, mock_
     runner = CliRunner()
     result = runner.invoke(cli, ['new', 'TEST', 'Epic', 'Summary of issue'])
     assert result.exit_code == 1
-    assert not mock_jira.new_issue.called
+    assert not mock_jira.new_issues.called
 
 
 @mock.patch('jira_offline.cli.Jira')
@@ -133,7 +188,7 @@ def test_cli_new_error_when_passed_epic_ref_for_epic(mock_jira_local, mock_jira)
     runner = CliRunner()
     result = runner.invoke(cli, ['new', 'TEST', 'Epic', 'Summary of issue', '--epic-ref', 'TEST-1'])
     assert result.exit_code == 1
-    assert not mock_jira.new_issue.called
+    assert not mock_jira.new_issues.called
 
 
 @mock.patch('jira_offline.cli.Jira')
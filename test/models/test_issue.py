@@ -0,0 +1,78 @@
+import copy
+from unittest import mock
+
+from fixtures import ISSUE_1, ISSUE_1_WITH_ASSIGNEE_DIFF
+from jira_offline.models import Issue
+
+
+def test_issue_model__deserialize__is_unmodified(project):
+    '''
+    Validate a freshly deserialized Issue has no modified fields
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+
+    assert issue.modified == set()
+
+
+def test_issue_model__setattr__tracks_modified_fields(project):
+    '''
+    Validate setting fields on an Issue records them as modified, except diff_to_original
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+
+    issue.summary = 'Edited'
+    issue.assignee = 'hoganp'
+    issue.diff_to_original = []
+
+    assert issue.modified == {'summary', 'assignee'}
+
+
+def test_issue_model__deserialize__inflates_original_on_access(project):
+    '''
+    Validate Issue.original is created from diff_to_original only when first accessed
+    '''
+    issue = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF, project=project)
+
+    assert 'original' not in issue.__dict__
+    assert issue.original['assignee'] == 'danil1'
+
+
+def test_issue_model__setattr__inflates_original_before_change(project):
+    '''
+    Validate Issue.original reflects the issue as loaded, when a field is changed before it's accessed
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+
+    issue.assignee = 'hoganp'
+
+    assert issue.original['assignee'] == 'danil1'
+    assert issue.diff() == [('change', 'assignee', ('hoganp', 'danil1'))]
+
+
+def test_issue_model__observe__calls_observer_with_key_on_change(project):
+    '''
+    Validate an observer registered with Issue.observe is called with the issue key when a field is set
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+    observer = mock.Mock()
+    issue.observe(observer)
+
+    issue.assignee = 'hoganp'
+
+    observer.assert_called_once_with('TEST-71')
+
+
+def test_issue_model__deepcopy__does_not_copy_observer(project):
+    '''
+    Validate a copy of an issue does not call the observer of the issue it was copied from
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+    observer = mock.Mock()
+    issue.observe(observer)
+
+    copied = copy.deepcopy(issue)
+    copied.assignee = 'hoganp'
+
+    assert not observer.called
+    assert copied.original == issue.original
+    assert issue.assignee == 'danil1'
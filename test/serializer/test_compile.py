@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+import datetime
+from typing import Optional
+from unittest import mock
+
+from jira_offline.utils.serializer import compile_deserializer, compile_serializer, DataclassSerializer, get_tz
+
+
+@dataclass
+class Test(DataclassSerializer):
+    dt: datetime.datetime
+    other: Optional[datetime.datetime] = None
+
+
+def test_compile_deserializer_is_cached():
+    """
+    Test the deserialize function for a type is compiled once and reused
+    """
+    assert compile_deserializer(Optional[int]) is compile_deserializer(Optional[int])
+    assert compile_serializer(Optional[int]) is compile_serializer(Optional[int])
+
+
+def test_deserialize_looks_up_timezone_once():
+    """
+    Test the timezone is looked up once per object, rather than once per field
+    """
+    with mock.patch('jira_offline.utils.serializer.get_tz', wraps=get_tz) as mock_get_tz:
+        Test.deserialize({'dt': '2018-09-24T08:44:06', 'other': '2018-09-24T08:44:06'}, tz='UTC')
+
+    assert mock_get_tz.call_count == 1
+
+
+def test_get_tz_is_cached():
+    """
+    Test timezone objects are created once, and reused
+    """
+    assert get_tz('Australia/Melbourne') is get_tz('Australia/Melbourne')
+    assert get_tz() is get_tz()
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
 import datetime
+from unittest import mock
 
+import arrow
 from dateutil.tz import gettz, tzlocal, tzoffset
 import pytest
 
-from jira_offline.utils.serializer import DataclassSerializer
+from jira_offline.exceptions import DeserializeError
+from jira_offline.utils.serializer import DataclassSerializer, parse_datetime
 
 
 @dataclass
@@ -87,3 +90,44 @@ def test_datetime_serialize_roundtrip(tz_obj, tz_name):
     assert obj.dt.second == 6
     assert obj.dt.microsecond == 333777
     assert obj.dt.tzinfo == tz_obj
+
+
+@pytest.mark.parametrize('value', [
+    '2018-09-24T08:44:06.000+10:00',
+    '2018-09-24T08:44:06.000+1000',
+    '2018-09-24T08:44:06.333777-06:00',
+    '2018-09-24T08:44:06Z',
+    '2018-09-24T08:44:06',
+    '2018-09-24 08:44:06+00:00',
+])
+def test_datetime_deserialize_fast_path_matches_arrow(value):
+    """
+    Test ISO-8601 datetimes are parsed without arrow, to the same result as arrow
+    """
+    tz = gettz('Australia/Melbourne')
+
+    with mock.patch('jira_offline.utils.serializer.arrow') as mock_arrow:
+        dt = parse_datetime(value, tz)
+        assert not mock_arrow.get.called
+
+    assert dt == arrow.get(value).replace(tzinfo=tz).datetime
+
+
+@pytest.mark.parametrize('value', [
+    '2018-09-24',
+    '2018-09-24T08:44:06.3337771+00:00',
+])
+def test_datetime_deserialize_falls_back_to_arrow(value):
+    """
+    Test datetimes in other formats are parsed by arrow
+    """
+    tz = gettz('UTC')
+    assert parse_datetime(value, tz) == arrow.get(value).replace(tzinfo=tz).datetime
+
+
+def test_datetime_deserialize_invalid_raises():
+    """
+    Test an unparseable datetime raises DeserializeError
+    """
+    with pytest.raises(DeserializeError):
+        Test.deserialize({'dt': 'not a datetime'})
@@ -1,6 +1,9 @@
 '''
 Tests for pull_issues() and pull_single_project() in the sync module
 '''
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import time
 from unittest import mock
 import pytest
 
@@ -8,6 +11,8 @@ from fixtures import ISSUE_1, ISSUE_1_WITH_ASSIGNEE_DIFF, ISSUE_1_WITH_FIXVERSIO
 from jira_offline.exceptions import FailedPullingIssues, JiraApiError
 from jira_offline.models import Issue
 from jira_offline.sync import IssueUpdate, pull_issues, pull_single_project
+from jira_offline.utils.convert import jiraapi_fields
+from jira_offline.utils.serializer import get_tz
 
 
 @mock.patch('jira_offline.sync.pull_single_project')
@@ -78,7 +83,7 @@ def test_pull_single_project__last_updated_set_causes_filter_query_from_last_upd
 
     pull_single_project(mock_jira, project, force=False, verbose=False)
 
-    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated > "2019-01-01 00:00"'
+    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated >= "2019-01-01 00:00" ORDER BY updated ASC, key ASC'
 
 
 @mock.patch('jira_offline.sync.jiraapi_object_to_issue')
@@ -93,7 +98,7 @@ def test_pull_single_project__last_updated_missing_causes_filter_from_waaay_back
 
     pull_single_project(mock_jira, project, force=False, verbose=False)
 
-    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated > "2010-01-01 00:00"'
+    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated >= "2010-01-01 00:00" ORDER BY updated ASC, key ASC'
 
 
 @mock.patch('jira_offline.sync.jiraapi_object_to_issue')
@@ -111,7 +116,7 @@ def test_pull_single_project__last_updated_set_AND_force_set_causes_filter_from_
 
     pull_single_project(mock_jira, project, force=True, verbose=False)
 
-    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated > "2010-01-01 00:00"'
+    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'project = TEST AND updated >= "2010-01-01 00:00" ORDER BY updated ASC, key ASC'
 
 
 @mock.patch('jira_offline.sync.api_get')
@@ -262,3 +267,374 @@ def test_pull_single_project__return_from_merge_issues_added_to_self(
 
     # validate that return from merge_issues is added as TEST-71
     assert mock_jira['TEST-71'].assignee == 'undertest'
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__fetches_all_pages_and_merges_in_order(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure every page offset is fetched, and issues are added to the Jira dict in page order
+    '''
+    project.page_size = 25
+
+    # mock the search API to return a page of issues for each startAt offset, up to 60 issues
+    def search(project, path, params, stream=None):
+        if 'startAt' not in params:
+            return {'total': 60}
+        end = min(params['startAt'] + params['maxResults'], 60)
+        return {'issues': [{'key': f'TEST-{i}'} for i in range(params['startAt'], end)]}
+    mock_api_get.side_effect = search
+
+    # mock conversion function to return a unique Issue for each API object
+    def convert(project, api_issue):
+        return Issue.deserialize({**ISSUE_1, 'key': api_issue['key']})
+    mock_jiraapi_object_to_issue.side_effect = convert
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    # one call for the total, three pages, and a final empty page
+    assert mock_api_get.call_count == 5
+    assert list(mock_jira.keys()) == [f'TEST-{i}' for i in range(60)]
+
+
+@mock.patch('jira_offline.sync.ThreadPoolExecutor', wraps=ThreadPoolExecutor)
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__respects_project_concurrency(mock_tqdm, mock_api_get, mock_executor, mock_jira, project):
+    '''
+    Ensure the page fetcher thread pool is limited to the project's configured concurrency
+    '''
+    mock_api_get.side_effect = [ {'total': 0}, {'issues': []} ]
+    project.concurrency = 2
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    mock_executor.assert_called_once_with(max_workers=2)
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__uses_project_page_size(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure the search API is called with the page size configured on the project
+    '''
+    mock_api_get.side_effect = [ {'total': 1}, {'issues': [ISSUE_1]}, {'issues': []} ]
+    project.page_size = 250
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert mock_api_get.call_args_list[1][1]['params']['maxResults'] == 250
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__adaptive_page_size_grows_on_fast_responses(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure the page size doubles between batches of pages when the Jira server responds quickly
+    '''
+    project.page_size = 10
+    project.page_size_adaptive = True
+    project.concurrency = 1
+
+    # mock a Jira server which permits at most 40 results per page
+    def search(project, path, params, stream=None):
+        if 'startAt' not in params:
+            return {'total': 100, 'maxResults': params['maxResults']}
+        max_results = min(params['maxResults'], 40)
+        end = min(params['startAt'] + max_results, 100)
+        return {
+            'maxResults': max_results,
+            'issues': [{'key': f'TEST-{i}'} for i in range(params['startAt'], end)],
+        }
+    mock_api_get.side_effect = search
+
+    mock_jiraapi_object_to_issue.side_effect = lambda project, api_issue: Issue.deserialize(
+        {**ISSUE_1, 'key': api_issue['key']}
+    )
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    # the initial query requests a single issue
+    assert mock_api_get.call_args_list[0][1]['params']['maxResults'] == 1
+
+    # page size doubles until capped by the maxResults returned from the Jira server
+    assert [c[1]['params']['maxResults'] for c in mock_api_get.call_args_list[1:]] == [10, 20, 40, 80, 40]
+    assert len(mock_jira) == 100
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__fetches_remainder_of_page_capped_by_server(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure a page larger than the Jira server permits is completed with further requests, and later
+    pages are requested at the permitted size
+    '''
+    project.page_size = 50
+    project.concurrency = 1
+
+    # mock a Jira server which permits at most 20 results per page
+    def search(project, path, params, stream=None):
+        if 'startAt' not in params:
+            return {'total': 120, 'maxResults': params['maxResults']}
+        max_results = min(params['maxResults'], 20)
+        end = min(params['startAt'] + max_results, 120)
+        return {
+            'maxResults': max_results,
+            'issues': [{'key': f'TEST-{i}'} for i in range(params['startAt'], end)],
+        }
+    mock_api_get.side_effect = search
+
+    mock_jiraapi_object_to_issue.side_effect = lambda project, api_issue: Issue.deserialize(
+        {**ISSUE_1, 'key': api_issue['key']}
+    )
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert list(mock_jira.keys()) == [f'TEST-{i}' for i in range(120)]
+    assert [
+        (c[1]['params']['startAt'], c[1]['params']['maxResults']) for c in mock_api_get.call_args_list[1:4]
+    ] == [(0, 50), (20, 20), (40, 10)]
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__adaptive_page_size_shrinks_on_server_error(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure a page which fails with a 5xx error is fetched again with a smaller page size
+    '''
+    project.page_size = 40
+    project.page_size_adaptive = True
+    project.concurrency = 1
+
+    def search(project, path, params, stream=None):
+        if 'startAt' not in params:
+            return {'total': 40, 'maxResults': 40}
+        if params['maxResults'] > 20:
+            raise JiraApiError(status_code=504)
+        end = min(params['startAt'] + params['maxResults'], 40)
+        return {'issues': [{'key': f'TEST-{i}'} for i in range(params['startAt'], end)]}
+    mock_api_get.side_effect = search
+
+    mock_jiraapi_object_to_issue.side_effect = lambda project, api_issue: Issue.deserialize(
+        {**ISSUE_1, 'key': api_issue['key']}
+    )
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert len(mock_jira) == 40
+
+
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__client_error_not_retried_in_adaptive_mode(mock_tqdm, mock_api_get, mock_jira, project):
+    '''
+    Ensure a 4xx error is not retried with a smaller page size
+    '''
+    project.page_size_adaptive = True
+
+    mock_api_get.side_effect = [ {'total': 1}, JiraApiError(status_code=400) ]
+
+    with pytest.raises(FailedPullingIssues):
+        pull_single_project(mock_jira, project, force=False, verbose=False)
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__requests_only_issue_fields(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure the search API is called with an explicit list of fields
+    '''
+    mock_api_get.side_effect = [ {'total': 1}, {'issues': [ISSUE_1]}, {'issues': []} ]
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert mock_api_get.call_args_list[1][1]['params']['fields'] == ','.join(jiraapi_fields(project))
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue')
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__streams_issues_from_search_pages(mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project):
+    '''
+    Ensure pages of issues are streamed from the search API, and converted as they're decoded
+    '''
+    mock_api_get.side_effect = [ {'total': 1}, {'issues': iter([ISSUE_1])}, {'issues': iter([])} ]
+    mock_jiraapi_object_to_issue.return_value = Issue.deserialize(ISSUE_1)
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert 'stream' not in mock_api_get.call_args_list[0][1]
+    assert mock_api_get.call_args_list[1][1]['stream'] == 'issues'
+    assert list(mock_jira.keys()) == ['TEST-71']
+
+
+def _api_issue(key: str, updated: str) -> dict:
+    '''
+    Return a minimal issue object from the Jira search API
+    '''
+    return {'key': key, 'fields': {'updated': updated}}
+
+
+def _to_issue(project, api_issue):
+    '''
+    Stand-in for jiraapi_object_to_issue, which deserializes Issue.updated in the project's timezone
+    '''
+    return Issue.deserialize(
+        {**ISSUE_1, 'key': api_issue['key'], 'updated': api_issue['fields']['updated']}, project=project
+    )
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue', side_effect=_to_issue)
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__last_updated_set_from_newest_issue_pulled(
+        mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project, monkeypatch
+    ):
+    '''
+    Ensure last_updated is set from the newest updated value sent by Jira, in the project's timezone,
+    regardless of the local timezone
+    '''
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    get_tz.cache_clear()
+
+    try:
+        project.timezone = 'Australia/Melbourne'
+        mock_api_get.side_effect = [
+            {'total': 2},
+            {'issues': [
+                _api_issue('TEST-71', '2019-12-31T09:00:00.000+1100'),
+                _api_issue('TEST-72', '2020-01-01T10:00:00.000+1100'),
+            ]},
+            {'issues': []},
+        ]
+
+        pull_single_project(mock_jira, project, force=False, verbose=False)
+
+        assert project.last_updated == '2020-01-01 10:00'
+        # the search results did not change during the pull, so the matching keys are not listed
+        assert mock_api_get.call_count == 3
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+        get_tz.cache_clear()
+
+
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__last_updated_set_to_now_when_no_issues_pulled(
+        mock_tqdm, mock_api_get, mock_jira, project
+    ):
+    '''
+    Ensure last_updated is advanced to the current time, in the project's timezone, when no issues
+    have been updated on Jira
+    '''
+    project.timezone = 'UTC'
+    project.last_updated = '2019-01-01 00:00'
+    mock_api_get.side_effect = [ {'total': 0}, {'issues': []} ]
+
+    before = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M')
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+    after = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+    assert before <= project.last_updated <= after
+
+
+@mock.patch('jira_offline.sync.PULL_CHECKPOINT_SIZE', 1)
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue', side_effect=_to_issue)
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__interrupted_pull_keeps_checkpoint(
+        mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project
+    ):
+    '''
+    Ensure the issues pulled before an error are written, and last_updated is advanced to the newest
+    of them once the issues updated before it are confirmed, so that the next pull resumes from there
+    '''
+    project.timezone = 'UTC'
+    project.page_size = 1
+    project.concurrency = 1
+    mock_api_get.side_effect = [
+        {'total': 2},
+        {'issues': [_api_issue('TEST-71', '2019-08-20T16:41:19.000+1000')]},
+        JiraApiError,
+    ]
+
+    with pytest.raises(FailedPullingIssues):
+        pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert mock_jira.write_issues.called
+    assert mock_jira.config.write_to_disk.called
+    assert project.last_updated == '2019-08-20 06:41'
+    assert 'TEST-71' in mock_jira
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue', side_effect=_to_issue)
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__pulls_issues_missed_when_results_change(
+        mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project
+    ):
+    '''
+    Ensure that issues skipped while paging, because the search results changed during the pull, are
+    found by listing the keys of all matching issues, and fetched before last_updated is advanced
+    '''
+    project.page_size = 2
+    project.concurrency = 1
+    mock_api_get.side_effect = [
+        {'total': 5},
+        # TEST-2 is moved to another project after the first page, so TEST-3 is never returned by the
+        # paged search
+        {'total': 5, 'issues': [_api_issue('TEST-1', '2020-01-01T10:00:00.000+0000'),
+                                _api_issue('TEST-2', '2020-01-01T10:01:00.000+0000')]},
+        {'total': 4, 'issues': [_api_issue('TEST-4', '2020-01-01T10:04:00.000+0000'),
+                                _api_issue('TEST-5', '2020-01-01T10:05:00.000+0000')]},
+        {'total': 4, 'issues': []},
+        # list the keys of all matching issues
+        {'issues': [{'key': f'TEST-{i}'} for i in (1, 3, 4, 5)]}, {'issues': []},
+    ]
+    mock_jira.fetch_issues.return_value = {'TEST-3': Issue.deserialize({**ISSUE_1, 'key': 'TEST-3'})}
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    assert mock_api_get.call_args_list[4][1]['params']['jql'].endswith('ORDER BY key ASC')
+    mock_jira.fetch_issues.assert_called_once_with(project, ['TEST-3'])
+    assert 'TEST-3' in mock_jira
+
+
+@mock.patch('jira_offline.sync.jiraapi_object_to_issue', side_effect=_to_issue)
+@mock.patch('jira_offline.sync.api_get')
+@mock.patch('jira_offline.sync.tqdm')
+def test_pull_single_project__pulls_issues_missed_when_issue_returned_twice(
+        mock_tqdm, mock_api_get, mock_jiraapi_object_to_issue, mock_jira, project
+    ):
+    '''
+    Ensure that when an issue already pulled is updated during the pull, and so is returned again at
+    the end of the results, the issue skipped by the paged search is fetched
+    '''
+    project.page_size = 2
+    project.concurrency = 1
+    mock_api_get.side_effect = [
+        {'total': 5},
+        # TEST-1 is updated after the first page, so TEST-3 is never returned by the paged search
+        {'issues': [_api_issue('TEST-1', '2020-01-01T10:00:00.000+0000'),
+                    _api_issue('TEST-2', '2020-01-01T10:01:00.000+0000')]},
+        {'issues': [_api_issue('TEST-4', '2020-01-01T10:04:00.000+0000'),
+                    _api_issue('TEST-5', '2020-01-01T10:05:00.000+0000')]},
+        {'issues': [_api_issue('TEST-1', '2020-01-01T11:00:00.000+0000')]},
+        {'issues': []},
+        # list the keys of all matching issues
+        {'issues': [{'key': f'TEST-{i}'} for i in range(1, 6)]}, {'issues': []},
+    ]
+    mock_jira.fetch_issues.return_value = {'TEST-3': Issue.deserialize({**ISSUE_1, 'key': 'TEST-3'})}
+
+    pull_single_project(mock_jira, project, force=False, verbose=False)
+
+    mock_jira.fetch_issues.assert_called_once_with(project, ['TEST-3'])
+    assert 'TEST-3' in mock_jira
@@ -1,11 +1,14 @@
 '''
 Tests for push_issues() in the sync module
 '''
+import threading
 from unittest import mock
 
+import pytest
+
 from fixtures import ISSUE_1, ISSUE_1_WITH_ASSIGNEE_DIFF, ISSUE_1_WITH_FIXVERSIONS_DIFF, ISSUE_NEW
 from jira_offline.models import Issue
-from jira_offline.sync import IssueUpdate, push_issues
+from jira_offline.sync import IssueUpdate, push_issues, PushScheduler
 
 
 @mock.patch('jira_offline.sync.merge_issues')
@@ -29,13 +32,34 @@ def test_push_issues__calls_fetch_and_check_resolve_once_per_issue(
     assert mock_issue_to_jiraapi_update.call_count == 2
 
 
+@mock.patch('jira_offline.sync.merge_issues')
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_issues__merges_with_prefetched_remote_issues(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira, project
+    ):
+    '''
+    Ensure the remote issues are fetched with a single call to fetch_issues(), and merged without
+    calling fetch_issue() for each issue
+    '''
+    mock_jira['TEST-71'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
+
+    remote_issue = Issue.deserialize(ISSUE_1)
+    mock_jira.fetch_issues.return_value = {'TEST-71': remote_issue}
+
+    push_issues(mock_jira)
+
+    mock_jira.fetch_issues.assert_called_once_with(project, ['TEST-71'])
+    assert not mock_jira.fetch_issue.called
+    mock_merge_issues.assert_called_once_with(mock_jira['TEST-71'], remote_issue)
+
+
 @mock.patch('jira_offline.sync.merge_issues')
 @mock.patch('jira_offline.sync.issue_to_jiraapi_update')
 def test_push_issues__calls_update_issue_when_issue_has_an_id(
         mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira
     ):
     '''
-    When Issue.id is set, ensure update_issue() is called, and new_issue() is NOT called
+    When Issue.id is set, ensure update_issue() is called, and new_issues() is NOT called
     '''
     # add a modified Issue to the Jira dict
     mock_jira['TEST-71'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
@@ -46,7 +70,7 @@ def test_push_issues__calls_update_issue_when_issue_has_an_id(
     push_issues(mock_jira)
 
     assert mock_jira.update_issue.called
-    assert not mock_jira.new_issue.called
+    assert not mock_jira.new_issues.called
 
 
 @mock.patch('jira_offline.sync.merge_issues')
@@ -55,7 +79,7 @@ def test_push_issues__calls_new_issue_when_issue_doesnt_have_an_id(
         mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira
     ):
     '''
-    When Issue.id is NOT set, ensure new_issue() is called, and update_issue() is NOT called
+    When Issue.id is NOT set, ensure new_issues() is called, and update_issue() is NOT called
     '''
     # add a modified Issue to the Jira dict
     mock_jira[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
@@ -66,7 +90,7 @@ def test_push_issues__calls_new_issue_when_issue_doesnt_have_an_id(
     push_issues(mock_jira)
 
     assert not mock_jira.update_issue.called
-    assert mock_jira.new_issue.called
+    assert mock_jira.new_issues.called
 
 
 @mock.patch('jira_offline.sync.merge_issues')
@@ -86,3 +110,119 @@ def test_push_issues__skips_issues_from_unconfigured_projects(
     assert mock_jira.fetch_issue.call_count == 1
     assert mock_merge_issues.call_count == 1
     assert mock_issue_to_jiraapi_update.call_count == 1
+
+
+def _add_new_epic_and_child(mock_jira):
+    '''
+    Add a new epic, and a new issue linked to it, to the Jira dict
+    '''
+    epic = Issue.deserialize({**ISSUE_NEW, 'key': 'epic-temp-key', 'issuetype': 'Epic', 'epic_ref': None})
+    child = Issue.deserialize({**ISSUE_NEW, 'epic_ref': 'epic-temp-key'})
+    mock_jira[epic.key] = epic
+    mock_jira[child.key] = child
+    return epic, child
+
+
+@mock.patch('jira_offline.sync.merge_issues', side_effect=lambda local, _: IssueUpdate(merged_issue=local))
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_issues__pushes_child_after_its_new_epic(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira
+    ):
+    '''
+    Ensure an issue linked to a new epic is merged and pushed only once the epic has been created
+    '''
+    epic, child = _add_new_epic_and_child(mock_jira)
+    mock_issue_to_jiraapi_update.side_effect = lambda project, issue, modified: issue.key
+
+    def new_issues(project, keys):
+        if epic.key in keys:
+            # Jira.new_issues relinks the children of a new epic
+            child.epic_ref = 'TEST-2'
+        return {key: Issue.deserialize(ISSUE_1) for key in keys}
+
+    mock_jira.new_issues.side_effect = new_issues
+
+    push_issues(mock_jira)
+
+    assert [c[0][1] for c in mock_jira.new_issues.call_args_list] == [[epic.key], [child.key]]
+    assert mock_merge_issues.call_args_list[1][0][0].epic_ref == 'TEST-2'
+
+
+@mock.patch('jira_offline.sync.merge_issues', side_effect=lambda local, _: IssueUpdate(merged_issue=local))
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_issues__skips_children_when_new_epic_fails(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira
+    ):
+    '''
+    Ensure issues linked to a new epic are not pushed when the epic cannot be created
+    '''
+    _add_new_epic_and_child(mock_jira)
+    mock_jira.new_issues.return_value = {}
+
+    push_issues(mock_jira)
+
+    assert mock_jira.new_issues.call_count == 1
+    assert mock_merge_issues.call_count == 1
+
+
+@mock.patch('jira_offline.sync.merge_issues', side_effect=lambda local, _: IssueUpdate(merged_issue=local))
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_issues__pushes_issues_concurrently(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira, project
+    ):
+    '''
+    Ensure independent issues are pushed at the same time, up to the project's concurrency
+    '''
+    project.concurrency = 2
+
+    mock_jira['TEST-71.1'] = Issue.deserialize({**ISSUE_1_WITH_ASSIGNEE_DIFF, 'key': 'TEST-71.1'})
+    mock_jira['TEST-71.2'] = Issue.deserialize({**ISSUE_1_WITH_ASSIGNEE_DIFF, 'key': 'TEST-71.2'})
+
+    # each update waits for the other to start, which times out if they're pushed serially
+    barrier = threading.Barrier(2, timeout=5)
+    def update_issue(project, issue, fields):
+        barrier.wait()
+        return issue
+    mock_jira.update_issue.side_effect = update_issue
+
+    push_issues(mock_jira)
+
+    assert mock_jira.update_issue.call_count == 2
+
+
+@mock.patch('jira_offline.sync.merge_issues', side_effect=lambda local, _: IssueUpdate(merged_issue=local))
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_issues__creates_new_issues_in_bulk_chunks(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira
+    ):
+    '''
+    Ensure new issues are created with a call to new_issues() per chunk of BULK_CREATE_CHUNK_SIZE
+    '''
+    for i in range(5):
+        issue = Issue.deserialize({**ISSUE_NEW, 'key': f'temp-{i}', 'summary': f'Summary {i}'})
+        mock_jira[issue.key] = issue
+
+    mock_issue_to_jiraapi_update.side_effect = lambda project, issue, modified: issue.key
+    mock_jira.new_issues.side_effect = lambda project, keys: {key: Issue.deserialize(ISSUE_1) for key in keys}
+
+    with mock.patch.object(mock_jira, 'BULK_CREATE_CHUNK_SIZE', 2):
+        push_issues(mock_jira)
+
+    assert sorted(len(c[0][1]) for c in mock_jira.new_issues.call_args_list) == [1, 2, 2]
+
+
+@pytest.mark.parametrize('updated,expected', [(True, 1), (False, 0)])
+@mock.patch('jira_offline.sync.merge_issues', side_effect=lambda local, _: IssueUpdate(merged_issue=local))
+@mock.patch('jira_offline.sync.issue_to_jiraapi_update')
+def test_push_scheduler__counts_only_issues_updated(
+        mock_issue_to_jiraapi_update, mock_merge_issues, mock_jira, updated, expected
+    ):
+    '''
+    Ensure an issue is counted as pushed only when Jira.update_issue succeeds
+    '''
+    mock_jira['TEST-71'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
+
+    # update_issue returns None on failure
+    mock_jira.update_issue.side_effect = lambda project, issue, fields: issue if updated else None
+
+    assert PushScheduler(mock_jira, {}).run([mock_jira['TEST-71']]) == expected
@@ -6,8 +6,8 @@ import pytest
 from fixtures import EPIC_1, ISSUE_1
 from jira_offline.exceptions import (EpicNotFound, EpicSearchStrUsedMoreThanOnce, ImportFailed,
                                      InvalidIssueType, SummaryAlreadyExists)
-from jira_offline.create import (create_issue, find_epic_by_reference, import_issue, _import_new_issue,
-                                 _import_modified_issue)
+from jira_offline.create import (create_issue, FailedImport, find_epic_by_reference, import_issue,
+                                 ImportedIssue, import_issues, _import_new_issue, _import_modified_issue)
 from jira_offline.models import Issue
 
 
@@ -74,6 +74,23 @@ def test_create__create_issue__error_on_existing_summary_for_same_project(mock_j
         create_issue(mock_jira, project, 'Story', mock_jira['TEST-72'].summary)
 
 
+def test_create__create_issue__error_on_near_duplicate_summary_when_strict(mock_jira, project):
+    '''
+    Check that create_issue() raises on a summary differing only in case, or when strict, in
+    punctuation, articles or plurals
+    '''
+    # add an Issue fixture to the Jira dict
+    mock_jira['TEST-72'] = Issue.deserialize({**ISSUE_1, 'summary': 'Fix the login bug'}, project=project)
+
+    with pytest.raises(SummaryAlreadyExists):
+        create_issue(mock_jira, project, 'Story', 'fix the LOGIN bug')
+
+    create_issue(mock_jira, project, 'Story', 'Fix login bugs.')
+
+    with pytest.raises(SummaryAlreadyExists):
+        create_issue(mock_jira, project, 'Story', 'Fix login bugs!', strict=True)
+
+
 def test_create__create_issue__NO_error_on_existing_summary_for_different_project(mock_jira, project):
     '''
     Check that create_issue() NO error raised on error where summary string already exists on a
@@ -174,6 +191,16 @@ def test_create__find_epic_by_reference__raise_on_duplicate_ref_string(mock_jira
         find_epic_by_reference(mock_jira, 'This is an epic')
 
 
+def test_create__create_issue__does_not_write_when_write_false(mock_jira, project):
+    '''
+    Ensure create_issue() adds the new Issue to self, but does not write the cache when write=False
+    '''
+    offline_issue = create_issue(mock_jira, project, 'Story', 'This is a summary', write=False)
+
+    assert offline_issue.key in mock_jira
+    assert not mock_jira.write_issues.called
+
+
 @mock.patch('jira_offline.create._import_new_issue')
 def test_create__import_issue__calls_import_new_when_obj_missing_key(mock_import_new, mock_jira):
     '''
@@ -270,7 +297,9 @@ def test_create__import_new_issue__calls_create_issue(mock_create_issue, mock_fi
     }
 
     _import_new_issue(mock_jira, import_dict)
-    mock_create_issue.assert_called_with(mock_jira, project, 'Epic', 'Egg', estimate=99, description='bacon')
+    mock_create_issue.assert_called_with(
+        mock_jira, project, 'Epic', 'Egg', strict=False, write=True, estimate=99, description='bacon'
+    )
 
 
 @pytest.mark.parametrize('keys', [
@@ -284,3 +313,53 @@ def test_create__import_new_issue__raises_on_key_missing(mock_jira, keys):
     '''
     with pytest.raises(ImportFailed):
         _import_new_issue(mock_jira, {k[0]:1 for k in zip(keys)})
+
+
+@mock.patch('jira_offline.create.find_project')
+def test_create__import_issues__reports_errors_per_line_and_does_not_write(mock_find_project, mock_jira, project):
+    '''
+    Ensure import_issues() yields a result for each non-blank line, including failures, and does not
+    write the issue cache
+    '''
+    mock_find_project.return_value = project
+
+    lines = [
+        '{"project": "TEST", "issuetype": "Story", "summary": "Egg"}\n',
+        '\n',
+        '{"project": "TEST", "issuetype": "Story"\n',
+        '{"project": "TEST", "issuetype": "FakeType", "summary": "Bacon"}\n',
+        '{"project": "TEST", "issuetype": "Story", "summary": "Sausage"}\n',
+    ]
+
+    results = list(import_issues(mock_jira, lines))
+
+    assert [r.lineno for r in results] == [3, 1, 4, 5]
+    assert isinstance(results[0], FailedImport) and results[0].error.lineno == 3
+    assert [r.issue.summary for r in results if isinstance(r, ImportedIssue)] == ['Egg', 'Sausage']
+    assert all(r.is_new for r in results if isinstance(r, ImportedIssue))
+    assert isinstance(results[2], FailedImport) and isinstance(results[2].error, ImportFailed)
+    assert results[2].error.lineno == 4
+    assert not mock_jira.write_issues.called
+
+
+@mock.patch('jira_offline.create.IMPORT_BATCH_SIZE', 2)
+@mock.patch('jira_offline.create.import_issue')
+def test_create__import_issues__reads_lines_lazily(mock_import_issue, mock_jira):
+    '''
+    Ensure import_issues() reads only a batch of lines ahead of the issue being imported
+    '''
+    mock_import_issue.return_value = (None, True)
+    read = []
+
+    def lines():
+        for i in range(5):
+            read.append(i)
+            yield f'{{"summary": "{i}"}}'
+
+    results = import_issues(mock_jira, lines())
+
+    next(results)
+    assert read == [0, 1]
+
+    assert len(list(results)) == 4
+    assert read == [0, 1, 2, 3, 4]
@@ -4,22 +4,28 @@ Tests for the Jira API class in main.py
 Unlike other tests, these access the class directly, not via the mock_jira interface defined in
 conftest.py
 '''
+import json
 from unittest import mock
 
+import pandas as pd
 import pytest
 
-from fixtures import EPIC_1, ISSUE_1, ISSUE_2, ISSUE_MISSING_EPIC, ISSUE_NEW
+from fixtures import EPIC_1, ISSUE_1, ISSUE_1_WITH_ASSIGNEE_DIFF, ISSUE_2, ISSUE_MISSING_EPIC, ISSUE_NEW
 from jira_offline.exceptions import (EpicNotFound, EstimateFieldUnavailable, FailedAuthError,
                                      JiraApiError, JiraNotConfigured, ProjectDoesntExist)
 from jira_offline.models import CustomFields, Issue, IssueType, ProjectMeta
+from jira_offline.utils.convert import jiraapi_fields
+from jira_offline.utils.dataframe import build_df, COLUMNS
+from jira_offline.utils.index import SummaryIndex
+from jira_offline.utils.sqlite import SqliteStore
 
 
 @mock.patch('jira_offline.jira.jsonlines')
 @mock.patch('jira_offline.jira.os')
 @mock.patch('builtins.open')
-def test_jira__load_issues__calls_deserialize_for_each_line_in_cache(mock_open, mock_os, mock_jsonlines, mock_jira_core):
+def test_jira__load_issues__calls_deserialize_for_each_line_on_access(mock_open, mock_os, mock_jsonlines, mock_jira_core):
     '''
-    Ensure load_issues calls Issue.deserialize for each line in the cache file
+    Ensure load_issues defers Issue.deserialize for each line in the cache file until it's accessed
     '''
     # issues cache is present, and non-zero in size
     mock_os.path.exists.return_value = True
@@ -30,7 +36,11 @@ def test_jira__load_issues__calls_deserialize_for_each_line_in_cache(mock_open,
 
     with mock.patch('jira_offline.jira.Issue.deserialize') as mock_issue_deserialize:
         mock_jira_core.load_issues()
-        assert mock_issue_deserialize.call_count == 3
+        assert mock_issue_deserialize.call_count == 0
+
+        mock_jira_core['TEST-71']  # pylint: disable=pointless-statement
+        mock_jira_core['TEST-71']  # pylint: disable=pointless-statement
+        assert mock_issue_deserialize.call_count == 1
 
 
 @mock.patch('jira_offline.jira.jsonlines')
@@ -66,16 +76,73 @@ def test_jira__write_issues__calls_serialize_for_each_item_in_self(mock_open, mo
 @mock.patch('builtins.open')
 def test_jira__write_issues__calls_issue_diff_for_existing_issues_only(mock_open, mock_jsonlines, mock_jira_core):
     '''
-    Ensure write_issues calls Issue.serialize for each line in self (which implements dict)
+    Ensure write_issues calls Issue.diff only for modified issues which exist on Jira
     '''
     mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
     mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
 
-    with mock.patch('jira_offline.jira.Issue.diff'):
+    mock_jira_core['TEST-71'].summary = 'Edited'
+    mock_jira_core[ISSUE_NEW['key']].summary = 'Edited'
+
+    with mock.patch('jira_offline.jira.Issue.diff', return_value=[]) as mock_diff:
+        mock_jira_core.write_issues()
+
+    assert mock_diff.call_count == 1
+
+
+@mock.patch('jira_offline.jira.jsonlines')
+@mock.patch('builtins.open')
+def test_jira__write_issues__skips_diff_for_unmodified_issues(mock_open, mock_jsonlines, mock_jira_core):
+    '''
+    Ensure write_issues reuses the loaded diff_to_original for an unmodified issue
+    '''
+    mock_jira_core['TEST-71.1'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
+
+    with mock.patch('jira_offline.jira.Issue.diff') as mock_diff:
         mock_jira_core.write_issues()
 
-        assert mock_jira_core['TEST-71'].diff.called
-        assert mock_jira_core[ISSUE_NEW['key']].diff.called
+    assert not mock_diff.called
+    written = mock_jsonlines.Writer.return_value.write_all.call_args[0][0]
+    assert written[0]['diff_to_original'] == ISSUE_1_WITH_ASSIGNEE_DIFF['diff_to_original']
+
+
+@mock.patch('jira_offline.jira.jsonlines')
+@mock.patch('builtins.open')
+def test_jira__write_issues__writes_issues_modified_in_place(mock_open, mock_jsonlines, mock_jira_core):
+    '''
+    Ensure write_issues writes an issue modified in-place, and then marks it unmodified
+    '''
+    # as loaded from the cache, and deserialized on first access
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+
+    mock_jira_core['TEST-71'].assignee = 'hoganp'
+    assert mock_jira_core['TEST-71'].modified == {'assignee'}
+
+    mock_jira_core.write_issues()
+
+    written = mock_jsonlines.Writer.return_value.write_all.call_args[0][0]
+    assert [obj['key'] for obj in written] == ['TEST-71']
+    assert written[0]['diff_to_original'] == [('change', 'assignee', ('hoganp', 'danil1'))]
+    assert not mock_jira_core['TEST-71'].modified
+
+
+@mock.patch('jira_offline.jira.jsonlines')
+@mock.patch('builtins.open')
+def test_jira__write_issues__skips_issue_modified_in_place_then_deleted(mock_open, mock_jsonlines, mock_jira_core):
+    '''
+    Ensure write_issues writes only the deletion of an issue which was modified in-place, and then
+    deleted
+    '''
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+
+    issue = mock_jira_core['TEST-71']
+    del mock_jira_core['TEST-71']
+    issue.assignee = 'hoganp'
+
+    mock_jira_core.write_issues()
+
+    written = mock_jsonlines.Writer.return_value.write_all.call_args[0][0]
+    assert written == [{'key': 'TEST-71', 'deleted': True}]
 
 
 @mock.patch('jira_offline.jira.api_get')
@@ -345,94 +412,195 @@ def test_jira__get_project_components__does_not_fail(mock_api_get, mock_jira_cor
     assert project.components == {'Egg', 'Bacon'}
 
 
-@mock.patch('jira_offline.jira.jiraapi_object_to_issue', return_value=Issue.deserialize(ISSUE_1))
 @mock.patch('jira_offline.jira.api_post')
-def test_jira__new_issue__removes_fields_which_cannot_be_posted_for_new_issue(
-        mock_api_post, mock_jiraapi_object_to_issue, mock_jira_core, project
-    ):
+def test_jira__new_issues__maps_bulk_response_to_offline_keys(mock_api_post, mock_jira_core, project):
     '''
-    Some fields cannot be posted to the Jira API. Ensure they are removed before the API call.
+    Ensure new_issues() posts chunks to the bulk API, maps created and failed issues back to their
+    offline keys, fetches the created issues in one search per chunk, and writes the cache once
     '''
-    # dont write to disk during tests
     mock_jira_core.write_issues = mock.Mock()
 
-    # add new issue to the jira object
-    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
+    fields = []
+    for i in range(3):
+        issue = Issue.deserialize({**ISSUE_NEW, 'key': f'temp-{i}', 'summary': f'Summary {i}'})
+        mock_jira_core[issue.key] = issue
+        fields.append({
+            'project_id': issue.project_id, 'key': issue.key, 'summary': issue.summary,
+            'issuetype': {'name': 'Story'},
+        })
+
+    # the second issue fails to create
+    mock_api_post.return_value = {
+        'issues': [{'key': ISSUE_1['key']}, {'key': ISSUE_2['key']}],
+        'errors': [{'failedElementNumber': 1, 'elementErrors': {'errors': {'summary': 'Bad summary'}}}],
+    }
+    mock_jira_core.fetch_issues = mock.Mock(return_value={
+        ISSUE_1['key']: Issue.deserialize(ISSUE_1), ISSUE_2['key']: Issue.deserialize(ISSUE_2),
+    })
 
-    # mock the fetch_issue() call that happens after successful new_issue() call
-    mock_jira_core.fetch_issue = mock.Mock()
+    created = mock_jira_core.new_issues(project, fields)
 
-    mock_jira_core.new_issue(
-        project,
-        fields={
-            'project_id': 'notarealprojecthash',
-            'key': ISSUE_NEW['key'],
-            'summary': 'A summary',
-            'issuetype': {'name': 'Story'},
-        }
+    assert {k: v.key for k, v in created.items()} == {'temp-0': ISSUE_1['key'], 'temp-2': ISSUE_2['key']}
+    mock_api_post.assert_called_once_with(project, 'issue/bulk', data={'issueUpdates': [
+        {'fields': {'summary': f'Summary {i}', 'issuetype': {'name': 'Story'}}} for i in range(3)
+    ]})
+    mock_jira_core.fetch_issues.assert_called_once_with(project, [ISSUE_1['key'], ISSUE_2['key']])
+    assert mock_jira_core.write_issues.call_count == 1
+
+    # the created issues replace their offline placeholders, and the failed issue remains
+    assert 'temp-0' not in mock_jira_core and ISSUE_1['key'] in mock_jira_core
+    assert 'temp-2' not in mock_jira_core and ISSUE_2['key'] in mock_jira_core
+    assert 'temp-1' in mock_jira_core
+
+
+@mock.patch('jira_offline.jira.api_post')
+def test_jira__new_issues__relinks_children_of_new_epic(mock_api_post, mock_jira_core, project):
+    '''
+    Ensure new_issues() relinks issues linked to a new epic to the epic's Jira-generated key
+    '''
+    mock_jira_core.write_issues = mock.Mock()
+
+    mock_jira_core['temp-epic'] = Issue.deserialize(
+        {**ISSUE_NEW, 'key': 'temp-epic', 'issuetype': 'Epic', 'epic_ref': None}
+    )
+    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize({**ISSUE_NEW, 'epic_ref': 'temp-epic'})
+
+    mock_api_post.return_value = {'issues': [{'key': EPIC_1['key']}]}
+    mock_jira_core.fetch_issues = mock.Mock(return_value={EPIC_1['key']: Issue.deserialize(EPIC_1)})
+
+    mock_jira_core.new_issues(
+        project, [{'project_id': 'notarealprojecthash', 'key': 'temp-epic', 'summary': 'An epic',
+                   'issuetype': {'name': 'Epic'}}]
     )
 
-    # assert "key" and "status" are removed
-    mock_api_post.assert_called_with(project, 'issue', data={'fields': {'summary': 'A summary', 'issuetype': {'name': 'Story'}}})
+    assert mock_jira_core[ISSUE_NEW['key']].epic_ref == EPIC_1['key']
+
+
+@mock.patch('jira_offline.jira.api_post')
+def test_jira__new_issues__raises_after_write_when_jira_not_configured(mock_api_post, mock_jira_core, project):
+    '''
+    Ensure new_issues() raises JiraNotConfigured on a screen configuration error, after writing the
+    issues which were created
+    '''
+    mock_jira_core.write_issues = mock.Mock()
+    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
+
+    mock_api_post.return_value = {
+        'issues': [],
+        'errors': [{'failedElementNumber': 0, 'elementErrors': {'errors': {
+            'customfield_10100': "Field 'customfield_10100' cannot be set. It is not on the appropriate screen, or unknown."
+        }}}],
+    }
+    mock_jira_core.fetch_issues = mock.Mock(return_value={})
+
+    with pytest.raises(JiraNotConfigured):
+        mock_jira_core.new_issues(
+            project, [{'project_id': 'notarealprojecthash', 'key': ISSUE_NEW['key'], 'summary': 'A summary',
+                       'issuetype': {'name': 'Story'}}]
+        )
+
+    assert mock_jira_core.write_issues.called
 
 
 @pytest.mark.parametrize('error_msg,exception', [
     ('gh.epic.error.not.found', EpicNotFound),
     ("Field 'estimate' cannot be set", EstimateFieldUnavailable),
-    ('cannot be set. It is not on the appropriate screen, or unknown.', JiraNotConfigured),
 ])
+@mock.patch('jira_offline.jira.logger')
 @mock.patch('jira_offline.jira.api_post')
-def test_jira__new_issue__raises_specific_exceptions(mock_api_post, mock_jira_core, project, error_msg, exception):
-    '''
-    Ensure correct custom exception is raised when specific string found in Jira API error message
-    '''
-    # mock the Jira library to raise
-    mock_api_post.side_effect = JiraApiError(error_msg)
-
-    with pytest.raises(exception):
-        mock_jira_core.new_issue(
-            project,
-            fields={
-                'project_id': 'notarealprojecthash',
-                'key': ISSUE_NEW['key'],
-                'status': 'Backlog',
-                'summary': 'A summary',
-                'issuetype': {'name': 'Story'},
-            }
-        )
+def test_jira__new_issues__logs_specific_exceptions(
+        mock_api_post, mock_logger, mock_jira_core, project, error_msg, exception
+    ):
+    '''
+    Ensure the error for an issue which failed to create is logged as a specific custom exception,
+    when a specific string is found in the Jira API error message
+    '''
+    mock_jira_core.write_issues = mock.Mock()
+    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
+
+    mock_api_post.return_value = {
+        'issues': [],
+        'errors': [{'failedElementNumber': 0, 'elementErrors': {'errors': {'field': error_msg}}}],
+    }
+    mock_jira_core.fetch_issues = mock.Mock(return_value={})
+
+    created = mock_jira_core.new_issues(
+        project, [{'project_id': 'notarealprojecthash', 'key': ISSUE_NEW['key'], 'summary': 'A summary',
+                   'issuetype': {'name': 'Story'}}]
+    )
+
+    assert created == {}
+    assert isinstance(mock_logger.error.call_args[0][0], exception)
 
 
 @mock.patch('jira_offline.jira.api_post')
-def test_jira__new_issue__removes_temp_key_when_new_post_successful(
+def test_jira__new_issues__raises_specific_exception_when_whole_request_fails(
         mock_api_post, mock_jira_core, project
     ):
     '''
-    Ensure a successful post of a new Issue deletes the old temp UUID key from self
+    Ensure JiraNotConfigured is raised when Jira fails the whole bulk request with a screen
+    configuration error
     '''
-    # dont write to disk during tests
     mock_jira_core.write_issues = mock.Mock()
-
-    # add new issue to the jira object, under temporary key
     mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
 
-    # mock the fetch_issue() call that happens after successful new_issue() call
-    mock_jira_core.fetch_issue = mock.Mock(return_value=Issue.deserialize(ISSUE_1))
+    mock_api_post.side_effect = JiraApiError('cannot be set. It is not on the appropriate screen, or unknown.')
+
+    with pytest.raises(JiraNotConfigured):
+        mock_jira_core.new_issues(
+            project, [{'project_id': 'notarealprojecthash', 'key': ISSUE_NEW['key'], 'summary': 'A summary',
+                       'issuetype': {'name': 'Story'}}]
+        )
 
-    mock_jira_core.new_issue(
-        project,
-        fields={
-            'project_id': 'notarealprojecthash',
-            'key': ISSUE_NEW['key'],
-            'status': 'Backlog',
-            'summary': 'A summary',
+
+@mock.patch('jira_offline.jira.api_post')
+def test_jira__new_issues__skips_issues_missing_from_bulk_response(mock_api_post, mock_jira_core, project):
+    '''
+    Ensure new_issues() skips an issue which Jira neither created nor reported as failed, when the
+    bulk response lists fewer issues than expected
+    '''
+    mock_jira_core.write_issues = mock.Mock()
+
+    fields = []
+    for i in range(2):
+        issue = Issue.deserialize({**ISSUE_NEW, 'key': f'temp-{i}', 'summary': f'Summary {i}'})
+        mock_jira_core[issue.key] = issue
+        fields.append({
+            'project_id': issue.project_id, 'key': issue.key, 'summary': issue.summary,
             'issuetype': {'name': 'Story'},
-        }
-    )
+        })
+
+    mock_api_post.return_value = {'issues': [{'key': ISSUE_1['key']}]}
+    mock_jira_core.fetch_issues = mock.Mock(return_value={ISSUE_1['key']: Issue.deserialize(ISSUE_1)})
+
+    created = mock_jira_core.new_issues(project, fields)
+
+    assert {k: v.key for k, v in created.items()} == {'temp-0': ISSUE_1['key']}
+    assert 'temp-1' in mock_jira_core
+
+
+@mock.patch('jira_offline.jira.api_get')
+def test_fetch_issues__searches_in_chunks_of_keys(mock_api_get, mock_jira_core, project):
+    '''
+    Ensure jira.fetch_issues() makes a search query per chunk of keys, and returns the Issues by key
+    '''
+    mock_api_get.side_effect = [
+        {'issues': [ISSUE_1, ISSUE_2]},
+        {'issues': []},
+    ]
+
+    with mock.patch('jira_offline.jira.jiraapi_object_to_issue', side_effect=lambda p, x: Issue.deserialize(x)), \
+            mock.patch.object(mock_jira_core, 'FETCH_CHUNK_SIZE', 2):
+        issues = mock_jira_core.fetch_issues(project, [ISSUE_1['key'], ISSUE_2['key'], 'TEST-99'])
+
+    assert list(issues) == [ISSUE_1['key'], ISSUE_2['key']]
+    assert mock_api_get.call_count == 2
 
-    # assert temporary key has been removed
-    assert ISSUE_NEW['key'] not in mock_jira_core
-    # assert new key returned from Jira API has been added (found in return from jiraapi_object_to_issue)
-    assert ISSUE_1['key'] in mock_jira_core
+    params = mock_api_get.call_args_list[0][1]['params']
+    assert params['jql'] == 'key in ({},{})'.format(ISSUE_1['key'], ISSUE_2['key'])
+    assert params['maxResults'] == 2
+    assert params['fields'] == ','.join(jiraapi_fields(project))
+    assert mock_api_get.call_args_list[1][1]['params']['jql'] == 'key in (TEST-99)'
 
 
 @mock.patch('jira_offline.jira.jiraapi_object_to_issue')
@@ -448,7 +616,9 @@ def test_fetch_issue__returns_output_from_jiraapi_object_to_issue(
     ret = mock_jira_core.fetch_issue(project, ISSUE_1['key'])
     assert ret == 1
 
-    mock_api_get.assert_called_with(project, 'issue/{}'.format(ISSUE_1['key']))
+    mock_api_get.assert_called_with(
+        project, 'issue/{}'.format(ISSUE_1['key']), params={'fields': ','.join(jiraapi_fields(project))}
+    )
     assert mock_jiraapi_object_to_issue.called
 
 
@@ -497,3 +667,544 @@ def test_items__respect_the_filter(mock_jira_core):
     assert list(mock_jira_core.items()) == [
         ('TEST-72', mock_jira_core['TEST-72']),
     ]
+
+
+@mock.patch('jira_offline.jira.get_cache_log_filepath')
+@mock.patch('jira_offline.jira.get_cache_filepath')
+def test_jira__write_issues_and_load_issues__parquet_roundtrip(mock_get_cache_filepath, mock_get_cache_log_filepath, mock_jira_core, tmpdir):
+    '''
+    Ensure issues written to a parquet cache are loaded unchanged, and deserialized only on access
+    '''
+    pytest.importorskip('pyarrow')
+
+    mock_get_cache_filepath.return_value = str(tmpdir.join('issue_cache.parquet'))
+    mock_get_cache_log_filepath.return_value = str(tmpdir.join('issue_cache.log'))
+    mock_jira_core.config.cache_format = 'parquet'
+
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
+    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
+    mock_jira_core.write_issues(compact=True)
+
+    issues = {key: issue.serialize() for key, issue in mock_jira_core.items()}
+
+    # clear the Jira object and reload from parquet
+    mock_jira_core.store.clear()
+    mock_jira_core.load_issues()
+
+    # issues are held in serialized form until accessed
+    assert isinstance(mock_jira_core.store['TEST-71'], dict)
+
+    assert {key: issue.serialize() for key, issue in mock_jira_core.items()} == issues
+    assert mock_jira_core['TEST-71'].diff_to_original == [['change', 'assignee', ['hoganp', 'danil1']]]
+
+
+@mock.patch('jira_offline.jira.get_cache_log_filepath')
+@mock.patch('jira_offline.jira.get_cache_filepath')
+def test_jira__write_issues__converts_json_cache_to_parquet(mock_get_cache_filepath, mock_get_cache_log_filepath, mock_jira_core, tmpdir):
+    '''
+    Ensure an existing JSON cache is written as parquet on the first write after cache_format is
+    changed, even when the cache log is too short to be compacted
+    '''
+    pytest.importorskip('pyarrow')
+
+    mock_get_cache_filepath.side_effect = lambda cache_format=None: str(
+        tmpdir.join(f'issue_cache.{cache_format or "jsonl"}')
+    )
+    mock_get_cache_log_filepath.return_value = str(tmpdir.join('issue_cache.log'))
+
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core.write_issues(compact=True)
+
+    mock_jira_core.store.clear()
+    mock_jira_core.config.cache_format = 'parquet'
+    mock_jira_core.load_issues()
+
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues()
+
+    assert tmpdir.join('issue_cache.parquet').exists()
+    assert tmpdir.join('issue_cache.log').size() == 0
+
+    mock_jira_core.store.clear()
+    mock_jira_core.load_issues()
+
+    assert set(mock_jira_core.store) == {'TEST-1', 'TEST-71'}
+
+
+@mock.patch('jira_offline.jira.get_cache_log_filepath')
+@mock.patch('jira_offline.jira.get_cache_filepath')
+def test_jira__df__uses_dataframe_from_parquet_cache(mock_get_cache_filepath, mock_get_cache_log_filepath, mock_jira_core, tmpdir):
+    '''
+    Ensure Jira.df is built from the parquet cache without deserializing the issues
+    '''
+    pytest.importorskip('pyarrow')
+
+    mock_get_cache_filepath.return_value = str(tmpdir.join('issue_cache.parquet'))
+    mock_get_cache_log_filepath.return_value = str(tmpdir.join('issue_cache.log'))
+    mock_jira_core.config.cache_format = 'parquet'
+
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues(compact=True)
+
+    mock_jira_core.store.clear()
+    mock_jira_core.load_issues()
+
+    with mock.patch('jira_offline.jira.Issue.deserialize') as mock_issue_deserialize:
+        df = mock_jira_core.df
+        assert not mock_issue_deserialize.called
+
+    assert list(df.index) == ['TEST-1', 'TEST-71']
+    assert df.loc['TEST-1', 'fix_versions'] == {'0.1'}
+    assert df.loc['TEST-71', 'project_key'] == 'TEST'
+
+
+def test_jira__df__updates_rows_without_rebuilding(mock_jira_core):
+    '''
+    Ensure Jira.df is built once, and thereafter rows are updated for issues set, deleted and modified
+    in-place
+    '''
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+
+    df = mock_jira_core.df
+    assert mock_jira_core.df is df
+
+    with mock.patch('jira_offline.jira.build_df') as mock_build_df, \
+            mock.patch('jira_offline.utils.dataframe.build_df', wraps=build_df) as mock_build_rows:
+        mock_jira_core['TEST-71'].assignee = 'changed'
+        assert mock_jira_core.df.loc['TEST-71', 'assignee'] == 'changed'
+        assert not mock_build_rows.called
+
+        mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+        del mock_jira_core['TEST-1']
+        assert list(mock_jira_core.df.index) == ['TEST-71', 'TEST-72']
+
+        # only the new row is built
+        assert not mock_build_df.called
+        assert list(mock_build_rows.call_args[0][0]) == ['TEST-72']
+
+
+def test_jira__df__tracks_changes_written_to_the_cache(mock_jira_core):
+    '''
+    Ensure changes made in-place are applied to Jira.df, even after they're written to the cache
+    '''
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.df  # pylint: disable=pointless-statement
+
+    mock_jira_core['TEST-71'].fix_versions = {'0.2'}
+
+    with mock.patch('jira_offline.jira.jsonlines'), mock.patch('builtins.open'):
+        mock_jira_core.write_issues()
+
+    assert mock_jira_core.df.loc['TEST-71', 'fix_versions'] == {'0.2'}
+
+
+def test_jira__df__is_rebuilt_when_filter_changes(mock_jira_core):
+    '''
+    Ensure Jira.df reflects a change to jira.filter made after it was built
+    '''
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1, project=ProjectMeta('FIRST'))
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2, project=ProjectMeta('SECOND'))
+    assert len(mock_jira_core.df) == 2
+
+    mock_jira_core.filter.project_key = 'SECOND'
+    assert list(mock_jira_core.df.index) == ['TEST-72']
+
+    # an issue modified to no longer match the filter is dropped
+    mock_jira_core['TEST-72'].project = ProjectMeta('FIRST')
+    assert mock_jira_core.df.empty
+
+
+def test_jira__get_df__builds_requested_columns_without_deserializing(mock_jira_core):
+    '''
+    Ensure Jira.get_df builds only the requested columns, directly from serialized issues
+    '''
+    mock_jira_core.store['TEST-1'] = dict(EPIC_1)
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+
+    with mock.patch('jira_offline.jira.Issue.deserialize') as mock_issue_deserialize:
+        df = mock_jira_core.get_df(['issuetype', 'fix_versions'])
+        assert not mock_issue_deserialize.called
+
+    assert list(df.columns) == ['issuetype', 'fix_versions']
+    assert list(mock_jira_core._df.columns) == ['issuetype', 'fix_versions']  # pylint: disable=protected-access
+    assert df.loc['TEST-71', 'fix_versions'] == {'0.1'}
+
+
+def test_jira__get_df__adds_columns_on_request(mock_jira_core):
+    '''
+    Ensure columns requested later are added to the DataFrame, and Jira.df returns every column
+    '''
+    mock_jira_core.store['TEST-1'] = dict(EPIC_1)
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+
+    mock_jira_core.get_df(['status'])
+    mock_jira_core['TEST-71'].summary = 'changed'
+
+    assert mock_jira_core.get_df(['summary']).loc['TEST-71', 'summary'] == 'changed'
+    assert list(mock_jira_core.df.columns) == COLUMNS
+    assert mock_jira_core.df.loc['TEST-71', 'updated'] == pd.Timestamp(mock_jira_core['TEST-71'].updated)
+
+
+def test_jira__get_df__applies_the_filter(mock_jira_core):
+    '''
+    Ensure Jira.get_df respects a configured jira.filter, when the project column is not requested
+    '''
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1, project=ProjectMeta('FIRST'))
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2, project=ProjectMeta('SECOND'))
+
+    mock_jira_core.filter.project_key = 'SECOND'
+
+    df = mock_jira_core.get_df(['status'])
+    assert list(df.index) == ['TEST-72']
+    assert list(df.columns) == ['status']
+
+
+@mock.patch('jira_offline.jira.get_cache_log_filepath')
+@mock.patch('jira_offline.jira.get_cache_filepath')
+def test_jira__df__applies_cache_log_to_dataframe_from_parquet_cache(mock_get_cache_filepath, mock_get_cache_log_filepath, mock_jira_core, tmpdir):
+    '''
+    Ensure Jira.df updates the DataFrame from the parquet cache with changes replayed from the cache
+    log, deserializing only those issues
+    '''
+    pytest.importorskip('pyarrow')
+
+    mock_get_cache_filepath.return_value = str(tmpdir.join('issue_cache.parquet'))
+    mock_get_cache_log_filepath.return_value = str(tmpdir.join('issue_cache.log'))
+    mock_jira_core.config.cache_format = 'parquet'
+
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues(compact=True)
+
+    mock_jira_core['TEST-71'].assignee = 'changed'
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store.clear()
+    mock_jira_core.load_issues()
+
+    df = mock_jira_core.df
+
+    assert isinstance(mock_jira_core.store['TEST-1'], dict)
+    assert df.loc['TEST-71', 'assignee'] == 'changed'
+    assert list(df.index) == ['TEST-1', 'TEST-71']
+
+
+@mock.patch('jira_offline.jira.get_cache_log_filepath')
+@mock.patch('jira_offline.jira.get_cache_filepath')
+def test_jira__load_issues__logs_error_on_invalid_parquet_cache(mock_get_cache_filepath, mock_get_cache_log_filepath, mock_jira_core, tmpdir):
+    '''
+    Ensure a parquet cache file which cannot be read is reported, rather than raised
+    '''
+    pytest.importorskip('pyarrow')
+
+    tmpdir.join('issue_cache.parquet').write('not a parquet file')
+    mock_get_cache_filepath.return_value = str(tmpdir.join('issue_cache.parquet'))
+    mock_get_cache_log_filepath.return_value = str(tmpdir.join('issue_cache.log'))
+    mock_jira_core.config.cache_format = 'parquet'
+
+    with mock.patch('jira_offline.jira.logger') as mock_logger:
+        mock_jira_core.load_issues()
+
+    assert mock_logger.exception.called
+    assert not mock_jira_core.store
+
+
+@pytest.fixture
+def cache_files(tmpdir):
+    '''
+    Redirect the issue cache file and cache log into a temporary directory
+    '''
+    with mock.patch('jira_offline.jira.get_cache_filepath', return_value=str(tmpdir.join('issue_cache.jsonl'))), \
+            mock.patch('jira_offline.jira.get_cache_log_filepath', return_value=str(tmpdir.join('issue_cache.log'))):
+        yield tmpdir.join('issue_cache.jsonl'), tmpdir.join('issue_cache.log')
+
+
+def test_jira__write_issues__appends_only_modified_issues_to_log(mock_jira_core, cache_files):
+    '''
+    Ensure write_issues appends only the issues set since the last write to the cache log
+    '''
+    _, log_file = cache_files
+
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues()
+
+    mock_jira_core['TEST-71'] = mock_jira_core['TEST-71']
+    mock_jira_core.write_issues()
+
+    assert sorted(json.loads(line)['key'] for line in log_file.readlines()) == ['TEST-1', 'TEST-71', 'TEST-71']
+
+
+def test_jira__load_issues__replays_cache_log(mock_jira_core, cache_files):
+    '''
+    Ensure changes and deletes appended to the cache log are applied over the cache file on load
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues(compact=True)
+
+    mock_jira_core['TEST-71'].assignee = 'changed'
+    mock_jira_core['TEST-71'] = mock_jira_core['TEST-71']
+    del mock_jira_core['TEST-1']
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store.clear()
+    mock_jira_core.load_issues()
+
+    assert list(mock_jira_core) == ['TEST-71']
+    assert mock_jira_core['TEST-71'].assignee == 'changed'
+
+
+def test_jira__write_issues__compacts_log_above_threshold(mock_jira_core, cache_files):
+    '''
+    Ensure the cache log is compacted into the cache file once it passes the size threshold
+    '''
+    cache_file, log_file = cache_files
+    mock_jira_core.LOG_COMPACT_MIN = 2
+
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues()
+
+    assert len(log_file.readlines()) == 2
+    assert not cache_file.exists()
+
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+    mock_jira_core.write_issues()
+
+    assert log_file.read() == ''
+    assert [json.loads(line)['key'] for line in cache_file.readlines()] == ['TEST-1', 'TEST-71', 'TEST-72']
+
+
+def test_jira__changed_issues__skips_unchanged_issues_without_deserializing(mock_jira_core, project):
+    '''
+    Ensure changed_issues returns modified and new issues, and leaves unchanged serialized issues as-is
+    '''
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+    mock_jira_core.store['TEST-71.1'] = dict(ISSUE_1_WITH_ASSIGNEE_DIFF, key='TEST-71.1')
+    mock_jira_core.store[ISSUE_NEW['key']] = dict(ISSUE_NEW)
+
+    issues = mock_jira_core.changed_issues()
+
+    assert sorted(issue.key for issue in issues) == sorted(['TEST-71.1', ISSUE_NEW['key']])
+    assert isinstance(mock_jira_core.store['TEST-71'], dict)
+
+
+def test_jira__changed_issues__skips_issues_modified_without_a_diff(mock_jira_core):
+    '''
+    Ensure changed_issues returns an existing issue modified in-place only when it differs from the
+    version last seen on Jira
+    '''
+    mock_jira_core.store['TEST-71'] = dict(ISSUE_1)
+    mock_jira_core.store['TEST-72'] = dict(ISSUE_2)
+
+    # set a field to the value it already holds
+    mock_jira_core['TEST-71'].assignee = ISSUE_1['assignee']
+    mock_jira_core['TEST-72'].assignee = 'changed'
+
+    assert [issue.key for issue in mock_jira_core.changed_issues()] == ['TEST-72']
+
+
+@pytest.fixture
+def sqlite_cache(mock_jira_core, tmpdir):
+    '''
+    Configure the SQLite issue cache in a temporary directory
+    '''
+    mock_jira_core.config.cache_format = 'sqlite'
+
+    with mock.patch('jira_offline.jira.get_cache_filepath', side_effect=lambda fmt=None: str(tmpdir.join(f'issue_cache.{fmt or "jsonl"}'))), \
+            mock.patch('jira_offline.jira.get_cache_log_filepath', return_value=str(tmpdir.join('issue_cache.log'))):
+        yield tmpdir.join('issue_cache.sqlite')
+
+
+def test_jira__write_issues_and_load_issues__sqlite_roundtrip(mock_jira_core, sqlite_cache):
+    '''
+    Ensure issues written to the SQLite cache are loaded unchanged, and read only on access
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1_WITH_ASSIGNEE_DIFF)
+    mock_jira_core[ISSUE_NEW['key']] = Issue.deserialize(ISSUE_NEW)
+    mock_jira_core.write_issues()
+
+    issues = {key: issue.serialize() for key, issue in mock_jira_core.items()}
+
+    # reload from the database
+    mock_jira_core.store = dict()
+    mock_jira_core.load_issues()
+
+    assert isinstance(mock_jira_core.store, SqliteStore)
+    assert not mock_jira_core.store.loaded
+
+    assert {key: issue.serialize() for key, issue in mock_jira_core.items()} == issues
+    assert mock_jira_core['TEST-71'].diff_to_original == [['change', 'assignee', ['hoganp', 'danil1']]]
+
+
+def test_jira__load_issues__sqlite_imports_existing_jsonl_cache(mock_jira_core, sqlite_cache, tmpdir):
+    '''
+    Ensure an empty SQLite cache is populated from an existing JSON cache
+    '''
+    tmpdir.join('issue_cache.jsonl').write('\n'.join(json.dumps(obj) for obj in (EPIC_1, ISSUE_1)))
+
+    mock_jira_core.load_issues()
+
+    assert sorted(mock_jira_core.store.select({})) == ['TEST-1', 'TEST-71']
+
+
+def test_jira__select__queries_sqlite_and_matches_unwritten_changes(mock_jira_core, sqlite_cache):
+    '''
+    Ensure select resolves criteria by query, and matches issues modified since the last write in memory
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store = dict()
+    mock_jira_core.load_issues()
+
+    assert [issue.key for issue in mock_jira_core.select(issuetype='Epic')] == ['TEST-1']
+    assert list(mock_jira_core.store.loaded) == ['TEST-1']
+
+    mock_jira_core['TEST-71'].assignee = 'changed'
+
+    assert [issue.key for issue in mock_jira_core.select(assignee='changed')] == ['TEST-71']
+    assert 'TEST-71' not in [issue.key for issue in mock_jira_core.select(assignee=ISSUE_1['assignee'])]
+
+
+def test_jira__select__scans_dict_store(mock_jira_core):
+    '''
+    Ensure select matches all criteria against issues held in memory
+    '''
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+
+    assert [issue.key for issue in mock_jira_core.select(issuetype='Epic')] == ['TEST-1']
+    assert [issue.key for issue in mock_jira_core.select(fix_versions={'0.1'}, issuetype='Story')] == ['TEST-71']
+    assert mock_jira_core.select(epic_ref=None, issuetype='Story') == []
+
+
+def test_jira__filter__queries_sqlite_by_project(mock_jira_core, sqlite_cache):
+    '''
+    Ensure a project filter on the SQLite cache is resolved by query
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store = dict()
+    mock_jira_core.load_issues()
+
+    mock_jira_core.filter.project_key = 'TEST'
+    with mock.patch.object(mock_jira_core.store, 'select', wraps=mock_jira_core.store.select) as mock_select:
+        assert sorted(mock_jira_core.keys()) == ['TEST-1', 'TEST-71']
+        assert mock_select.called
+
+    mock_jira_core.filter.project_key = 'OTHER'
+    assert list(mock_jira_core.keys()) == []
+
+
+def test_keys__respect_a_filter_query(mock_jira_core):
+    '''
+    Ensure that jira.keys() respects a filter expression, including after an issue changes
+    '''
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+
+    mock_jira_core.filter.query = 'status = Backlog or fix_versions = 0.2'
+    assert list(mock_jira_core.keys()) == ['TEST-72']
+
+    mock_jira_core['TEST-71'].fix_versions = {'0.1', '0.2'}
+    assert sorted(mock_jira_core.keys()) == ['TEST-71', 'TEST-72']
+
+
+def test_jira__filter__queries_sqlite_with_filter_criteria(mock_jira_core, sqlite_cache):
+    '''
+    Ensure the indexed equality tests of a filter expression are included in the SQLite query, and the
+    remainder of the expression is applied to the issues returned
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store = dict()
+    mock_jira_core.load_issues()
+
+    mock_jira_core.filter.query = 'issuetype = Story and summary ~ "this is"'
+    with mock.patch.object(mock_jira_core.store, 'select', wraps=mock_jira_core.store.select) as mock_select:
+        assert sorted(mock_jira_core.keys()) == ['TEST-71', 'TEST-72']
+        mock_select.assert_called_once_with({'issuetype': {'Story'}})
+
+
+def test_jira__epics__index_is_updated_as_issues_change(mock_jira_core):
+    '''
+    Ensure the epic index is built once, and reflects issues set, modified in-place and deleted
+    '''
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+
+    assert mock_jira_core.epics.children == {'TEST-1': {'TEST-71'}}
+
+    with mock.patch.object(mock_jira_core, '_index_rows') as mock_index_rows:
+        mock_jira_core['TEST-72'] = Issue.deserialize(ISSUE_2)
+        mock_jira_core['TEST-71'].epic_ref = None
+        mock_jira_core['TEST-1'].epic_name = 'Renamed'
+
+        assert mock_jira_core.epics.children == {'TEST-1': {'TEST-72'}}
+        assert mock_jira_core.epics.names['Renamed'] == {'TEST-1'}
+
+        del mock_jira_core['TEST-1']
+
+        assert mock_jira_core.epics.epics == set()
+        assert not mock_jira_core.epics.names
+        assert not mock_index_rows.called
+
+
+def test_jira__summaries__index_is_shared_and_updated_as_issues_change(mock_jira_core):
+    '''
+    Ensure the summary index is built once, is distinct from the epic index, and reflects issues
+    modified in-place
+    '''
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+
+    summaries = mock_jira_core.summaries
+    assert isinstance(summaries, SummaryIndex)
+    assert mock_jira_core.summaries is summaries
+    assert not isinstance(mock_jira_core.epics, SummaryIndex)
+
+    mock_jira_core['TEST-71'].summary = 'A new summary'
+
+    assert mock_jira_core.summaries.find(ISSUE_1['project_id'], 'a new  SUMMARY') == {'TEST-71'}
+    assert mock_jira_core.summaries.find(ISSUE_1['project_id'], ISSUE_1['summary']) == set()
+
+
+def test_jira__epics__built_from_sqlite_columns_without_decoding(mock_jira_core, sqlite_cache):
+    '''
+    Ensure the epic index is built from the SQLite columns, without decoding each issue
+    '''
+    mock_jira_core.load_issues()
+    mock_jira_core['TEST-1'] = Issue.deserialize(EPIC_1)
+    mock_jira_core['TEST-71'] = Issue.deserialize(ISSUE_1)
+    mock_jira_core.write_issues()
+
+    mock_jira_core.store = dict()
+    mock_jira_core.load_issues()
+
+    with mock.patch('jira_offline.utils.sqlite.json_loads') as mock_json_loads:
+        assert mock_jira_core.epics.children == {'TEST-1': {'TEST-71'}}
+        assert mock_jira_core.epics.names[EPIC_1['summary']] == {'TEST-1'}
+        assert not mock_json_loads.called
@@ -1,20 +1,108 @@
 from unittest import mock
 
-from jira_offline.utils.api import _request, head, get, post, put
+import pytest
 
+from jira_offline.exceptions import JiraUnavailable
+from jira_offline.models import ProjectMeta
+from jira_offline.utils import api
+from jira_offline.utils.api import _request, get_auth, get_session, head, get, post, put
 
-@mock.patch('jira_offline.utils.api.requests')
-def test_requests__calls_requests_request(mock_requests, project):
+
+@mock.patch('jira_offline.utils.api.get_session')
+def test_requests__calls_session_request(mock_get_session, project):
+    '''
+    Dumb test ensuring we call request on the pooled session, and then decode the response body
+    '''
+    mock_get_session.return_value.request.return_value = mock_response = mock.MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = b'{"egg": "bacon"}'
+
+    assert _request('GET', project, 'path/') == {'egg': 'bacon'}
+    assert mock_get_session.return_value.request.called
+
+
+@mock.patch('jira_offline.utils.api.get_session')
+def test_requests__encodes_request_body(mock_get_session, project):
+    '''
+    Ensure the request body is encoded as JSON, with the matching content type
+    '''
+    mock_get_session.return_value.request.return_value = mock_response = mock.MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = b''
+
+    assert _request('POST', project, 'path/', data={'egg': 'bacon'}) == {}
+
+    _, kwargs = mock_get_session.return_value.request.call_args
+    assert kwargs['data'] == '{"egg":"bacon"}'
+    assert kwargs['headers'] == {'Content-Type': 'application/json'}
+
+
+@mock.patch('jira_offline.utils.api.get_session')
+def test_get__stream_yields_array_items_from_response_chunks(mock_get_session, project):
+    '''
+    Ensure a streamed request decodes the named array from the response as it's read
+    '''
+    mock_get_session.return_value.request.return_value = mock_response = mock.MagicMock()
+    mock_response.status_code = 200
+    mock_response.iter_content.return_value = iter([b'{"total": 2, "issues": [{"key": "TEST-1"},', b' {"key": "TEST-2"}]}'])
+
+    data = get(project, 'search', stream='issues')
+
+    assert data['total'] == 2
+    assert list(data['issues']) == [{'key': 'TEST-1'}, {'key': 'TEST-2'}]
+    assert mock_get_session.return_value.request.call_args[1]['stream'] is True
+    assert mock_response.close.called
+
+
+@mock.patch('jira_offline.utils.api.get_session')
+def test_get__stream_raises_jira_unavailable_on_truncated_response(mock_get_session, project):
     '''
-    Dumb test ensuring we call requests.request, and then call response.json()
+    Ensure a streamed response which ends part way through the array raises JiraUnavailable
     '''
-    mock_requests.request.return_value = mock_response = mock.MagicMock()
+    mock_get_session.return_value.request.return_value = mock_response = mock.MagicMock()
     mock_response.status_code = 200
+    mock_response.iter_content.return_value = iter([b'{"total": 2, "issues": [{"key": "TEST-1"}, {"ke'])
+
+    data = get(project, 'search', stream='issues')
+
+    with pytest.raises(JiraUnavailable):
+        list(data['issues'])
+
+
+@mock.patch.dict('jira_offline.utils.api._sessions', clear=True)
+def test_get_session__reuses_session_for_same_jira_server(project):
+    '''
+    Ensure a single session is created per Jira server
+    '''
+    other_project = ProjectMeta(key='OTHER', hostname=project.hostname)
+    another_server = ProjectMeta(key='TEST', hostname='jira.example.com')
 
-    _request('GET', project, 'path/')
+    assert get_session(project) is get_session(other_project)
+    assert get_session(project) is not get_session(another_server)
+
+
+@mock.patch.dict('jira_offline.utils.api._auths', clear=True)
+def test_get_auth__caches_auth_until_credentials_change(project):
+    '''
+    Ensure the auth object is reused across requests, and recreated when the credentials change
+    '''
+    auth = get_auth(project)
+    assert get_auth(project) is auth
+
+    project.password = 'changed'
+    assert get_auth(project) is not auth
+    assert get_auth(project).password == 'changed'
+
+
+@mock.patch.dict('jira_offline.utils.api._auths', clear=True)
+def test_get_auth__caches_auth_by_project_id(project):
+    '''
+    Ensure the auth cache is keyed by project id, and does not hold the credentials in plaintext
+    '''
+    get_auth(project)
 
-    assert mock_requests.request.called
-    assert mock_response.json.called
+    assert list(api._auths) == [project.id]
+    assert project.password not in api._auths[project.id]
 
 
 @mock.patch('jira_offline.utils.api._request')
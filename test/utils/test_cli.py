@@ -0,0 +1,83 @@
+'''
+Tests for the print and text rendering helpers in utils.cli module
+'''
+from unittest import mock
+
+import arrow
+import pandas as pd
+from tabulate import tabulate
+
+from jira_offline.utils.cli import abbrev_keys, humanize, iter_table, print_list
+
+
+def test_humanize__matches_arrow():
+    '''
+    Ensure the vectorized relative time descriptions match those of arrow, in the past and future
+    '''
+    now = pd.Timestamp('2020-06-15T12:00:00', tz='UTC')
+    offsets = [
+        0, 5, 10, 44, 45, 89, 90, 150, 2699, 2700, 5399, 5400, 7300, 79199, 79200, 172799, 172800,
+        300000, 554400, 907199, 907200, 1500000, 2419200, 3887999, 3888000, 10000000, 29807999,
+        29808000, 47260799, 47260800, 100000000,
+    ]
+    values = pd.Series(
+        [now - pd.Timedelta(seconds=s) for s in offsets] + [now + pd.Timedelta(seconds=s) for s in offsets]
+    )
+
+    expected = [arrow.get(dt).to('local').humanize(arrow.get(now).to('local')) for dt in values]
+
+    assert list(humanize(values, now)) == expected
+
+
+def test_humanize__blank_for_missing():
+    '''
+    Ensure a missing datetime is described with a blank string
+    '''
+    values = pd.Series([pd.NaT, pd.Timestamp('2020-06-15', tz='UTC')], dtype='datetime64[ns, UTC]')
+
+    assert list(humanize(values, pd.Timestamp('2020-06-15', tz='UTC'))) == ['', 'just now']
+
+
+def test_abbrev_keys():
+    '''
+    Ensure only UUID keys are abbreviated
+    '''
+    keys = pd.Series(['TEST-71', '7242cc9e-ea52-4e51-bd84-2ced250cabf0', None])
+
+    assert list(abbrev_keys(keys)) == ['TEST-71', '7242cc9e', '']
+
+
+def test_iter_table__matches_tabulate_psql():
+    '''
+    Ensure the streamed table is laid out the same as tabulate's psql format
+    '''
+    df = pd.DataFrame(
+        {'summary': ['This is the story summary', '', None], 'count': [1, 22, 333]},
+        index=pd.Index(['TEST-1', 'TEST-22', 'T'], name='key'),
+    )
+
+    expected = tabulate(df.fillna(''), headers='keys', tablefmt='psql')
+
+    assert '\n'.join(iter_table(df, chunk_size=2)) == expected
+
+
+@mock.patch('jira_offline.utils.cli.click')
+def test_print_list__does_not_modify_dataframe(mock_click):
+    '''
+    Ensure print_list renders the DataFrame passed without changing it
+    '''
+    df = pd.DataFrame({
+        'key': ['7242cc9e-ea52-4e51-bd84-2ced250cabf0'],
+        'issuetype': ['Story'],
+        'epic_ref': [None],
+        'summary': ['This is the story summary'],
+        'updated': [pd.Timestamp('2020-06-15', tz='UTC')],
+    }, index=['7242cc9e-ea52-4e51-bd84-2ced250cabf0'])
+    original = df.copy()
+
+    print_list(df)
+
+    pd.testing.assert_frame_equal(df, original)
+    output = '\n'.join(c.args[0] for c in mock_click.echo.call_args_list)
+    assert '| 7242cc9e | Story' in output
+    assert 'ago' in output
@@ -0,0 +1,122 @@
+'''
+Tests for the JSON encode/decode functions in utils.codec module
+'''
+from unittest import mock
+
+import pytest
+
+from jira_offline.utils import codec
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request):
+    '''
+    Run tests against orjson, when it's installed, and the stdlib json fallback
+    '''
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+        yield
+    else:
+        with mock.patch('jira_offline.utils.codec.orjson', None):
+            yield
+
+
+def test_codec__dumps_and_loads_roundtrip(backend):
+    '''
+    Ensure objects are encoded to compact JSON, and decoded unchanged from str or bytes
+    '''
+    obj = {'key': 'TEST-71', 'fix_versions': ['0.1'], 'diff_to_original': [['change', 'assignee', ['a', 'b']]]}
+
+    data = codec.dumps(obj)
+
+    assert data == '{"key":"TEST-71","fix_versions":["0.1"],"diff_to_original":[["change","assignee",["a","b"]]]}'
+    assert codec.loads(data) == obj
+    assert codec.loads(data.encode()) == obj
+
+
+def test_codec__loads_raises_decode_error(backend):
+    '''
+    Ensure invalid JSON raises JSONDecodeError for either backend
+    '''
+    with pytest.raises(codec.JSONDecodeError):
+        codec.loads('{"key": ')
+
+
+def test_codec__dumps_raises_type_error(backend):
+    '''
+    Ensure unencodable objects raise TypeError for either backend, as caught by Jira.write_issues
+    '''
+    with pytest.raises(TypeError):
+        codec.dumps({'fix_versions': {'0.1'}})
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_codec__iter_object__decodes_array_incrementally(backend, chunk_size):
+    '''
+    Ensure iter_object decodes the members before the array, and yields each array item, regardless
+    of where the chunk boundaries fall (including inside multi-byte UTF-8 characters and strings
+    holding quotes and brackets)
+    '''
+    raw = (
+        '{"startAt": 0, "total": 2, "issues": ['
+        '{"key": "TEST-1", "summary": "ünïcode \\"[quoted]\\" {\\\\}", "labels": [["a"], []]}, '
+        '{"key": "TEST-2", "estimate": 12345}'
+        ']}'
+    ).encode()
+    chunks = [raw[i:i+chunk_size] for i in range(0, len(raw), chunk_size)]
+
+    data = codec.iter_object(chunks, 'issues')
+
+    assert data['total'] == 2
+    assert list(data['issues']) == [
+        {'key': 'TEST-1', 'summary': 'ünïcode "[quoted]" {\\}', 'labels': [['a'], []]},
+        {'key': 'TEST-2', 'estimate': 12345},
+    ]
+
+
+def test_codec__iter_object__decodes_each_item_with_loads():
+    '''
+    Ensure each array item is decoded with codec.loads, so orjson is used when installed
+    '''
+    data = codec.iter_object([b'{"issues": [{"key": "TEST-1"}, {"key": "TEST-2"}]}'], 'issues')
+
+    with mock.patch('jira_offline.utils.codec.loads', wraps=codec.loads) as mock_loads:
+        assert list(data['issues']) == [{'key': 'TEST-1'}, {'key': 'TEST-2'}]
+
+    assert mock_loads.call_args_list == [mock.call('{"key": "TEST-1"}'), mock.call('{"key": "TEST-2"}')]
+
+
+@mock.patch('jira_offline.utils.codec._Stream.TRIM_SIZE', 16)
+def test_codec__iter_object__trims_parsed_text_from_buffer():
+    '''
+    Ensure parsed text is dropped from the buffer once it's longer than TRIM_SIZE
+    '''
+    raw = ('{"issues": [' + ', '.join(f'{{"key": "TEST-{i}"}}' for i in range(100)) + ']}').encode()
+    chunks = [raw[i:i+10] for i in range(0, len(raw), 10)]
+
+    data = codec.iter_object(chunks, 'issues')
+
+    for i, item in enumerate(data['issues']):
+        assert item == {'key': f'TEST-{i}'}
+
+        # the buffer holds at most TRIM_SIZE of parsed text, an item and a chunk
+        frame = data['issues'].gi_frame
+        if frame:
+            assert len(frame.f_locals['stream'].buf) < 16 + 20 + 10
+
+
+def test_codec__iter_object__returns_object_without_array():
+    '''
+    Ensure iter_object decodes the whole object when the array key is missing
+    '''
+    assert codec.iter_object([b'{"total": 0}'], 'issues') == {'total': 0}
+
+
+def test_codec__iter_object__raises_on_truncated_stream():
+    '''
+    Ensure iter_object raises JSONDecodeError when the stream ends part way through the array
+    '''
+    data = codec.iter_object([b'{"issues": [{"key": "TEST-1"}, {"key": '], 'issues')
+
+    with pytest.raises(codec.JSONDecodeError):
+        list(data['issues'])
@@ -5,7 +5,7 @@ import pytest
 
 from fixtures import ISSUE_1
 from jira_offline.models import Issue
-from jira_offline.utils.convert import issue_to_jiraapi_update
+from jira_offline.utils.convert import issue_to_jiraapi_update, jiraapi_fields
 
 
 @pytest.mark.parametrize('modified', [
@@ -59,3 +59,35 @@ def test_issue_to_jiraapi_update__all_fields_are_returned_for_new_issue(mock_jir
         'reporter': {'name': 'danil1'},
         'summary': 'This is the story summary',
     }
+
+
+def test_jiraapi_fields__includes_all_fields_read_by_jiraapi_object_to_issue(project):
+    '''
+    Ensure jiraapi_fields returns the Jira API fields for Issue, including the project custom fields
+    '''
+    fields = jiraapi_fields(project)
+
+    assert 'fixVersions' in fields
+    assert 'customfield_1' in fields
+    assert 'customfield_2' in fields
+    for field_name in ('project_id', 'key', 'id', 'original', 'diff_to_original', 'fix_versions'):
+        assert field_name not in fields
+
+
+def test_jiraapi_fields__skips_unused_custom_fields(project):
+    '''
+    Ensure custom fields not configured for the project are not requested
+    '''
+    project.custom_fields.estimate = ''
+
+    assert not [f for f in jiraapi_fields(project) if f in ('customfield_', 'customfield_None')]
+    assert len([f for f in jiraapi_fields(project) if f.startswith('customfield_')]) == 2
+
+
+def test_jiraapi_fields__includes_project_extra_fields(project):
+    '''
+    Ensure extra fields configured on the project are requested
+    '''
+    project.extra_fields = {'customfield_99999'}
+
+    assert 'customfield_99999' in jiraapi_fields(project)
@@ -0,0 +1,89 @@
+'''
+Tests for the DataFrame schema in utils.dataframe module
+'''
+import datetime
+
+import pandas as pd
+
+from fixtures import EPIC_1, ISSUE_1, ISSUE_2
+from jira_offline.models import Issue
+from jira_offline.utils.dataframe import (append_rows, apply_schema, build_df, issue_row, serialized_row,
+                                         set_row)
+
+
+def test_build_df__applies_schema(project):
+    '''
+    Ensure the DataFrame is built with categorical, datetime and string columns, and the project key
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+    df = build_df({'TEST-71': issue_row(issue)})
+
+    assert isinstance(df.issuetype.dtype, pd.CategoricalDtype)
+    assert isinstance(df.summary.dtype, pd.StringDtype)
+    assert str(df.updated.dtype) == 'datetime64[ns, UTC]'
+    assert df.fix_versions.dtype == object
+    assert 'project' not in df
+    assert df.loc['TEST-71', 'project_key'] == project.key
+    assert df.loc['TEST-71', 'updated'] == pd.Timestamp(issue.updated).tz_convert('UTC')
+
+
+def test_build_df__empty_has_all_columns():
+    '''
+    Ensure a DataFrame built with no issues still has the typed columns
+    '''
+    df = build_df({})
+
+    assert df.empty
+    assert isinstance(df.status.dtype, pd.CategoricalDtype)
+    assert list((df.issuetype == 'Epic').index) == []
+
+
+def test_apply_schema__matches_build_df(project):
+    '''
+    Ensure apply_schema converts a frame of serialized values to the same types as build_df
+    '''
+    issue = Issue.deserialize(ISSUE_1, project=project)
+    df = build_df({'TEST-71': issue_row(issue)})
+
+    serialized = pd.DataFrame([{**issue.serialize(), 'project_key': project.key}], index=['TEST-71'])
+    serialized['fix_versions'] = serialized.fix_versions.map(set)
+
+    assert apply_schema(serialized).dtypes.equals(df.dtypes)
+
+
+def test_set_row__adds_new_category(project):
+    '''
+    Ensure set_row can set a value which is not yet a category of the column
+    '''
+    df = build_df({'TEST-71': issue_row(Issue.deserialize(ISSUE_1, project=project))})
+    issue = Issue.deserialize(ISSUE_1, project=project)
+    issue.status = 'In Review'
+    issue.updated = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=10)))
+
+    set_row(df, 'TEST-71', issue_row(issue))
+
+    assert df.loc['TEST-71', 'status'] == 'In Review'
+    assert list(df.status.cat.categories) == sorted(['In Review', ISSUE_1['status']])
+    assert df.loc['TEST-71', 'updated'] == pd.Timestamp('2019-12-31T14:00:00', tz='UTC')
+    assert str(df.updated.dtype) == 'datetime64[ns, UTC]'
+
+
+def test_append_rows__retains_categorical_columns(project):
+    '''
+    Ensure appending rows with different categories does not fall back to object columns
+    '''
+    df = build_df({'TEST-1': issue_row(Issue.deserialize(EPIC_1, project=project))})
+
+    df = append_rows(df, {'TEST-72': issue_row(Issue.deserialize(ISSUE_2, project=project))})
+
+    assert list(df.index) == ['TEST-1', 'TEST-72']
+    assert isinstance(df.status.dtype, pd.CategoricalDtype)
+    assert list(df.status) == [EPIC_1['status'], ISSUE_2['status']]
+    assert list(df.status.cat.categories) == sorted([EPIC_1['status'], ISSUE_2['status']])
+
+
+def test_serialized_row__matches_issue_row(project):
+    '''
+    Ensure a row built from a serialized issue has the same values as one built from the Issue
+    '''
+    assert serialized_row(ISSUE_1, project) == issue_row(Issue.deserialize(ISSUE_1, project=project))
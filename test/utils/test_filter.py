@@ -0,0 +1,108 @@
+'''
+Tests for the filter language in utils.filter module
+'''
+import datetime
+
+import pandas as pd
+import pytest
+
+from fixtures import EPIC_1, ISSUE_1, ISSUE_2, ISSUE_MISSING_EPIC
+from jira_offline.exceptions import InvalidFilter
+from jira_offline.models import Issue
+from jira_offline.utils.dataframe import build_df, COLUMNS, issue_row
+from jira_offline.utils.filter import FIELDS, parse_filter
+
+
+NOW = pd.Timestamp('2019-08-25T00:00:00', tz='UTC')
+
+
+def _issues(project):
+    issues = {
+        'TEST-1': Issue.deserialize(EPIC_1, project=project),
+        'TEST-71': Issue.deserialize(ISSUE_1, project=project),
+        'TEST-72': Issue.deserialize(ISSUE_2, project=project),
+        'TEST-73': Issue.deserialize(ISSUE_MISSING_EPIC, project=project),
+    }
+    issues['TEST-71'].labels = {'backend', 'api'}
+    issues['TEST-72'].assignee = project.username
+    issues['TEST-72'].status = 'In Progress'
+    issues['TEST-73'].updated = datetime.datetime(2019, 8, 24, tzinfo=datetime.timezone.utc)
+    return issues
+
+
+def test_fields__match_dataframe_columns():
+    '''
+    Ensure every column of the issues DataFrame can be filtered on
+    '''
+    assert set(FIELDS) == set(COLUMNS)
+
+
+@pytest.mark.parametrize('query,expected', [
+    ('status = Backlog', ['TEST-73']),
+    ('status in (Backlog, "In Progress")', ['TEST-72', 'TEST-73']),
+    ('status not in (Backlog, "In Progress")', ['TEST-1', 'TEST-71']),
+    ('issuetype = Story and status != Backlog', ['TEST-71', 'TEST-72']),
+    ('type = Epic or status = Backlog', ['TEST-1', 'TEST-73']),
+    ('not (type = Epic or status = Backlog)', ['TEST-71', 'TEST-72']),
+    ('assignee = me', ['TEST-72']),
+    ('assignee != me', ['TEST-1', 'TEST-71', 'TEST-73']),
+    ('assignee is empty', ['TEST-1', 'TEST-73']),
+    ('assignee is not empty', ['TEST-71', 'TEST-72']),
+    ('labels ~ BACK', ['TEST-71']),
+    ('labels = api', ['TEST-71']),
+    ('labels != api', ['TEST-1', 'TEST-72', 'TEST-73']),
+    ('labels is empty', ['TEST-1', 'TEST-72', 'TEST-73']),
+    ('fix_versions in (0.1, 0.2)', ['TEST-1', 'TEST-71']),
+    ('summary ~ "this is"', ['TEST-1', 'TEST-71', 'TEST-72', 'TEST-73']),
+    ('summary !~ story', ['TEST-1']),
+    ('updated > -2d', ['TEST-73']),
+    ('updated <= 2019-08-21', ['TEST-1', 'TEST-71', 'TEST-72']),
+    ('epic_ref = TEST-1 and labels ~ back', ['TEST-71']),
+    ('project = TEST AND status = Backlog', ['TEST-73']),
+])
+def test_parse_filter__match_and_mask_agree(project, query, expected):
+    '''
+    Ensure a filter selects the same issues evaluated against each Issue, or as a DataFrame mask
+    '''
+    issues = _issues(project)
+    expr = parse_filter(query, now=NOW)
+
+    df = build_df({key: issue_row(issue) for key, issue in issues.items()})
+    mask = expr.mask(df, {project.key: project.username})
+
+    assert [key for key, issue in issues.items() if expr.match(issue)] == expected
+    assert list(df.index[mask]) == expected
+
+
+@pytest.mark.parametrize('query', [
+    'status =',
+    'status = Open and',
+    'bogus = Open',
+    'status > Open',
+    'updated ~ 2019',
+    'updated > yesterday',
+    'estimate = many',
+    'status in (Open',
+    'status = "Open',
+    '(status = Open',
+    'status = Open status = Done',
+])
+def test_parse_filter__raises_on_invalid_query(query):
+    '''
+    Ensure an invalid filter raises an exception for the CLI to report
+    '''
+    with pytest.raises(InvalidFilter):
+        parse_filter(query)
+
+
+def test_parse_filter__criteria_only_include_equality_on_indexed_fields():
+    '''
+    Ensure only the conjunctive equality tests are returned as criteria for an indexed store
+    '''
+    expr = parse_filter(
+        'status in (Backlog, Done) and status = Done and assignee = me and summary ~ test and '
+        '(issuetype = Epic or issuetype = Story)'
+    )
+    assert expr.criteria(['status', 'assignee', 'issuetype']) == {'status': {'Done'}}
+
+    assert parse_filter('status = Done or assignee = x').criteria(['status', 'assignee']) == {}
@@ -0,0 +1,72 @@
+'''
+Tests for the issue indexes in utils.index module
+'''
+import pytest
+
+from jira_offline.utils.index import EpicIndex, fuzzy_summary, SummaryIndex
+
+
+def test_epic_index__add_and_remove():
+    '''
+    Ensure the epic index tracks epics by name and their children, and drops emptied entries
+    '''
+    index = EpicIndex()
+    index.add('TEST-1', {'issuetype': 'Epic', 'epic_ref': None, 'summary': 'An epic', 'epic_name': 'E1'})
+    index.add('TEST-71', {'issuetype': 'Story', 'epic_ref': 'TEST-1', 'summary': 'A story', 'epic_name': None})
+
+    assert index.epics == {'TEST-1'}
+    assert index.names == {'An epic': {'TEST-1'}, 'E1': {'TEST-1'}}
+    assert index.children == {'TEST-1': {'TEST-71'}}
+
+    index.remove('TEST-71')
+    index.remove('TEST-99')
+
+    assert index.children == {}
+
+
+def test_epic_index__add_replaces_earlier_entry():
+    '''
+    Ensure adding an issue again removes the values indexed for it previously
+    '''
+    index = EpicIndex()
+    index.add('TEST-1', {'issuetype': 'Epic', 'epic_ref': None, 'summary': 'An epic', 'epic_name': 'E1'})
+    index.add('TEST-71', {'issuetype': 'Story', 'epic_ref': 'TEST-1', 'summary': 'A story', 'epic_name': None})
+
+    index.add('TEST-1', {'issuetype': 'Epic', 'epic_ref': None, 'summary': 'Renamed', 'epic_name': ''})
+    index.add('TEST-71', {'issuetype': 'Story', 'epic_ref': 'TEST-2', 'summary': 'A story', 'epic_name': None})
+
+    assert index.names == {'Renamed': {'TEST-1'}}
+    assert index.children == {'TEST-2': {'TEST-71'}}
+
+
+def test_summary_index__find_exact_and_fuzzy():
+    '''
+    Ensure summaries are matched per project ignoring case and whitespace, and near-duplicates only
+    when fuzzy matching is requested
+    '''
+    index = SummaryIndex()
+    index.add('TEST-71', {'project_id': 'p1', 'summary': 'Fix the  login bugs'})
+
+    assert index.find('p1', 'fix the login BUGS') == {'TEST-71'}
+    assert index.find('p2', 'Fix the login bugs') == set()
+    assert index.find('p1', 'Fix login bug.') == set()
+    assert index.find('p1', 'Fix login bug.', fuzzy=True) == {'TEST-71'}
+    assert index.find('p1', 'Fix login page', fuzzy=True) == set()
+
+    index.add('TEST-71', {'project_id': 'p1', 'summary': 'Changed'})
+
+    assert index.find('p1', 'Fix the login bugs', fuzzy=True) == set()
+    assert not index.fuzzy.get(('p1', fuzzy_summary('Fix the login bugs')))
+
+
+@pytest.mark.parametrize('summary,expected', [
+    ('As a user, I want to reset my password.', 'as user i want to reset my password'),
+    ('Export the reports to CSV', 'export report to csv'),
+    ('Upgrade pandas to 1.5', 'upgrade panda to 1 5'),
+    ('Process access logs', 'process access log'),
+])
+def test_fuzzy_summary(summary, expected):
+    '''
+    Ensure near-duplicate summaries are reduced to the same string
+    '''
+    assert fuzzy_summary(summary) == expected
@@ -0,0 +1,120 @@
+'''
+Tests for the SqliteStore class in utils.sqlite module
+'''
+import pytest
+
+from fixtures import EPIC_1, ISSUE_1, ISSUE_2
+from jira_offline.utils.sqlite import SqliteStore
+
+
+@pytest.fixture
+def store(tmpdir):
+    '''
+    Return a SqliteStore in a temporary directory, populated with three issues
+    '''
+    store = SqliteStore(str(tmpdir.join('issue_cache.sqlite')))
+    store.write([dict(EPIC_1), dict(ISSUE_1), dict(ISSUE_2)], [])
+    return store
+
+
+def test_sqlite_store__write__persists_issues(store, tmpdir):
+    '''
+    Ensure issues written are read back from a new connection
+    '''
+    reopened = SqliteStore(str(tmpdir.join('issue_cache.sqlite')))
+
+    assert sorted(reopened) == ['TEST-1', 'TEST-71', 'TEST-72']
+    assert reopened['TEST-71']['summary'] == ISSUE_1['summary']
+
+
+def test_sqlite_store__write__removes_deleted_issues(store):
+    '''
+    Ensure deleted issues are removed from the database
+    '''
+    del store['TEST-72']
+    assert 'TEST-72' not in store
+
+    store.write([], ['TEST-72'])
+
+    assert sorted(store.select({})) == ['TEST-1', 'TEST-71']
+
+
+@pytest.mark.parametrize('criteria,expected', [
+    ({'issuetype': 'Epic'}, ['TEST-1']),
+    ({'issuetype': {'Story', 'Epic'}, 'epic_ref': 'TEST-1'}, ['TEST-71', 'TEST-72']),
+    ({'fix_versions': '0.1'}, ['TEST-1', 'TEST-71']),
+    ({'epic_ref': None}, ['TEST-1']),
+])
+def test_sqlite_store__select__returns_matching_keys(store, criteria, expected):
+    '''
+    Ensure select returns the keys of issues matching all criteria
+    '''
+    assert sorted(store.select(criteria)) == expected
+
+
+def test_sqlite_store__select__raises_on_unknown_field(store):
+    '''
+    Ensure select raises ValueError for a field which is not held in a column
+    '''
+    with pytest.raises(ValueError):
+        store.select({'description': 'This is a story or issue'})
+
+
+def test_sqlite_store__iter__merges_changes_in_persisted_order(store):
+    '''
+    Ensure issues are iterated in the order they were written, with issues modified since the last
+    write in their existing position, deleted issues skipped, and new issues last
+    '''
+    store['TEST-1'] = dict(EPIC_1, summary='Updated')
+    store['TEST-73'] = dict(ISSUE_2, key='TEST-73')
+    del store['TEST-71']
+
+    assert list(store) == ['TEST-1', 'TEST-72', 'TEST-73']
+    assert [value['summary'] for _, value in store.items()][0] == 'Updated'
+
+
+def test_sqlite_store__write__keeps_position_of_updated_issues(store, tmpdir):
+    '''
+    Ensure an issue updated in the database keeps its position in iteration order
+    '''
+    store.write([dict(EPIC_1, summary='Updated')], [])
+
+    reopened = SqliteStore(str(tmpdir.join('issue_cache.sqlite')))
+
+    assert list(reopened) == ['TEST-1', 'TEST-71', 'TEST-72']
+    assert reopened['TEST-1']['summary'] == 'Updated'
+
+
+def test_sqlite_store__len__counts_changes_not_yet_written(store):
+    '''
+    Ensure len counts issues in the database, adjusted for issues set and deleted since the last write
+    '''
+    assert len(store) == 3
+
+    # accessing or setting an existing issue does not change the count
+    store['TEST-1'] = dict(EPIC_1)
+    store['TEST-71']  # pylint: disable=pointless-statement
+    assert len(store) == 3
+
+    store['TEST-73'] = dict(ISSUE_2, key='TEST-73')
+    del store['TEST-72']
+    assert len(store) == 3
+
+    # deleting a new issue which was never written
+    del store['TEST-73']
+    assert len(store) == 2
+
+
+def test_sqlite_store__changed_items__reads_only_rows_with_changes(store):
+    '''
+    Ensure only new issues, and issues with a diff_to_original, are read from the database, while
+    issues set since load are always included
+    '''
+    store.write([
+        dict(ISSUE_1, key='TEST-80', diff_to_original=[['change', 'assignee', ['a', 'b']]]),
+        dict(ISSUE_1, key='TEST-81', id=None),
+        dict(ISSUE_1, key='TEST-82', diff_to_original=[]),
+    ], [])
+    store['TEST-1'] = dict(EPIC_1)
+
+    assert [key for key, _ in store.changed_items()] == ['TEST-80', 'TEST-81', 'TEST-1']